@@ -30,6 +30,7 @@ from funcoes_simulacao_deepseek import (
 # gerador_kills_deaths.py — todas fazendo exatamente a mesma coisa).
 from gerador_kills_deaths import carregar_jogadores_de_arquivo
 from modo_carreira import menu_carreira
+from indice_mapas import obter_indice, persistir_indice
 from config import JOGADORES_CSV
 
 logger = logging.getLogger(__name__)
@@ -157,6 +158,17 @@ def menu_partida():
             return
 
 
+def menu_desempenho_mapas():
+    """Mostra o desempenho de um time em cada mapa (índice de mapas)"""
+    mostrar_titulo("desempenho por mapa")
+    time = input("Nome do time: ").strip().lower()
+    tabela = obter_indice().tabela(time)
+    if tabela.empty:
+        print(f"Nenhum mapa registrado para {time}.")
+    else:
+        print(tabela.to_string(index=False))
+
+
 def menu_torneio():
     """Submenu de torneios"""
     while True:
@@ -267,6 +279,8 @@ def configurar_logging():
 
 def main():
     configurar_logging()
+    # O índice de mapas das partidas jogadas aqui fica salvo entre sessões
+    persistir_indice()
 
     # Perguntar ao iniciar se deseja carregar o times.csv
     mostrar_titulo("Bem-vindo ao simulador de CS2!")
@@ -289,9 +303,10 @@ def main():
         print("3. Torneios")
         print("4. Carregar Times")
         print("5. Modo Carreira")
-        print("6. Sair")
+        print("6. Desempenho por Mapa")
+        print("7. Sair")
 
-        escolha = obter_opcao_numerica(1, 6)
+        escolha = obter_opcao_numerica(1, 7)
 
         if escolha == 1:
             menu_gerenciar_times()
@@ -305,6 +320,8 @@ def main():
         elif escolha == 5:
             menu_carreira()
         elif escolha == 6:
+            menu_desempenho_mapas()
+        elif escolha == 7:
             if confirmar_acao("Tem certeza que deseja sair?"):
                 print("Saindo...")
                 break
@@ -0,0 +1,150 @@
+"""Agregação em streaming dos lotes de partidas (somas e Welford).
+
+`simular_partidas_em_lote_auto` guardava todo `ResultadoPartida` do lote só
+para, no fim, tirar médias de kills e deaths: a memória crescia com n e
+lotes de um milhão de partidas não chegavam ao fim.
+
+`AgregadorLote` recebe cada partida assim que ela termina e guarda só
+contadores de tamanho fixo:
+
+- somas exatas de kills e deaths por jogador e vitórias por time (a tabela
+  de K/D sai igual à de antes);
+- média e variância por partida, pelo algoritmo de Welford, por jogador e
+  por time — daí sai o erro padrão de cada média;
+- opcionalmente, o histograma de kills e deaths por partida.
+
+Dois agregadores se juntam com `juntar` (fórmula de Chan para a variância),
+que é como as fatias de simulacao_paralela.py voltam para o processo pai.
+"""
+
+import math
+from dataclasses import dataclass, field
+from typing import Dict, Optional, Tuple
+
+
+@dataclass(slots=True)
+class Welford:
+    """Média e variância de uma sequência, sem guardar a sequência."""
+
+    n: int = 0
+    media: float = 0.0
+    m2: float = 0.0
+    # {valor: quantas vezes apareceu}, só quando pedido
+    histograma: Optional[Dict[int, int]] = None
+
+    def adicionar(self, valor: float) -> None:
+        self.n += 1
+        delta = valor - self.media
+        self.media += delta / self.n
+        self.m2 += delta * (valor - self.media)
+        if self.histograma is not None:
+            self.histograma[valor] = self.histograma.get(valor, 0) + 1
+
+    def juntar(self, outro: "Welford") -> None:
+        if outro.n == 0:
+            return
+        total = self.n + outro.n
+        delta = outro.media - self.media
+        self.m2 += outro.m2 + delta * delta * self.n * outro.n / total
+        self.media += delta * outro.n / total
+        self.n = total
+        if self.histograma is not None and outro.histograma is not None:
+            for valor, quantidade in outro.histograma.items():
+                self.histograma[valor] = self.histograma.get(valor, 0) + quantidade
+
+    @property
+    def variancia(self) -> float:
+        """Variância amostral (n - 1); 0 com menos de duas observações."""
+        return self.m2 / (self.n - 1) if self.n > 1 else 0.0
+
+    @property
+    def erro_padrao(self) -> float:
+        """Erro padrão da média."""
+        return math.sqrt(self.variancia / self.n) if self.n > 1 else 0.0
+
+
+@dataclass
+class AgregadorLote:
+    """Estatísticas de um lote de partidas, acumuladas partida a partida.
+
+    Args:
+        histogramas: Guarda também o histograma de kills/deaths por partida
+            de cada jogador e de cada time.
+    """
+
+    histogramas: bool = False
+    partidas: int = 0
+    vitorias: Dict[str, int] = field(default_factory=dict)
+    times_jogador: Dict[str, str] = field(default_factory=dict)
+    # Somas exatas (inteiras), para a tabela de K/D
+    kills: Dict[str, int] = field(default_factory=dict)
+    deaths: Dict[str, int] = field(default_factory=dict)
+    # Kills e deaths por partida: {"kills": Welford, "deaths": Welford}
+    por_jogador: Dict[str, Dict[str, Welford]] = field(default_factory=dict)
+    por_time: Dict[str, Dict[str, Welford]] = field(default_factory=dict)
+
+    def _acumuladores(self, tabela: dict, chave: str) -> Dict[str, Welford]:
+        acumuladores = tabela.get(chave)
+        if acumuladores is None:
+            acumuladores = tabela[chave] = {
+                campo: Welford(histograma={} if self.histogramas else None)
+                for campo in ("kills", "deaths")
+            }
+        return acumuladores
+
+    def registrar_partida(
+        self,
+        kills: Dict[str, int],
+        deaths: Dict[str, int],
+        times_jogador: Dict[str, str],
+        vencedor: str,
+    ) -> None:
+        """Soma uma partida: kills/deaths de cada jogador e o vencedor."""
+        self.partidas += 1
+        self.vitorias[vencedor] = self.vitorias.get(vencedor, 0) + 1
+
+        totais_time: Dict[str, list] = {}
+        for jogador, time in times_jogador.items():
+            self.times_jogador[jogador] = time
+            k, d = kills.get(jogador, 0), deaths.get(jogador, 0)
+            self.kills[jogador] = self.kills.get(jogador, 0) + k
+            self.deaths[jogador] = self.deaths.get(jogador, 0) + d
+            acumuladores = self._acumuladores(self.por_jogador, jogador)
+            acumuladores["kills"].adicionar(k)
+            acumuladores["deaths"].adicionar(d)
+            total = totais_time.setdefault(time, [0, 0])
+            total[0] += k
+            total[1] += d
+
+        for time, (k, d) in totais_time.items():
+            acumuladores = self._acumuladores(self.por_time, time)
+            acumuladores["kills"].adicionar(k)
+            acumuladores["deaths"].adicionar(d)
+
+    def juntar(self, outro: "AgregadorLote") -> None:
+        """Soma outro agregador (de outra fatia do lote) a este."""
+        self.partidas += outro.partidas
+        for time, quantidade in outro.vitorias.items():
+            self.vitorias[time] = self.vitorias.get(time, 0) + quantidade
+        self.times_jogador.update(outro.times_jogador)
+        for jogador, valor in outro.kills.items():
+            self.kills[jogador] = self.kills.get(jogador, 0) + valor
+        for jogador, valor in outro.deaths.items():
+            self.deaths[jogador] = self.deaths.get(jogador, 0) + valor
+        for meu, dele in (
+            (self.por_jogador, outro.por_jogador),
+            (self.por_time, outro.por_time),
+        ):
+            for chave, acumuladores in dele.items():
+                for campo, acumulador in self._acumuladores(meu, chave).items():
+                    acumulador.juntar(acumuladores[campo])
+
+    def erros_padrao(self) -> Dict[str, Tuple[float, float]]:
+        """{jogador: (erro padrão das kills, das deaths)} por partida."""
+        return {
+            jogador: (
+                acumuladores["kills"].erro_padrao,
+                acumuladores["deaths"].erro_padrao,
+            )
+            for jogador, acumuladores in self.por_jogador.items()
+        }
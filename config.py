@@ -13,3 +13,12 @@ Agora todo módulo que precisa desses caminhos importa daqui.
 
 TIMES_CSV = "times.csv"
 JOGADORES_CSV = "jogadores.csv"
+
+# Cache da matriz de confrontos MD3 (ver matriz_confronto.py). É gerado
+# automaticamente e pode ser apagado a qualquer momento.
+MATRIZ_CONFRONTO_JSON = "matriz_confronto.json"
+
+# Índice de vitórias/derrotas por time e mapa (ver indice_mapas.py).
+# Só é lido e salvo quando a persistência é ligada (persistir_indice), como
+# faz o programa interativo.
+INDICE_MAPAS_JSON = "indice_mapas.json"
@@ -0,0 +1,111 @@
+"""Contexto explícito de simulação: sorteios, registro de times e ids.
+
+A simulação inteira (escolha de estratégia, vencedor do round, kills,
+sorteio de grupos e de chaves) usava o `random` global do módulo, o
+registro compartilhado da sessão e o contador de classe `ContadorPartidas`.
+Duas simulações no mesmo processo (duas threads, ou um teste no meio de
+outro lote) se atrapalhavam: uma mudava a sequência de números da outra e
+as duas disputavam os mesmos ids de partida.
+
+`ContextoSimulacao` junta esses três estados num objeto que é passado
+explicitamente por `jogar_partida`, `simular_partida_auto`, pelos lotes e
+pelas fases de torneio:
+
+- `rng`: um `random.Random` próprio (ou qualquer objeto com a mesma
+  interface). Com a mesma semente, a simulação se repete igual;
+- `registro`: o `RegistroTimes` de onde saem elencos e overs;
+- `contador`: a sequência de ids de partida do contexto;
+- `indice`: o `IndiceMapas` (indice_mapas.py) onde `jogar_mapa` soma cada
+  mapa jogado;
+- `gravador`: opcional, o `GravadorRounds` (log_rounds.py) que grava cada
+  round das partidas de `simular_partida_auto`.
+
+O padrão em todas as funções é `CONTEXTO_GLOBAL`, que usa o próprio módulo
+`random`, o registro e o índice de mapas da sessão e `ContadorPartidas` —
+exatamente o comportamento de antes, inclusive para quem faz
+`patch("random.random")`.
+"""
+
+import copy
+import itertools
+import random
+from typing import TYPE_CHECKING, Iterator, Optional
+from indice_mapas import IndiceMapas, obter_indice
+from registro_times import RegistroTimes, obter_registro
+
+if TYPE_CHECKING:
+    from log_rounds import GravadorRounds
+
+
+# ==================== CONTROLE DE PARTIDAS ====================
+class ContadorPartidas:
+    _id = 1
+
+    @classmethod
+    def proxima_partida(cls):
+        current = cls._id
+        cls._id += 1
+        return current
+
+
+class ContextoSimulacao:
+    """Estado aleatório, registro e ids de partida de uma simulação.
+
+    Args:
+        semente: Semente de um `random.Random` novo (ignorada se `rng` for
+            passado). Sem semente nem `rng`, o contexto usa o `random`
+            global do módulo.
+        rng: Gerador a usar (interface de `random.Random`).
+        registro: Registro de times. None usa o registro da sessão.
+        primeiro_id: Primeiro id de partida de um contador próprio. None
+            usa o contador global (`ContadorPartidas`).
+        indice: Índice de mapas. None usa o índice da sessão.
+        gravador: Log binário dos rounds. None não grava nada.
+    """
+
+    def __init__(
+        self,
+        semente: Optional[int] = None,
+        rng=None,
+        registro: Optional[RegistroTimes] = None,
+        primeiro_id: Optional[int] = None,
+        indice: Optional[IndiceMapas] = None,
+        gravador: Optional["GravadorRounds"] = None,
+    ):
+        if rng is None:
+            rng = random if semente is None else random.Random(semente)
+        self.rng = rng
+        self.registro = registro
+        self.contador: Optional[Iterator[int]] = (
+            None if primeiro_id is None else itertools.count(primeiro_id)
+        )
+        self.indice = indice
+        self.gravador = gravador
+
+    def com_semente(self, semente: int) -> "ContextoSimulacao":
+        """Cópia deste contexto com um `random.Random(semente)` próprio.
+
+        Registro, índice, gravador e contador de ids continuam os mesmos
+        objetos: os ids da cópia seguem a sequência do original.
+        """
+        contexto = copy.copy(self)
+        contexto.rng = random.Random(semente)
+        return contexto
+
+    def obter_registro(self) -> RegistroTimes:
+        return self.registro if self.registro is not None else obter_registro()
+
+    def obter_indice(self) -> IndiceMapas:
+        return self.indice if self.indice is not None else obter_indice()
+
+    def proxima_partida(self) -> int:
+        if self.contador is None:
+            return ContadorPartidas.proxima_partida()
+        # next() num itertools.count é atômico: threads diferentes nunca
+        # recebem o mesmo id.
+        return next(self.contador)
+
+
+# O comportamento de sempre: random global, registro da sessão e contador
+# de classe. É o padrão de todas as funções de simulação.
+CONTEXTO_GLOBAL = ContextoSimulacao()
@@ -0,0 +1,298 @@
+"""Distribuição exata de placares de mapa e de séries MD3 (sem Monte Carlo).
+
+Com a chance de cada round já em forma fechada (modelo_round), o placar
+final de um mapa é uma cadeia de Markov pequena sobre os estados
+(placar_time1, placar_time2): cada round só depende de quem está de CT, e as
+regras de `jogar_mapa`/`jogar_ot` dizem quando o half acaba. Em vez de
+simular milhões de mapas para ter a chance de vitória com duas casas
+decimais, aqui ela é calculada por programação dinâmica, em microssegundos:
+
+- 1º half: até 12 rounds, time 1 de CT;
+- 2º half: até 12 rounds, time 2 de CT, interrompido quando alguém faz 13;
+- 12-12: overtime MR3 com meta = placar + 3, time 1 de CT nos 3 primeiros
+  rounds e time 2 nos 3 seguintes, cada metade interrompida na meta.
+
+As estratégias são as do modo auto (`escolher_estrategia` sorteia uma
+uniforme para cada lado), então a chance de um round é a média da
+probabilidade exata sobre todos os pares (CT, TR) do mapa.
+"""
+
+from dataclasses import dataclass, field
+from itertools import permutations
+from typing import Dict, Iterable, Optional, Sequence, Tuple
+from estrategias_deepseek import estrategias_por_mapa, matrizes_resultado_por_mapa
+from funcoes_prejogo_deepseek import calcular_over_medio
+from modelo_round import (
+    probabilidade_ct,
+    ROUNDS_POR_HALF,
+    META_MAPA,
+    ROUNDS_POR_HALF_OT,
+    ROUNDS_META_OT,
+)
+
+Placar = Tuple[int, int]
+
+# Massa de probabilidade abaixo da qual um estado é descartado no overtime.
+# Com as regras atuais o primeiro OT sempre decide o mapa, então isso só
+# protege contra um laço infinito se as regras mudarem.
+_TOLERANCIA = 1e-15
+
+
+@dataclass
+class DistribuicaoMapa:
+    """Resultado exato de um mapa, do ponto de vista do time 1."""
+
+    mapa: str
+    time1: str
+    time2: str
+    prob_vitoria_time1: float
+    placares: Dict[Placar, float] = field(default_factory=dict)
+    rounds_esperados: float = 0.0
+
+    @property
+    def prob_vitoria_time2(self) -> float:
+        return 1.0 - self.prob_vitoria_time1
+
+    @property
+    def prob_overtime(self) -> float:
+        return sum(p for (p1, p2), p in self.placares.items() if p1 + p2 > 24)
+
+
+@dataclass
+class DistribuicaoSerie:
+    """Chances de uma série melhor de 3, do ponto de vista do time 1."""
+
+    time1: str
+    time2: str
+    prob_vitoria_time1: float
+    placares: Dict[Placar, float] = field(default_factory=dict)
+
+    @property
+    def prob_vitoria_time2(self) -> float:
+        return 1.0 - self.prob_vitoria_time1
+
+
+# ==================== CHANCE DE UM ROUND ====================
+def probabilidade_round_ct(over_ct: float, over_tr: float, mapa: str) -> float:
+    """Chance do CT vencer um round no mapa, com estratégias uniformes."""
+    try:
+        matriz = matrizes_resultado_por_mapa[mapa]
+    except KeyError:
+        raise ValueError(f"Mapa '{mapa}' não encontrado nas estratégias")
+
+    diferenca = over_ct - over_tr
+    # Só existem três resultados possíveis por par: conta quantos pares caem
+    # em cada um em vez de consultar a tabela para todos.
+    contagem = {}
+    for linha in matriz:
+        for resultado in linha:
+            contagem[resultado] = contagem.get(resultado, 0) + 1
+    total = sum(contagem.values())
+    return (
+        sum(
+            quantos * probabilidade_ct(diferenca, 1, resultado)
+            for resultado, quantos in contagem.items()
+        )
+        / total
+    )
+
+
+# ==================== PROGRAMAÇÃO DINÂMICA ====================
+def _acumular(destino: Dict[Placar, float], placar: Placar, prob: float) -> None:
+    # Ramos impossíveis (chance 0 ou 1 no round) não viram estados
+    if prob > 0.0:
+        destino[placar] = destino.get(placar, 0.0) + prob
+
+
+def _jogar_half(
+    estados: Dict[Placar, float], max_rounds: int, meta: int, prob_time1: float
+) -> Dict[Placar, float]:
+    """Mesma regra de `jogar_half`: até max_rounds, parando quem bater a meta.
+
+    `prob_time1` é a chance do time 1 vencer cada round desse half.
+    """
+    ativos = dict(estados)
+    final: Dict[Placar, float] = {}
+    for _ in range(max_rounds):
+        proximos: Dict[Placar, float] = {}
+        for (p1, p2), p in ativos.items():
+            for placar, prob in (
+                ((p1 + 1, p2), p * prob_time1),
+                ((p1, p2 + 1), p * (1.0 - prob_time1)),
+            ):
+                if max(placar) >= meta:
+                    _acumular(final, placar, prob)
+                else:
+                    _acumular(proximos, placar, prob)
+        ativos = proximos
+    for placar, p in ativos.items():
+        _acumular(final, placar, p)
+    return final
+
+
+def _decidido(placar: Placar, meta: int) -> bool:
+    """Mesmo critério de `_vencedor_overtime`."""
+    p1, p2 = placar
+    return (p1 >= meta and p1 > p2) or (p2 >= meta and p2 > p1)
+
+
+def distribuicao_placares(
+    prob_time1_ct: float, prob_time2_ct: float
+) -> Dict[Placar, float]:
+    """Distribuição dos placares finais (time1, time2) de um mapa.
+
+    Args:
+        prob_time1_ct: Chance do time 1 vencer um round quando está de CT.
+        prob_time2_ct: Chance do time 2 vencer um round quando está de CT.
+    """
+    prob_time1_tr = 1.0 - prob_time2_ct
+
+    estados = _jogar_half({(0, 0): 1.0}, ROUNDS_POR_HALF, META_MAPA, prob_time1_ct)
+
+    finais: Dict[Placar, float] = {}
+    segundo_half: Dict[Placar, float] = {}
+    for placar, p in estados.items():
+        if max(placar) >= META_MAPA:
+            _acumular(finais, placar, p)
+        else:
+            segundo_half[placar] = p
+    estados = _jogar_half(segundo_half, ROUNDS_POR_HALF, META_MAPA, prob_time1_tr)
+
+    overtime: Dict[Placar, float] = {}
+    for placar, p in estados.items():
+        if placar[0] == placar[1]:
+            overtime[placar] = p
+        else:
+            _acumular(finais, placar, p)
+
+    # Overtimes: como em jogar_ot, a meta é fixada no início de cada OT e o
+    # placar é conferido depois de cada metade; quem não decidiu nas duas
+    # volta para o próximo OT.
+    while sum(overtime.values()) > _TOLERANCIA:
+        proximo_ot: Dict[Placar, float] = {}
+        for placar_ot, p_ot in overtime.items():
+            meta = max(placar_ot) + ROUNDS_META_OT
+            pendentes = {placar_ot: p_ot}
+            for prob_round in (prob_time1_ct, prob_time1_tr):
+                resultado = _jogar_half(pendentes, ROUNDS_POR_HALF_OT, meta, prob_round)
+                pendentes = {}
+                for placar, p in resultado.items():
+                    if _decidido(placar, meta):
+                        _acumular(finais, placar, p)
+                    else:
+                        _acumular(pendentes, placar, p)
+            for placar, p in pendentes.items():
+                _acumular(proximo_ot, placar, p)
+        overtime = proximo_ot
+    return finais
+
+
+def _resumir(
+    mapa: str, time1: str, time2: str, placares: Dict[Placar, float]
+) -> DistribuicaoMapa:
+    return DistribuicaoMapa(
+        mapa=mapa,
+        time1=time1,
+        time2=time2,
+        prob_vitoria_time1=sum(p for (p1, p2), p in placares.items() if p1 > p2),
+        placares=dict(sorted(placares.items())),
+        rounds_esperados=sum((p1 + p2) * p for (p1, p2), p in placares.items()),
+    )
+
+
+def distribuicao_exata_mapa(
+    time1: str,
+    time2: str,
+    mapa: str,
+    over_time1: Optional[float] = None,
+    over_time2: Optional[float] = None,
+) -> DistribuicaoMapa:
+    """Chance de vitória, histograma de placares e rounds esperados do mapa.
+
+    O time 1 começa de CT, como em `jogar_mapa`. Os overs médios vêm do
+    registro de times (`calcular_over_medio`), a não ser que sejam passados.
+    """
+    if mapa not in estrategias_por_mapa:
+        raise ValueError(f"Mapa '{mapa}' não encontrado nas estratégias")
+    if over_time1 is None:
+        over_time1 = calcular_over_medio(time1)
+    if over_time2 is None:
+        over_time2 = calcular_over_medio(time2)
+
+    placares = distribuicao_placares(
+        probabilidade_round_ct(over_time1, over_time2, mapa),
+        probabilidade_round_ct(over_time2, over_time1, mapa),
+    )
+    return _resumir(mapa, time1, time2, placares)
+
+
+# ==================== SÉRIES MD3 ====================
+def _serie_md3(probs_mapas: Sequence[float]) -> Dict[Placar, float]:
+    """Placares da série (2-0, 2-1, 1-2, 0-2) dados os mapas na ordem."""
+    a, b, c = probs_mapas
+    return {
+        (2, 0): a * b,
+        (2, 1): a * (1 - b) * c + (1 - a) * b * c,
+        (1, 2): a * (1 - b) * (1 - c) + (1 - a) * b * (1 - c),
+        (0, 2): (1 - a) * (1 - b),
+    }
+
+
+def distribuicao_exata_md3(
+    time1: str,
+    time2: str,
+    mapas: Optional[Sequence[str]] = None,
+    pool_mapas: Optional[Iterable[str]] = None,
+    over_time1: Optional[float] = None,
+    over_time2: Optional[float] = None,
+) -> DistribuicaoSerie:
+    """Chances da série melhor de 3, como em `jogar_partida`.
+
+    Args:
+        mapas: Os três mapas da série, na ordem em que serão jogados (para
+            a série de `simular_partida_auto`, os de
+            `veto_automatico.vetar_automatico`). Sem eles, são três mapas
+            distintos sorteados do pool, e o resultado é a média sobre todas
+            as ordens possíveis.
+        pool_mapas: Mapas sorteáveis quando `mapas` não é passado (padrão:
+            todos de estrategias_por_mapa).
+        over_time1, over_time2: Overs médios, se já conhecidos (padrão:
+            `calcular_over_medio`).
+    """
+    if over_time1 is None:
+        over_time1 = calcular_over_medio(time1)
+    if over_time2 is None:
+        over_time2 = calcular_over_medio(time2)
+
+    if mapas is not None:
+        if len(mapas) != 3:
+            raise ValueError("Uma série MD3 precisa de exatamente 3 mapas")
+        sequencias = [tuple(mapas)]
+    else:
+        pool = (
+            list(pool_mapas) if pool_mapas is not None else list(estrategias_por_mapa)
+        )
+        if len(pool) < 3:
+            raise ValueError("O pool precisa de pelo menos 3 mapas")
+        sequencias = list(permutations(pool, 3))
+
+    # Cada mapa é calculado uma vez só, mesmo aparecendo em várias ordens.
+    prob_mapa = {
+        mapa: distribuicao_exata_mapa(
+            time1, time2, mapa, over_time1, over_time2
+        ).prob_vitoria_time1
+        for mapa in {m for seq in sequencias for m in seq}
+    }
+
+    placares: Dict[Placar, float] = {}
+    peso = 1.0 / len(sequencias)
+    for seq in sequencias:
+        for placar, p in _serie_md3([prob_mapa[m] for m in seq]).items():
+            _acumular(placares, placar, p * peso)
+
+    return DistribuicaoSerie(
+        time1=time1,
+        time2=time2,
+        prob_vitoria_time1=placares[(2, 0)] + placares[(2, 1)],
+        placares=placares,
+    )
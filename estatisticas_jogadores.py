@@ -0,0 +1,261 @@
+"""Estatísticas de jogadores em arrays (struct of arrays), com visões de dict.
+
+Cada jogador carregava as estatísticas num dict aninhado:
+`jogador["estatisticas"]["mapas"][mapa]["kills"]`. Registrar uma kill
+custava um teste de pertinência e quatro consultas de hash (mais duas para
+o total), e cada jogador de cada partida guardada num lote de torneios
+mantinha vários dicts pequenos vivos.
+
+Aqui os contadores de um elenco ficam em `EstatisticasElenco`: ids inteiros
+para jogadores (posição no elenco) e mapas (ordem em que aparecem), e um
+array por contador — kills, deaths e rounds por jogador x mapa, mais os
+totais por jogador. Uma kill vira dois incrementos em array, com a célula
+(jogador, mapa) calculada uma vez por mapa (ver `Escalacao` em
+gerador_kills_deaths.py).
+
+O código que lê e escreve o formato antigo continua funcionando: o
+`jogador["estatisticas"]` passa a ser uma `VisaoEstatisticas`, que se
+comporta como o dict aninhado (`["mapas"][mapa]["kills"] += 1`, `.get`,
+`in`, `.keys()` na ordem dos mapas jogados), mas lê e escreve nos arrays.
+
+Os resultados guardados (`ResultadoMapa`, `ResultadoPartida`) não apontam
+para os jogadores do elenco: no fim de cada mapa, `fotografar_mapa` tira
+uma `FotoMapa` imutável: os números de todos os jogadores num bloco de
+bytes e os nomes (internados) numa tupla compartilhada. Um lote de milhares
+de torneios guarda só essas fotos, não os elencos inteiros.
+"""
+
+import sys
+from array import array
+from collections.abc import Mapping, MutableMapping
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+CAMPOS = ("kills", "deaths", "rounds")
+
+
+class EstatisticasElenco:
+    """Contadores de um elenco de tamanho fixo, em arrays de inteiros.
+
+    As células por mapa ficam em blocos: o bloco do mapa m ocupa as posições
+    [m * total_jogadores, (m + 1) * total_jogadores). Um mapa novo acrescenta
+    um bloco ao fim dos arrays, sem mexer nas células já calculadas.
+    """
+
+    def __init__(self, total_jogadores: int):
+        self.total_jogadores = total_jogadores
+        self.ids_mapas: Dict[str, int] = {}
+        self.nomes_mapas: List[str] = []
+        self.kills = array("q")
+        self.deaths = array("q")
+        self.rounds = array("q")
+        self.kills_total = array("q", bytes(8 * total_jogadores))
+        self.deaths_total = array("q", bytes(8 * total_jogadores))
+        self.rounds_total = array("q", bytes(8 * total_jogadores))
+        # Ids dos mapas de cada jogador, na ordem em que foram jogados
+        self.mapas_jogador: List[List[int]] = [[] for _ in range(total_jogadores)]
+
+    def id_mapa(self, mapa: str) -> int:
+        mapa_id = self.ids_mapas.get(mapa)
+        if mapa_id is None:
+            mapa_id = self.ids_mapas[mapa] = len(self.nomes_mapas)
+            self.nomes_mapas.append(mapa)
+            bloco = bytes(8 * self.total_jogadores)
+            for contador in (self.kills, self.deaths, self.rounds):
+                contador.frombytes(bloco)
+        return mapa_id
+
+    def celula(self, jogador_id: int, mapa: str) -> int:
+        """Posição de (jogador, mapa) nos arrays; o mapa passa a ser do jogador."""
+        mapa_id = self.id_mapa(mapa)
+        if mapa_id not in self.mapas_jogador[jogador_id]:
+            self.mapas_jogador[jogador_id].append(mapa_id)
+        return mapa_id * self.total_jogadores + jogador_id
+
+    def visao(self, jogador_id: int) -> "VisaoEstatisticas":
+        return VisaoEstatisticas(self, jogador_id)
+
+
+class VisaoEstatisticas(Mapping):
+    """`{"mapas": {mapa: {...}}, "total": {...}}` de um jogador, sem cópia."""
+
+    __slots__ = ("elenco", "jogador_id")
+
+    def __init__(self, elenco: EstatisticasElenco, jogador_id: int):
+        self.elenco = elenco
+        self.jogador_id = jogador_id
+
+    def __getitem__(self, chave: str):
+        if chave == "mapas":
+            return VisaoMapas(self.elenco, self.jogador_id)
+        if chave == "total":
+            return VisaoContadores(self.elenco, self.jogador_id, None)
+        raise KeyError(chave)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(("mapas", "total"))
+
+    def __len__(self) -> int:
+        return 2
+
+    def __repr__(self) -> str:
+        return repr(self.para_dict())
+
+    def para_dict(self) -> dict:
+        """Cópia no formato de dict aninhado antigo."""
+        return {
+            "mapas": {mapa: dict(c) for mapa, c in self["mapas"].items()},
+            "total": dict(self["total"]),
+        }
+
+
+class VisaoMapas(MutableMapping):
+    """Mapas jogados por um jogador, na ordem, com os contadores de cada um."""
+
+    __slots__ = ("elenco", "jogador_id")
+
+    def __init__(self, elenco: EstatisticasElenco, jogador_id: int):
+        self.elenco = elenco
+        self.jogador_id = jogador_id
+
+    def __getitem__(self, mapa: str) -> "VisaoContadores":
+        mapa_id = self.elenco.ids_mapas.get(mapa)
+        if mapa_id is None or mapa_id not in self.elenco.mapas_jogador[self.jogador_id]:
+            raise KeyError(mapa)
+        celula = mapa_id * self.elenco.total_jogadores + self.jogador_id
+        return VisaoContadores(self.elenco, self.jogador_id, celula)
+
+    def __setitem__(self, mapa: str, valores) -> None:
+        # resetar_estatisticas_para_mapa faz mapas[mapa] = {"kills": 0, ...}
+        celula = self.elenco.celula(self.jogador_id, mapa)
+        for campo in CAMPOS:
+            getattr(self.elenco, campo)[celula] = valores.get(campo, 0)
+
+    def __delitem__(self, mapa: str) -> None:
+        self[mapa] = {}
+        self.elenco.mapas_jogador[self.jogador_id].remove(self.elenco.ids_mapas[mapa])
+
+    def __iter__(self) -> Iterator[str]:
+        nomes = self.elenco.nomes_mapas
+        return iter([nomes[m] for m in self.elenco.mapas_jogador[self.jogador_id]])
+
+    def __len__(self) -> int:
+        return len(self.elenco.mapas_jogador[self.jogador_id])
+
+    def __repr__(self) -> str:
+        return repr({mapa: dict(c) for mapa, c in self.items()})
+
+
+class VisaoContadores(MutableMapping):
+    """`{"kills", "deaths", "rounds"}` de um jogador num mapa (ou no total)."""
+
+    __slots__ = ("elenco", "indice", "sufixo")
+
+    def __init__(
+        self, elenco: EstatisticasElenco, jogador_id: int, celula: Optional[int]
+    ):
+        self.elenco = elenco
+        # Sem célula de mapa, a visão é a dos totais (indexados pelo jogador)
+        self.indice = jogador_id if celula is None else celula
+        self.sufixo = "_total" if celula is None else ""
+
+    def __getitem__(self, campo: str) -> int:
+        if campo not in CAMPOS:
+            raise KeyError(campo)
+        return getattr(self.elenco, campo + self.sufixo)[self.indice]
+
+    def __setitem__(self, campo: str, valor: int) -> None:
+        if campo not in CAMPOS:
+            raise KeyError(campo)
+        getattr(self.elenco, campo + self.sufixo)[self.indice] = valor
+
+    def __delitem__(self, campo: str) -> None:
+        raise TypeError("Os contadores de estatística são fixos")
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(CAMPOS)
+
+    def __len__(self) -> int:
+        return len(CAMPOS)
+
+    def __repr__(self) -> str:
+        return repr(dict(self))
+
+
+def internar(valor):
+    """`sys.intern` para strings; qualquer outro valor volta como veio.
+
+    Nomes de time e de mapa se repetem em todas as partidas de um lote, mas
+    cada `time.lower()` cria uma string nova. Internados, todos os resultados
+    apontam para a mesma string.
+    """
+    return sys.intern(valor) if type(valor) is str else valor
+
+
+@dataclass(frozen=True, slots=True)
+class EstatisticaJogador:
+    """Números de um jogador num mapa (ou na partida inteira, com `mapa` "")."""
+
+    nome: str
+    time: str
+    mapa: str
+    kills: int
+    deaths: int
+    rounds: int
+
+
+# Uma tupla (nome, time) por escalação distinta, compartilhada entre as fotos
+_ESCALACOES: Dict[Tuple[Tuple[str, str], ...], Tuple[Tuple[str, str], ...]] = {}
+
+
+@dataclass(frozen=True, slots=True)
+class FotoMapa:
+    """Números dos jogadores no fim de um mapa, num bloco imutável.
+
+    `jogadores` é a tupla de (nome, time), a mesma para todas as fotos com a
+    mesma escalação; `numeros` guarda kills, deaths e rounds de cada jogador,
+    nessa ordem, como inteiros sem sinal de 32 bits. Iterar a foto devolve
+    uma `EstatisticaJogador` por jogador.
+    """
+
+    mapa: str
+    jogadores: Tuple[Tuple[str, str], ...]
+    numeros: bytes
+
+    def __iter__(self) -> Iterator[EstatisticaJogador]:
+        numeros = array("I", self.numeros)
+        for i, (nome, time) in enumerate(self.jogadores):
+            kills, deaths, rounds = numeros[3 * i : 3 * i + 3]
+            yield EstatisticaJogador(nome, time, self.mapa, kills, deaths, rounds)
+
+    def __len__(self) -> int:
+        return len(self.jogadores)
+
+
+def fotografar_mapa(jogadores: Iterable[Dict[str, Any]], mapa: str) -> FotoMapa:
+    """Foto imutável das estatísticas dos jogadores no mapa."""
+    nomes = []
+    numeros = array("I")
+    for jogador in jogadores:
+        nomes.append((internar(jogador["nome"]), internar(jogador["time"])))
+        contadores = jogador["estatisticas"]["mapas"].get(mapa, {})
+        numeros.extend(contadores.get(campo, 0) for campo in CAMPOS)
+    escalacao = tuple(nomes)
+    escalacao = _ESCALACOES.setdefault(escalacao, escalacao)
+    return FotoMapa(internar(mapa), escalacao, numeros.tobytes())
+
+
+def somar_estatisticas(
+    fotos: Iterable[EstatisticaJogador],
+) -> Tuple[EstatisticaJogador, ...]:
+    """Soma as fotos por jogador (nome, time), na ordem em que aparecem."""
+    somas: Dict[Tuple[str, str], List[int]] = {}
+    for foto in fotos:
+        soma = somas.setdefault((foto.nome, foto.time), [0, 0, 0])
+        soma[0] += foto.kills
+        soma[1] += foto.deaths
+        soma[2] += foto.rounds
+    return tuple(
+        EstatisticaJogador(nome, time, "", *soma)
+        for (nome, time), soma in somas.items()
+    )
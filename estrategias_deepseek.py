@@ -289,34 +289,103 @@ regras_vitoria_por_mapa = {
     # Adicione mais mapas e regras conforme necessário
 }
 
-def estrategia_resultado(estrategia_ct: str, estrategia_tr: str, mapa: str) -> str:
+# ==================== MATRIZES COMPILADAS ====================
+# As regras acima usam rótulos "1", "2", ... (base 1, em string), mas
+# jogar_half passa para estrategia_resultado os índices inteiros (base 0)
+# devolvidos por escolher_estrategia. Antes, a busca por `in` nas listas
+# nunca achava o par (0 != "1"), e TODO round caía no random.choice — a
+# camada de estratégias simplesmente não influenciava o resultado.
+#
+# Agora as regras são compiladas uma vez, na importação, numa matriz densa
+# por mapa: matriz[idx_ct][idx_tr] diz quem a combinação favorece. A
+# consulta virou um índice de lista, e vale tanto para índice (int, base 0)
+# quanto para rótulo (str, base 1).
+RESULTADO_CT = 1
+RESULTADO_TR = -1
+RESULTADO_ALEATORIO = 0
+
+
+def _compilar_regras(regras: dict, estrategias: dict) -> dict:
+    """Monta as matrizes de resultado, validando contra estrategias_por_mapa.
+
+    Raises:
+        ValueError: Se um mapa das regras não tiver estratégias, ou se uma
+            regra citar uma estratégia que não existe no mapa.
+    """
+    matrizes = {}
+    for mapa, regras_mapa in regras.items():
+        if mapa not in estrategias:
+            raise ValueError(f"Mapa '{mapa}' tem regras mas não tem estratégias")
+
+        total_ct = len(estrategias[mapa]["ct"])
+        total_tr = len(estrategias[mapa]["tr"])
+        matriz = [[RESULTADO_ALEATORIO] * total_tr for _ in range(total_ct)]
+
+        # TR primeiro e CT por cima: se um par aparece nas duas listas, vale
+        # a regra do CT — a mesma prioridade da checagem antiga (CT antes).
+        for chave, valor in (("tr_vence", RESULTADO_TR), ("ct_vence", RESULTADO_CT)):
+            for rotulo_ct, rotulo_tr in regras_mapa[chave]:
+                idx_ct, idx_tr = int(rotulo_ct) - 1, int(rotulo_tr) - 1
+                if not (0 <= idx_ct < total_ct and 0 <= idx_tr < total_tr):
+                    raise ValueError(
+                        f"Regra ({rotulo_ct}, {rotulo_tr}) de '{mapa}' fora das "
+                        f"estratégias do mapa ({total_ct} CT x {total_tr} TR)"
+                    )
+                matriz[idx_ct][idx_tr] = valor
+
+        matrizes[mapa] = matriz
+    return matrizes
+
+
+matrizes_resultado_por_mapa = _compilar_regras(
+    regras_vitoria_por_mapa, estrategias_por_mapa
+)
+
+
+def _indice_estrategia(estrategia) -> int:
+    """Rótulo "1".."N" (como nas regras) vira índice base 0; int passa direto."""
+    if isinstance(estrategia, str):
+        return int(estrategia) - 1
+    return estrategia
+
+
+def resultado_estrategias(estrategia_ct, estrategia_tr, mapa: str) -> int:
+    """Consulta a matriz compilada, sem sortear nada.
+
+    Returns:
+        RESULTADO_CT, RESULTADO_TR ou RESULTADO_ALEATORIO (par sem regra).
+    """
+    try:
+        matriz = matrizes_resultado_por_mapa[mapa]
+    except KeyError:
+        raise ValueError(f"Mapa '{mapa}' não encontrado nas regras de vitória")
+
+    idx_ct = _indice_estrategia(estrategia_ct)
+    idx_tr = _indice_estrategia(estrategia_tr)
+    if 0 <= idx_ct < len(matriz) and 0 <= idx_tr < len(matriz[idx_ct]):
+        return matriz[idx_ct][idx_tr]
+    return RESULTADO_ALEATORIO
+
+
+def estrategia_resultado(estrategia_ct, estrategia_tr, mapa: str, rng=random) -> str:
     """
     Decide o vencedor do round com base nas estratégias escolhidas e no mapa.
 
     Args:
-        estrategia_ct: Estratégia escolhida pelo time CT.
-        estrategia_tr: Estratégia escolhida pelo time TR.
+        estrategia_ct: Estratégia do CT — índice base 0 (como devolve
+            escolher_estrategia) ou rótulo base 1 em string (como nas regras).
+        estrategia_tr: Estratégia do TR, no mesmo formato.
         mapa: Mapa em que o round está sendo jogado.
+        rng: Gerador usado no par sem regra (o `random` global por padrão).
 
     Returns:
         "ct" se o time CT vencer, "tr" se o time TR vencer.
     """
-    # Verifica se o mapa tem regras específicas
-    if mapa not in regras_vitoria_por_mapa:
-        raise ValueError(f"Mapa '{mapa}' não encontrado nas regras de vitória")
-
-    # Obtém as regras de vitória para o mapa
-    regras_ct = regras_vitoria_por_mapa[mapa]["ct_vence"]
-    regras_tr = regras_vitoria_por_mapa[mapa]["tr_vence"]
-
-    # Verifica se o CT vence
-    if (estrategia_ct, estrategia_tr) in regras_ct:
+    resultado = resultado_estrategias(estrategia_ct, estrategia_tr, mapa)
+    if resultado == RESULTADO_CT:
         return "ct"
-
-    # Verifica se o TR vence
-    if (estrategia_ct, estrategia_tr) in regras_tr:
+    if resultado == RESULTADO_TR:
         return "tr"
 
     # Caso não haja regra específica, decide aleatoriamente
-    return random.choice(["ct", "tr"])
-
+    return rng.choice(["ct", "tr"])
@@ -0,0 +1,92 @@
+"""Eventos de uma partida, na ordem em que acontecem.
+
+`jogar_half`, `jogar_mapa` e `simular_partida_auto` rodavam até o fim e só
+devolviam o resultado final; o que acontecia no meio ia para a narração.
+Quem quisesse acompanhar a partida (uma interface, um log, uma análise
+round a round) tinha que ler o texto impresso.
+
+Agora o jogo é um gerador (`eventos_half`, `eventos_mapa`,
+`eventos_partida` em funcoes_simulacao_deepseek.py) que entrega um evento
+por vez, só quando pedido: dá para pausar entre dois rounds, parar no meio
+ou consumir só o que interessa, sem guardar a partida inteira. As funções
+de sempre são consumidoras desses geradores — elas narram cada evento em
+`saida` e devolvem o mesmo resultado de antes.
+
+Os eventos são imutáveis. Os placares estão sempre do ponto de vista
+indicado no nome do campo (CT/TR do half, ou time 1/time 2 do mapa).
+"""
+
+from dataclasses import dataclass
+from typing import Any, Tuple, Union
+
+
+@dataclass(frozen=True, slots=True)
+class InicioMapa:
+    mapa: str
+    time1: str  # começa de CT
+    time2: str
+    jogadores: Tuple[Tuple[str, str], ...]  # (nome, time), o time 1 primeiro
+
+
+@dataclass(frozen=True, slots=True)
+class InicioHalf:
+    """Começo de um half (overtime 0) ou de uma metade de overtime."""
+
+    mapa: str
+    time_ct: str
+    time_tr: str
+    overtime: int
+    placar_ct: int
+    placar_tr: int
+
+
+@dataclass(frozen=True, slots=True)
+class FimRound:
+    mapa: str
+    numero: int  # contado desde o começo do mapa
+    time_ct: str
+    time_tr: str
+    vencedor: str
+    lado_vencedor: str  # "ct" ou "tr"
+    placar_ct: int
+    placar_tr: int
+    estrategia_ct: int  # índice em estrategias_por_mapa[mapa]["ct"]
+    estrategia_tr: int
+    abates: Tuple[Tuple[str, str], ...]  # (matador, morto)
+
+
+@dataclass(frozen=True, slots=True)
+class InicioOvertime:
+    mapa: str
+    numero: int
+    placar_time1: int
+    placar_time2: int
+    meta: int
+
+
+@dataclass(frozen=True, slots=True)
+class FimOvertime:
+    """Um overtime decidido (se ninguém decidir, vem outro InicioOvertime)."""
+
+    mapa: str
+    numero: int
+    vencedor: str
+    placar_time1: int
+    placar_time2: int
+
+
+@dataclass(frozen=True, slots=True)
+class FimMapa:
+    resultado: Any  # ResultadoMapa
+
+
+@dataclass(frozen=True, slots=True)
+class FimPartida:
+    vencedor: str
+    perdedor: str
+    resultado: Any  # ResultadoPartida
+
+
+Evento = Union[
+    InicioMapa, InicioHalf, FimRound, InicioOvertime, FimOvertime, FimMapa, FimPartida
+]
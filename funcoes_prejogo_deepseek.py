@@ -2,9 +2,9 @@
 import csv
 import logging
 from typing import List, Dict, Optional
-from collections import defaultdict
 from estrategias_deepseek import estrategias_por_mapa
 from config import TIMES_CSV, JOGADORES_CSV
+from registro_times import RegistroTimes, obter_registro
 
 logger = logging.getLogger(__name__)
 
@@ -103,6 +103,9 @@ def calcular_over_medio(time_nome: str, arquivo_csv: str = JOGADORES_CSV) -> flo
     """
     Calcula o over médio de um time com base no arquivo CSV de jogadores.
 
+    O arquivo não é mais relido a cada chamada: o over vem do registro em
+    memória (ver registro_times.py), que só relê o CSV se ele mudar no disco.
+
     Args:
         time_nome: Nome do time.
         arquivo_csv: Caminho do arquivo CSV com os dados dos jogadores.
@@ -111,16 +114,7 @@ def calcular_over_medio(time_nome: str, arquivo_csv: str = JOGADORES_CSV) -> flo
         Over médio do time.
     """
     try:
-        with open(arquivo_csv, "r", newline="", encoding="utf-8") as csvfile:
-            reader = csv.DictReader(csvfile)
-            overs = []
-            for linha in reader:
-                if linha["time"].strip().lower() == time_nome.strip().lower():
-                    overs.append(float(linha["over"]))
-                    overs.sort()
-            if not overs:
-                raise ValueError(f"Nenhum jogador encontrado para o time '{time_nome}'")
-            return sum(overs) / len(overs)
+        return obter_registro(arquivo_jogadores=arquivo_csv).over_medio(time_nome)
     except FileNotFoundError:
         raise FileNotFoundError(f"Arquivo '{arquivo_csv}' não encontrado")
     except Exception as e:
@@ -171,17 +165,33 @@ def selecionar_mapa(time: str, mapas_disponiveis: List[str]) -> str:
             print("Digite apenas números!")
 
 
-def vetar_e_escolher_mapas(time1: str, time2: str) -> List[str]:
+def vetar_e_escolher_mapas(
+    time1: str,
+    time2: str,
+    automatico: bool = False,
+    registro: Optional[RegistroTimes] = None,
+) -> List[str]:
     """Gerencia todo o processo de veto e escolha de mapas.
 
     Args:
         time1: Nome do primeiro time
         time2: Nome do segundo time
+        automatico: Se True, cada time veta e escolhe sozinho pela chance de
+            vitória em cada mapa, sem perguntar nada (ver veto_automatico.py)
+        registro: Registro de onde o veto automático tira os overs dos
+            times. None usa o registro da sessão.
 
     Returns:
         Lista com 3 mapas selecionados [pick1, pick2, decider]
     """
     try:
+        if automatico:
+            # Import local: veto_automatico depende de distribuicao_exata,
+            # que importa este módulo.
+            from veto_automatico import vetar_automatico
+
+            return vetar_automatico(time1, time2, registro=registro)
+
         # Cria cópia para não alterar o original
         mapas_disponiveis = list(estrategias_por_mapa.keys()).copy()
 
@@ -243,29 +253,7 @@ def calcular_overs_medios_times(arquivo_csv: str = JOGADORES_CSV) -> dict:
         Um dicionário onde as chaves são os nomes dos times e os valores são os overs médios.
     """
     try:
-        # Dicionário para armazenar a soma dos overs e a quantidade de jogadores por time
-        times_overs = defaultdict(lambda: {"soma_over": 0.0, "quantidade_jogadores": 0})
-
-        # Ler o arquivo CSV
-        with open(arquivo_csv, "r", newline="", encoding="utf-8") as csvfile:
-            reader = csv.DictReader(csvfile)
-            for linha in reader:
-                time_nome = linha["time"].strip().lower()
-                over = float(linha["over"])
-                # Atualiza a soma dos overs e a quantidade de jogadores do time
-                times_overs[time_nome]["soma_over"] += over
-                times_overs[time_nome]["quantidade_jogadores"] += 1
-
-        # Calcular o over médio de cada time
-        overs_medios = {}
-        for time, dados in times_overs.items():
-            if dados["quantidade_jogadores"] > 0:
-                overs_medios[time] = dados["soma_over"] / dados["quantidade_jogadores"]
-            else:
-                overs_medios[time] = 0.0
-
-        return overs_medios
-
+        return obter_registro(arquivo_jogadores=arquivo_csv).overs_medios()
     except FileNotFoundError:
         raise FileNotFoundError(f"Arquivo '{arquivo_csv}' não encontrado")
     except Exception as e:
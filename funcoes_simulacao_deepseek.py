@@ -1,29 +1,51 @@
 from __future__ import annotations
 
-import csv
 import logging
 import random
-import math
 from dataclasses import dataclass
-from typing import Any, List, Optional, Tuple, Dict, Literal
-from colorama import Fore, Style
+from typing import Any, Generator, List, Optional, Tuple, Dict, Literal, Union
+from colorama import Style
 from collections import defaultdict
 import pandas as pd
-from estrategias_deepseek import estrategias_por_mapa, estrategia_resultado
+from estrategias_deepseek import estrategias_por_mapa, resultado_estrategias
 from funcoes_prejogo_deepseek import times, vetar_e_escolher_mapas, calcular_over_medio
-from gerador_kills_deaths import (
-    simular_kills_do_round,
-    carregar_jogadores_de_arquivo,
-    obter_jogadores,
-)
+from gerador_kills_deaths import Escalacao, simular_kills_do_round
 from pathlib import Path
 from config import TIMES_CSV, JOGADORES_CSV
+from registro_times import obter_registro
+from saida_simulacao import Saida, SAIDA_NULA, SAIDA_TERMINAL
+from torneio_vetorizado import simular_chaves_vetorizado, ranking_por_posicao_media
+from modelo_round import K_SIGMOIDE, probabilidade_ct
+from contexto_simulacao import ContadorPartidas, ContextoSimulacao, CONTEXTO_GLOBAL
+from agregacao_lote import AgregadorLote
+from veto_automatico import vetar_automatico
+from memo_mapas import MEMO_MAPAS, MemoMapas
+from eventos_jogo import (
+    Evento,
+    FimMapa,
+    FimOvertime,
+    FimPartida,
+    FimRound,
+    InicioMapa,
+    InicioHalf,
+    InicioOvertime,
+)
+from estatisticas_jogadores import (
+    EstatisticaJogador,
+    FotoMapa,
+    fotografar_mapa,
+    internar,
+    somar_estatisticas,
+)
 
 logger = logging.getLogger(__name__)
 
 
 # ==================== CLASSES DE DADOS ====================
-@dataclass
+# Os resultados usam __slots__ (sem __dict__ por instância) e guardam os
+# nomes de time, mapa e fase internados: simular_torneios_em_lote mantém
+# todas as partidas de todos os torneios em memória.
+@dataclass(slots=True)
 class ResultadoMapa:
     mapa: str
     time_ct: str
@@ -40,6 +62,11 @@ class ResultadoMapa:
     # nas estatísticas do torneio.
     fase: str = ""
     erro: bool = False
+    # Foto imutável dos jogadores no fim do mapa (ver fotografar_mapa)
+    estatisticas_jogadores: Optional[FotoMapa] = None
+
+    def __setattr__(self, nome, valor):
+        object.__setattr__(self, nome, internar(valor))
 
     def to_dict(self) -> dict:
 
@@ -64,7 +91,7 @@ class ResultadoMapa:
         return self.time_tr if self.placar_time1 > self.placar_time2 else self.time_ct
 
 
-@dataclass
+@dataclass(slots=True)
 class ResultadoPartida:
     partida_id: int
     mapas: List[ResultadoMapa]
@@ -73,6 +100,16 @@ class ResultadoPartida:
     modo_jogo: Literal["manual", "semi-auto", "auto"] = "manual"
     fase: str = ""
 
+    def __setattr__(self, nome, valor):
+        object.__setattr__(self, nome, internar(valor))
+
+    @property
+    def estatisticas_jogadores(self) -> Tuple[EstatisticaJogador, ...]:
+        """Totais de cada jogador na partida, somando as fotos dos mapas."""
+        return somar_estatisticas(
+            foto for mapa in self.mapas for foto in (mapa.estatisticas_jogadores or ())
+        )
+
     def to_dict(self) -> dict:
         """Converte o objeto ResultadoPartida em um dicionário."""
         return {
@@ -88,20 +125,12 @@ class ResultadoPartida:
         }
 
 
-# ==================== CONTROLE DE PARTIDAS ====================
-class ContadorPartidas:
-    _id = 1
-
-    @classmethod
-    def proxima_partida(cls):
-        current = cls._id
-        cls._id += 1
-        return current
-
-
 # ==================== FUNÇÕES AUXILIARES ====================
 ModoJogo = Literal["manual", "semi-auto", "auto"]
 
+# Rounds do tempo normal (MR12); o que passar disso foi jogado em overtime
+ROUNDS_TEMPO_NORMAL = 24
+
 
 def validar_time(nome: str) -> str:
     if nome.lower() not in times:
@@ -109,13 +138,22 @@ def validar_time(nome: str) -> str:
     return nome.lower()
 
 
-def escolher_estrategia(time: str, estrategias: List[str], modo: ModoJogo) -> int:
+def escolher_estrategia(
+    time: str,
+    estrategias: List[str],
+    modo: ModoJogo,
+    saida: Saida = SAIDA_TERMINAL,
+    rng=random,
+) -> int:
     """Seleção de estratégia baseada no modo de jogo"""
     if modo == "auto":
-        return random.randint(0, len(estrategias) - 1)
+        return rng.randint(0, len(estrategias) - 1)
 
     if modo == "semi-auto" and "Jogador" not in time:
-        return random.randint(0, len(estrategias) - 1)
+        return rng.randint(0, len(estrategias) - 1)
+
+    # A narração pode estar num buffer: ela precisa aparecer antes do menu
+    saida.descarregar()
 
     print(f"\n{time}, estratégias disponíveis:")
     for i, estrategia in enumerate(estrategias, 1):
@@ -131,13 +169,62 @@ def escolher_estrategia(time: str, estrategias: List[str], modo: ModoJogo) -> in
             print("Digite apenas números!")
 
 
+def _over_medio(time: str, contexto: ContextoSimulacao) -> float:
+    # Sem registro próprio no contexto, o over vem de calcular_over_medio
+    # (registro da sessão), como sempre.
+    if contexto.registro is None:
+        return calcular_over_medio(time)
+    return contexto.registro.over_medio(time)
+
+
 # ==================== FUNÇÕES PRINCIPAIS ====================
-def jogar_half(
+# O jogo é escrito como geradores de eventos (eventos_jogo.py); jogar_half,
+# jogar_ot, jogar_mapa e simular_partida_auto só consomem os eventos,
+# narrando cada um em `saida`.
+def _narrar(evento: Evento, saida: Saida) -> None:
+    """A mesma narração que as funções de jogo sempre imprimiram."""
+    if isinstance(evento, FimRound):
+        lado = evento.lado_vencedor.upper()
+        saida.escrever(
+            f"{evento.vencedor} ({lado}) venceu! "
+            f"CT {evento.placar_ct}-{evento.placar_tr} TR"
+        )
+    elif isinstance(evento, InicioOvertime):
+        saida.escrever(
+            f"\n=== Overtime {evento.numero} "
+            f"(Placar: {evento.placar_time1}-{evento.placar_time2}) ==="
+        )
+    elif isinstance(evento, FimOvertime):
+        saida.escrever(
+            f"{evento.vencedor} venceu o overtime "
+            f"{evento.placar_time1}-{evento.placar_time2}!"
+        )
+    elif isinstance(evento, FimMapa):
+        resultado = evento.resultado
+        saida.escrever("\n" + "=" * 40 + "\n🎉 FIM DE MAPA! 🎉")
+        saida.escrever(
+            f"Placar Final: {resultado.time_ct} {resultado.placar_time1} x "
+            f"{resultado.placar_time2} {resultado.time_tr}"
+        )
+        saida.escrever("=" * 40 + "\n")
+
+
+def _consumir(eventos: Generator[Evento, None, Any], saida: Saida) -> Any:
+    """Narra os eventos do gerador e devolve o valor que ele retorna."""
+    while True:
+        try:
+            evento = next(eventos)
+        except StopIteration as fim:
+            return fim.value
+        _narrar(evento, saida)
+
+
+def eventos_half(
     # --- Argumentos Obrigatórios ---
     time_ct: str,
     time_tr: str,
-    jogadores_ct: List[Dict[str, Any]],
-    jogadores_tr: List[Dict[str, Any]],
+    jogadores_ct: Union[List[Dict[str, Any]], Escalacao],
+    jogadores_tr: Union[List[Dict[str, Any]], Escalacao],
     mapa: str,
     modo: ModoJogo,
     # --- Argumentos Opcionais (com valor padrão) ---
@@ -145,210 +232,324 @@ def jogar_half(
     meta: int = 13,
     pontos_iniciais_ct: int = 0,
     pontos_iniciais_tr: int = 0,
-) -> Tuple[int, int]:
-    """Executa um half de jogo e retorna os pontos conquistados pelos lados CT e TR."""
-    try:
-        if mapa not in estrategias_por_mapa:
-            raise ValueError(f"Mapa '{mapa}' não encontrado nas estratégias")
+    saida: Saida = SAIDA_TERMINAL,
+    contexto: ContextoSimulacao = CONTEXTO_GLOBAL,
+    overtime: int = 0,
+) -> Generator[Evento, None, Tuple[int, int]]:
+    """Gerador de um half: InicioHalf e um FimRound por round.
+
+    Retorna (no StopIteration, ou como valor do `yield from`) os pontos
+    conquistados pelos lados CT e TR. `saida` só é usada pelo menu de
+    estratégias dos modos interativos.
+    """
+    if mapa not in estrategias_por_mapa:
+        raise ValueError(f"Mapa '{mapa}' não encontrado nas estratégias")
 
-        if modo not in ModoJogo.__args__:
-            raise ValueError(f"Modo de jogo inválido: {modo}")
+    if modo not in ModoJogo.__args__:
+        raise ValueError(f"Modo de jogo inválido: {modo}")
 
-        estrategias_ct = estrategias_por_mapa[mapa]["ct"]
-        estrategias_tr = estrategias_por_mapa[mapa]["tr"]
+    estrategias_ct = estrategias_por_mapa[mapa]["ct"]
+    estrategias_tr = estrategias_por_mapa[mapa]["tr"]
 
-        pontos_ct = 0
-        pontos_tr = 0
+    pontos_ct = 0
+    pontos_tr = 0
 
-        # Calcula o over médio dos times
-        over_ct = calcular_over_medio(time_ct)
-        over_tr = calcular_over_medio(time_tr)
+    # Calcula o over médio dos times
+    over_ct = _over_medio(time_ct, contexto)
+    over_tr = _over_medio(time_tr, contexto)
+    rng = contexto.rng
+    if not isinstance(jogadores_ct, Escalacao):
+        jogadores_ct = Escalacao(jogadores_ct)
+    if not isinstance(jogadores_tr, Escalacao):
+        jogadores_tr = Escalacao(jogadores_tr)
 
-        for _ in range(max_rounds):
-            idx_ct = escolher_estrategia(time_ct, estrategias_ct, modo)
-            idx_tr = escolher_estrategia(time_tr, estrategias_tr, modo)
+    yield InicioHalf(
+        mapa, time_ct, time_tr, overtime, pontos_iniciais_ct, pontos_iniciais_tr
+    )
+    for _ in range(max_rounds):
+        idx_ct = escolher_estrategia(
+            time_ct, estrategias_ct, modo, saida=saida, rng=rng
+        )
+        idx_tr = escolher_estrategia(
+            time_tr, estrategias_tr, modo, saida=saida, rng=rng
+        )
 
-            resultado = decidir_vencedor_round(
-                over_ct, over_tr, "ct", idx_ct, idx_tr, mapa
-            )
+        resultado = decidir_vencedor_round(
+            over_ct, over_tr, "ct", idx_ct, idx_tr, mapa, rng=rng
+        )
+        if resultado == "ct":
+            pontos_ct += 1
+        else:
+            pontos_tr += 1
 
-            if resultado == "ct":
-                pontos_ct += 1
-                print(
-                    f"{time_ct} (CT) venceu! CT {pontos_iniciais_ct + pontos_ct}-{pontos_iniciais_tr + pontos_tr} TR"
-                )
-            else:
-                pontos_tr += 1
-                print(
-                    f"{time_tr} (TR) venceu! CT {pontos_iniciais_ct + pontos_ct}-{pontos_iniciais_tr + pontos_tr} TR"
-                )
+        abates = simular_kills_do_round(
+            resultado, jogadores_ct, jogadores_tr, mapa, rng=rng
+        )
+        placar_ct = pontos_iniciais_ct + pontos_ct
+        placar_tr = pontos_iniciais_tr + pontos_tr
+        yield FimRound(
+            mapa,
+            placar_ct + placar_tr,
+            time_ct,
+            time_tr,
+            time_ct if resultado == "ct" else time_tr,
+            resultado,
+            placar_ct,
+            placar_tr,
+            idx_ct,
+            idx_tr,
+            tuple(abates or ()),
+        )
+        # Verifica se atingiu a meta considerando os pontos iniciais
+        if placar_ct >= meta or placar_tr >= meta:
+            break
+
+    return pontos_ct, pontos_tr
 
-            simular_kills_do_round(resultado, jogadores_ct, jogadores_tr, mapa)
-            # Verifica se atingiu a meta considerando os pontos iniciais
-            if (pontos_iniciais_ct + pontos_ct) >= meta or (
-                pontos_iniciais_tr + pontos_tr
-            ) >= meta:
-                break
 
-        return pontos_ct, pontos_tr
+def jogar_half(
+    # --- Argumentos Obrigatórios ---
+    time_ct: str,
+    time_tr: str,
+    jogadores_ct: Union[List[Dict[str, Any]], Escalacao],
+    jogadores_tr: Union[List[Dict[str, Any]], Escalacao],
+    mapa: str,
+    modo: ModoJogo,
+    # --- Argumentos Opcionais (com valor padrão) ---
+    max_rounds: int = 12,
+    meta: int = 13,
+    pontos_iniciais_ct: int = 0,
+    pontos_iniciais_tr: int = 0,
+    saida: Saida = SAIDA_TERMINAL,
+    contexto: ContextoSimulacao = CONTEXTO_GLOBAL,
+) -> Tuple[int, int]:
+    """Executa um half de jogo e retorna os pontos conquistados pelos lados CT e TR.
+
+    Os elencos podem vir como `Escalacao` (pesos de combate já calculados,
+    como faz `jogar_mapa`) ou como listas de jogadores.
+    """
+    try:
+        return _consumir(
+            eventos_half(
+                time_ct,
+                time_tr,
+                jogadores_ct,
+                jogadores_tr,
+                mapa,
+                modo,
+                max_rounds,
+                meta,
+                pontos_iniciais_ct,
+                pontos_iniciais_tr,
+                saida,
+                contexto,
+            ),
+            saida,
+        )
 
     except KeyError as e:
-        print(f"Erro de configuração: Estratégia não encontrada para o mapa {mapa}")
+        saida.escrever(
+            f"Erro de configuração: Estratégia não encontrada para o mapa {mapa}"
+        )
         raise
     except Exception as e:
         logger.exception("Erro durante o half no mapa %s", mapa)
-        print(f"Erro durante o half: {type(e).__name__} - {str(e)}")
+        saida.escrever(f"Erro durante o half: {type(e).__name__} - {str(e)}")
         raise
 
 
-def jogar_mapa(
+def eventos_mapa(
     time1: str,
     time2: str,
     mapa: str,
     modo: ModoJogo,
     jogadores_time1: List[Dict[str, Any]],
     jogadores_time2: List[Dict[str, Any]],
-) -> ResultadoMapa:
-    """Executa uma partida completa em um mapa"""
+    saida: Saida = SAIDA_TERMINAL,
+    contexto: ContextoSimulacao = CONTEXTO_GLOBAL,
+) -> Generator[Evento, None, ResultadoMapa]:
+    """Gerador de um mapa: InicioMapa, os eventos dos halves e overtimes e
+    FimMapa. Retorna o ResultadoMapa (o mesmo de FimMapa)."""
+    resultado = ResultadoMapa(
+        mapa=mapa,
+        time_ct=time1,
+        time_tr=time2,
+        placar_time1=0,
+        placar_time2=0,
+        rounds=0,
+    )
+    resetar_estatisticas_para_mapa(jogadores_time1, mapa)
+    resetar_estatisticas_para_mapa(jogadores_time2, mapa)
+    # Pesos de kill/death calculados uma vez por time para o mapa todo
+    escalacao_time1 = Escalacao(jogadores_time1)
+    escalacao_time2 = Escalacao(jogadores_time2)
+    yield InicioMapa(
+        mapa,
+        time1,
+        time2,
+        tuple((j["nome"], j["time"]) for j in jogadores_time1 + jogadores_time2),
+    )
 
-    try:
-        resultado = ResultadoMapa(
-            mapa=mapa,
-            time_ct=time1,
-            time_tr=time2,
-            placar_time1=0,
-            placar_time2=0,
-            rounds=0,
-        )
-        resetar_estatisticas_para_mapa(jogadores_time1, mapa)
-        resetar_estatisticas_para_mapa(jogadores_time2, mapa)
+    # Primeiro half (CT: time1, TR: time2)
+    resultado.placar_time1, resultado.placar_time2 = yield from eventos_half(
+        time_ct=time1,
+        time_tr=time2,
+        jogadores_ct=escalacao_time1,
+        jogadores_tr=escalacao_time2,
+        mapa=mapa,
+        modo=modo,
+        max_rounds=12,
+        meta=13,
+        saida=saida,
+        contexto=contexto,
+    )
 
-        # Primeiro half (CT: time1, TR: time2)
-        resultado.placar_time1, resultado.placar_time2 = jogar_half(
-            time_ct=time1,
-            time_tr=time2,
-            jogadores_ct=jogadores_time1,  # Passando a lista de jogadores para o parâmetro correto
-            jogadores_tr=jogadores_time2,  # Passando a lista de jogadores para o parâmetro correto
+    # Segundo half (CT: time2, TR: time1) com pontos iniciais
+    if resultado.placar_time1 < 13 and resultado.placar_time2 < 13:
+        placar_time2_half, placar_time1_half = yield from eventos_half(
+            time_ct=time2,
+            time_tr=time1,
+            jogadores_ct=escalacao_time2,
+            jogadores_tr=escalacao_time1,
             mapa=mapa,
             modo=modo,
-            # Os argumentos abaixo são opcionais, você só precisa passar se quiser mudar o padrão
             max_rounds=12,
             meta=13,
-            pontos_iniciais_ct=0,
-            pontos_iniciais_tr=0,
-        )
-
-        # Segundo half (CT: time2, TR: time1) com pontos iniciais
-        if resultado.placar_time1 < 13 and resultado.placar_time2 < 13:
-            placar_time2_half, placar_time1_half = jogar_half(
-                time_ct=time2,
-                time_tr=time1,
-                jogadores_ct=jogadores_time2,  # Passando a lista de jogadores para o parâmetro correto
-                jogadores_tr=jogadores_time1,  # Passando a lista de jogadores para o parâmetro correto
-                mapa=mapa,
-                modo=modo,
-                # Os argumentos abaixo são opcionais, você só precisa passar se quiser mudar o padrão
-                max_rounds=12,
-                meta=13,
-                pontos_iniciais_ct=resultado.placar_time2,
-                pontos_iniciais_tr=resultado.placar_time1,
-            )
-            resultado.placar_time1 += placar_time1_half
-            resultado.placar_time2 += placar_time2_half
+            pontos_iniciais_ct=resultado.placar_time2,
+            pontos_iniciais_tr=resultado.placar_time1,
+            saida=saida,
+            contexto=contexto,
+        )
+        resultado.placar_time1 += placar_time1_half
+        resultado.placar_time2 += placar_time2_half
+
+    # Verificar empate e iniciar overtime
+    if resultado.placar_time1 == resultado.placar_time2:
+        resultado.placar_time1, resultado.placar_time2 = yield from eventos_ot(
+            time1,
+            time2,
+            mapa,
+            modo,
+            resultado.placar_time1,
+            resultado.placar_time2,
+            1,
+            jogadores_time1=escalacao_time1,
+            jogadores_time2=escalacao_time2,
+            saida=saida,
+            contexto=contexto,
+        )
 
-        # Verificar empate e iniciar overtime
-        if resultado.placar_time1 == resultado.placar_time2:
-            overtime_count = 1
-            resultado = jogar_ot(
-                time1,
-                time2,
-                mapa,
-                modo,
-                resultado,
-                overtime_count,
-                jogadores_time1=jogadores_time1,
-                jogadores_time2=jogadores_time2,
-            )
+    # Número total de rounds jogados no mapa
+    rounds_total = resultado.placar_time1 + resultado.placar_time2
+    resultado.rounds = rounds_total
+    resultado.rounds_extra = max(0, rounds_total - ROUNDS_TEMPO_NORMAL)
 
-        print("\n" + "=" * 40 + "\n🎉 FIM DE MAPA! 🎉")
-        print(
-            f"Placar Final: {time1} {resultado.placar_time1} x {resultado.placar_time2} {time2}"
-        )
-        print("=" * 40 + "\n")
+    # Atualiza o número de rounds jogados de cada jogador
+    escalacao_time1.registrar_rounds(mapa, rounds_total)
+    escalacao_time2.registrar_rounds(mapa, rounds_total)
 
-        # Número total de rounds jogados no mapa
-        rounds_total = resultado.placar_time1 + resultado.placar_time2
-        resultado.rounds = rounds_total
+    resultado.estatisticas_jogadores = fotografar_mapa(
+        jogadores_time1 + jogadores_time2, mapa
+    )
+    contexto.obter_indice().registrar_resultado(resultado)
 
-        # Atualiza o número de rounds jogados de cada jogador
-        for jogador in jogadores_time1 + jogadores_time2:
-            jogador["estatisticas"]["mapas"][mapa]["rounds"] += rounds_total
-            jogador["estatisticas"]["total"]["rounds"] += rounds_total
+    yield FimMapa(resultado)
+    return resultado
 
-        resultado.estatisticas_jogadores = jogadores_time1 + jogadores_time2
 
-        return resultado
+def jogar_mapa(
+    time1: str,
+    time2: str,
+    mapa: str,
+    modo: ModoJogo,
+    jogadores_time1: List[Dict[str, Any]],
+    jogadores_time2: List[Dict[str, Any]],
+    saida: Saida = SAIDA_TERMINAL,
+    contexto: ContextoSimulacao = CONTEXTO_GLOBAL,
+) -> ResultadoMapa:
+    """Executa uma partida completa em um mapa
+
+    Com um gravador no contexto (log_rounds.py), os eventos do mapa vão para
+    ele; quem joga a série fecha a partida com FimPartida.
+    """
+    placar = (0, 0)
+    gravador = contexto.gravador
+    eventos = eventos_mapa(
+        time1, time2, mapa, modo, jogadores_time1, jogadores_time2, saida, contexto
+    )
+    try:
+        while True:
+            try:
+                evento = next(eventos)
+            except StopIteration as fim:
+                return fim.value
+            _narrar(evento, saida)
+            if gravador is not None:
+                gravador.registrar(evento)
+            if isinstance(evento, FimRound):
+                placar = (
+                    (evento.placar_ct, evento.placar_tr)
+                    if evento.time_ct == time1
+                    else (evento.placar_tr, evento.placar_ct)
+                )
 
     except Exception as e:
         logger.exception("Erro durante a execução do mapa %s", mapa)
-        print(f"Erro durante a execução do mapa {mapa}: {str(e)}")
-        resultado.erro = True
-        return resultado
+        saida.escrever(f"Erro durante a execução do mapa {mapa}: {str(e)}")
+        return ResultadoMapa(
+            mapa=mapa,
+            time_ct=time1,
+            time_tr=time2,
+            placar_time1=placar[0],
+            placar_time2=placar[1],
+            rounds=0,
+            erro=True,
+        )
 
 
 def _vencedor_overtime(
-    resultado, placar_meta: int, time1: str, time2: str
+    placar_time1: int,
+    placar_time2: int,
+    placar_meta: int,
+    time1: str,
+    time2: str,
 ) -> Optional[str]:
-    """Verifica se algum time já cravou a meta do overtime e, se sim, anuncia
-    e retorna o nome do vencedor (ou None se ainda não decidido)."""
-    if (
-        resultado.placar_time1 >= placar_meta
-        and resultado.placar_time1 > resultado.placar_time2
-    ):
-        print(
-            f"{time1} venceu o overtime {resultado.placar_time1}-{resultado.placar_time2}!"
-        )
+    """Nome do time que já cravou a meta do overtime (ou None se ainda não
+    decidido)."""
+    if placar_time1 >= placar_meta and placar_time1 > placar_time2:
         return time1
-    if (
-        resultado.placar_time2 >= placar_meta
-        and resultado.placar_time2 > resultado.placar_time1
-    ):
-        print(
-            f"{time2} venceu o overtime {resultado.placar_time1}-{resultado.placar_time2}!"
-        )
+    if placar_time2 >= placar_meta and placar_time2 > placar_time1:
         return time2
     return None
 
 
-def jogar_ot(
+def eventos_ot(
     time1: str,
     time2: str,
     mapa: str,
     modo: ModoJogo,
-    resultado,
+    placar_time1: int,
+    placar_time2: int,
     overtime_count: int,
-    jogadores_time1: List[Dict[str, Any]],
-    jogadores_time2: List[Dict[str, Any]],
-) -> ResultadoMapa:
-    """Joga overtimes (MR3, alternando lado a cada 3 rounds) até decidir o mapa.
-
-    Antes, o código sempre jogava as duas metades do OT antes de checar se a
-    meta havia sido atingida — ou seja, mesmo que um time já tivesse cravado
-    a vitória do overtime na primeira metade, a segunda metade era jogada do
-    mesmo jeito, podendo inflar o placar do adversário e até inverter o
-    resultado real do overtime. Agora o placar é checado logo após cada
-    metade, e a segunda só é jogada se a primeira não decidiu nada.
+    jogadores_time1: Union[List[Dict[str, Any]], Escalacao],
+    jogadores_time2: Union[List[Dict[str, Any]], Escalacao],
+    saida: Saida = SAIDA_TERMINAL,
+    contexto: ContextoSimulacao = CONTEXTO_GLOBAL,
+) -> Generator[Evento, None, Tuple[int, int]]:
+    """Gerador dos overtimes (MR3, alternando lado a cada 3 rounds) até
+    decidir o mapa. Retorna o placar final (time1, time2).
+
+    O placar é checado logo após cada metade, e a segunda só é jogada se a
+    primeira não decidiu nada.
     """
     while True:
-        print(
-            f"\n=== Overtime {overtime_count} (Placar: {resultado.placar_time1}-{resultado.placar_time2}) ==="
+        placar_meta = max(placar_time1, placar_time2) + 3  # Meta para vencer o overtime
+        yield InicioOvertime(
+            mapa, overtime_count, placar_time1, placar_time2, placar_meta
         )
-        placar_meta = (
-            max(resultado.placar_time1, resultado.placar_time2) + 3
-        )  # Meta para vencer o overtime
 
         # Primeira metade do overtime (Time 1 no CT)
-        placar_time1_1ot, placar_time2_1ot = jogar_half(
+        placar_time1_1ot, placar_time2_1ot = yield from eventos_half(
             time_ct=time1,
             time_tr=time2,
             jogadores_ct=jogadores_time1,
@@ -357,19 +558,27 @@ def jogar_ot(
             modo=modo,
             max_rounds=3,
             meta=placar_meta,
-            pontos_iniciais_ct=resultado.placar_time1,
-            pontos_iniciais_tr=resultado.placar_time2,
+            pontos_iniciais_ct=placar_time1,
+            pontos_iniciais_tr=placar_time2,
+            saida=saida,
+            contexto=contexto,
+            overtime=overtime_count,
         )
-        resultado.placar_time1 += placar_time1_1ot
-        resultado.placar_time2 += placar_time2_1ot
+        placar_time1 += placar_time1_1ot
+        placar_time2 += placar_time2_1ot
 
-        vencedor = _vencedor_overtime(resultado, placar_meta, time1, time2)
+        vencedor = _vencedor_overtime(
+            placar_time1, placar_time2, placar_meta, time1, time2
+        )
         if vencedor:
-            return resultado
+            yield FimOvertime(
+                mapa, overtime_count, vencedor, placar_time1, placar_time2
+            )
+            return placar_time1, placar_time2
 
         # Segunda metade do overtime (Time 2 no CT) — só roda se ninguém
         # cravou a vitória na primeira metade.
-        placar_time2_2ot, placar_time1_2ot = jogar_half(
+        placar_time2_2ot, placar_time1_2ot = yield from eventos_half(
             time_ct=time2,
             time_tr=time1,
             jogadores_ct=jogadores_time2,
@@ -378,27 +587,81 @@ def jogar_ot(
             modo=modo,
             max_rounds=3,
             meta=placar_meta,
-            pontos_iniciais_ct=resultado.placar_time2,
-            pontos_iniciais_tr=resultado.placar_time1,
+            pontos_iniciais_ct=placar_time2,
+            pontos_iniciais_tr=placar_time1,
+            saida=saida,
+            contexto=contexto,
+            overtime=overtime_count,
         )
-        resultado.placar_time1 += placar_time1_2ot
-        resultado.placar_time2 += placar_time2_2ot
+        placar_time1 += placar_time1_2ot
+        placar_time2 += placar_time2_2ot
 
-        vencedor = _vencedor_overtime(resultado, placar_meta, time1, time2)
+        vencedor = _vencedor_overtime(
+            placar_time1, placar_time2, placar_meta, time1, time2
+        )
         if vencedor:
-            return resultado
+            yield FimOvertime(
+                mapa, overtime_count, vencedor, placar_time1, placar_time2
+            )
+            return placar_time1, placar_time2
 
         # Ninguém decidiu: próximo overtime
         overtime_count += 1
 
 
+def jogar_ot(
+    time1: str,
+    time2: str,
+    mapa: str,
+    modo: ModoJogo,
+    resultado,
+    overtime_count: int,
+    jogadores_time1: Union[List[Dict[str, Any]], Escalacao],
+    jogadores_time2: Union[List[Dict[str, Any]], Escalacao],
+    saida: Saida = SAIDA_TERMINAL,
+    contexto: ContextoSimulacao = CONTEXTO_GLOBAL,
+) -> ResultadoMapa:
+    """Joga overtimes (MR3, alternando lado a cada 3 rounds) até decidir o mapa.
+
+    Antes, o código sempre jogava as duas metades do OT antes de checar se a
+    meta havia sido atingida — ou seja, mesmo que um time já tivesse cravado
+    a vitória do overtime na primeira metade, a segunda metade era jogada do
+    mesmo jeito, podendo inflar o placar do adversário e até inverter o
+    resultado real do overtime. Agora o placar é checado logo após cada
+    metade, e a segunda só é jogada se a primeira não decidiu nada.
+    """
+    resultado.placar_time1, resultado.placar_time2 = _consumir(
+        eventos_ot(
+            time1,
+            time2,
+            mapa,
+            modo,
+            resultado.placar_time1,
+            resultado.placar_time2,
+            overtime_count,
+            jogadores_time1,
+            jogadores_time2,
+            saida,
+            contexto,
+        ),
+        saida,
+    )
+    return resultado
+
+
 def jogar_partida(
     modo: ModoJogo = "manual",
     time1: str = None,
     time2: str = None,
     fase_torneio: str = None,
+    saida: Saida = SAIDA_TERMINAL,
+    contexto: ContextoSimulacao = CONTEXTO_GLOBAL,
 ) -> ResultadoPartida:
-    """Gerencia uma partida completa entre dois times"""
+    """Gerencia uma partida completa entre dois times.
+
+    A narração vai para `saida` (terminal por padrão, como sempre foi).
+    Sorteios, elencos e id da partida vêm de `contexto`.
+    """
     try:
 
         if not Path(TIMES_CSV).exists():
@@ -411,50 +674,64 @@ def jogar_partida(
 
         # Validação inicial
         try:
-            time1 = validar_time(time1) if time1 else random.choice(times)
+            time1 = validar_time(time1) if time1 else contexto.rng.choice(times)
             time2 = (
                 validar_time(time2)
                 if time2
-                else random.choice([t for t in times if t != time1])
+                else contexto.rng.choice([t for t in times if t != time1])
             )
-            jogadores_Dataframe = carregar_jogadores_de_arquivo(JOGADORES_CSV)
-            jogadores_time1 = obter_jogadores(time1, jogadores_Dataframe)
-            jogadores_time2 = obter_jogadores(time2, jogadores_Dataframe)
+            registro = contexto.obter_registro()
+            jogadores_time1 = registro.jogadores(time1)
+            jogadores_time2 = registro.jogadores(time2)
 
         except (ValueError, IndexError) as e:
             raise RuntimeError(f"Seleção de times inválida: {str(e)}")
 
         resultado = ResultadoPartida(
-            partida_id=ContadorPartidas.proxima_partida(),
+            partida_id=contexto.proxima_partida(),
             mapas=[],
             modo_jogo=modo,
             fase=fase_torneio,
         )
 
-        print(f"\n=== PARTIDA {resultado.partida_id} ===")
-        print(f"Times: {time1} vs {time2}")
-        print(f"Modo: {modo.replace('-', ' ').title()}\n")
+        saida.escrever(f"\n=== PARTIDA {resultado.partida_id} ===")
+        saida.escrever(f"Times: {time1} vs {time2}")
+        saida.escrever(f"Modo: {modo.replace('-', ' ').title()}\n")
 
-        # Seleção de mapas
+        # Seleção de mapas (no modo auto, o veto é automático)
         try:
-            mapas = vetar_e_escolher_mapas(time1, time2)
+            automatico = modo == "auto"
+            if not automatico:
+                saida.descarregar()  # o veto é interativo
+            mapas = vetar_e_escolher_mapas(
+                time1, time2, automatico=automatico, registro=registro
+            )
             if not mapas:
                 raise RuntimeError("Nenhum mapa válido selecionado")
+            if automatico:
+                saida.escrever(f"Mapas: {', '.join(mapas)}")
         except Exception as e:
             logger.exception("Erro na seleção de mapas entre %s e %s", time1, time2)
-            print(f"Erro na seleção de mapas: {str(e)}")
+            saida.escrever(f"Erro na seleção de mapas: {str(e)}")
             return None
 
         # Execução dos mapas
         for mapa in mapas:
             try:
-                print(f"\n=== MAPA: {mapa.upper()} ===")
+                saida.escrever(f"\n=== MAPA: {mapa.upper()} ===")
                 resultado_mapa = jogar_mapa(
-                    time1, time2, mapa, modo, jogadores_time1, jogadores_time2
+                    time1,
+                    time2,
+                    mapa,
+                    modo,
+                    jogadores_time1,
+                    jogadores_time2,
+                    saida=saida,
+                    contexto=contexto,
                 )
 
                 if resultado_mapa.erro:
-                    print(f"Mapa {mapa} ignorado devido a erros")
+                    saida.escrever(f"Mapa {mapa} ignorado devido a erros")
                     continue
 
                 resultado_mapa.fase = fase_torneio
@@ -467,12 +744,18 @@ def jogar_partida(
                     1 for m in resultado.mapas if m.placar_time2 > m.placar_time1
                 )
 
-                print(
+                saida.escrever(
                     f"\nPlacar atual: {time1} {vitorias_time1}-{vitorias_time2} {time2}"
                 )
 
                 mostrar_estatisticas_por_mapa(
-                    jogadores_time1, jogadores_time2, mapa, time1, time2, times_config
+                    jogadores_time1,
+                    jogadores_time2,
+                    mapa,
+                    time1,
+                    time2,
+                    times_config,
+                    saida=saida,
                 )
 
                 if vitorias_time1 >= 2 or vitorias_time2 >= 2:
@@ -480,38 +763,48 @@ def jogar_partida(
 
             except Exception as e:
                 logger.exception("Erro crítico durante o mapa %s", mapa)
-                print(f"Erro crítico durante o mapa {mapa}: {str(e)}")
+                saida.escrever(f"Erro crítico durante o mapa {mapa}: {str(e)}")
                 return None
 
         resultado.vencedor, resultado.perdedor = (
             (time1, time2) if vitorias_time1 > vitorias_time2 else (time2, time1)
         )
+        if contexto.gravador is not None:
+            contexto.gravador.registrar(
+                FimPartida(resultado.vencedor, resultado.perdedor, resultado)
+            )
 
-        print(f"\n=== RESULTADO FINAL ===")
-        print(f"VENCEDOR: {resultado.vencedor}")
+        saida.escrever(f"\n=== RESULTADO FINAL ===")
+        saida.escrever(f"VENCEDOR: {resultado.vencedor}")
 
-        print("\n" + "=" * 40 + "\n🎉 FIM DE JOGO! 🎉")
-        print(f"Placar Final: {time1} {vitorias_time1} x {vitorias_time2} {time2}")
-        print("=" * 40 + "\n")
+        saida.escrever("\n" + "=" * 40 + "\n🎉 FIM DE JOGO! 🎉")
+        saida.escrever(
+            f"Placar Final: {time1} {vitorias_time1} x {vitorias_time2} {time2}"
+        )
+        saida.escrever("=" * 40 + "\n")
         # print(f"📊 Estatísticas Finais - {time1}:")
 
         # Mostra os placares dos mapas
-        print("\nPlacares dos Mapas:")
+        saida.escrever("\nPlacares dos Mapas:")
         for mapa_result in resultado.mapas:
-            print(
+            saida.escrever(
                 f"- {mapa_result.mapa}: {time1} {mapa_result.placar_time1} x {mapa_result.placar_time2} {time2}"
             )
 
-        print("=" * 40 + "\n")
+        saida.escrever("=" * 40 + "\n")
         mostrar_estatisticas_finais(
-            jogadores_time1, jogadores_time2, time1, time2, times_config
+            jogadores_time1, jogadores_time2, time1, time2, times_config, saida=saida
         )
+        saida.descarregar()
 
         return resultado
 
     except Exception as e:
         logger.exception("Erro fatal na partida entre %s e %s", time1, time2)
-        print(f"Erro fatal na partida: {str(e)}")
+        saida.escrever(f"Erro fatal na partida: {str(e)}")
+        saida.descarregar()
+        if contexto.gravador is not None:
+            contexto.gravador.descartar()
         return None
 
 
@@ -528,8 +821,9 @@ def jogar_partida(
 # jogar_partida(modo='auto', time1="FURIA", time2="Liquid")
 
 
-# obter_jogadores NÃO é redefinida aqui — usa-se a versão única, importada de
-# gerador_kills_deaths (ver topo do arquivo). Havia uma cópia duplicada nesta
+# obter_jogadores NÃO é redefinida aqui — os elencos vêm do registro do
+# contexto (registro_times.py), que usa a versão única de
+# gerador_kills_deaths. Havia uma cópia duplicada nesta
 # posição que sombreava o import e não incluía a chave "time" no dicionário
 # do jogador, causando KeyError em salvar_estatisticas_torneio sempre que uma
 # partida vinha de jogar_partida() (modo manual / partidas do jogador em
@@ -537,28 +831,20 @@ def jogar_partida(
 
 
 def calcular_probabilidade_vitoria(
-    over_ct, over_tr, lado_time, estrategia_ct, estrategia_tr, mapa, k=0.1
+    over_ct, over_tr, lado_time, estrategia_ct, estrategia_tr, mapa, k=K_SIGMOIDE
 ):
-    peso_over = 0.3
-    peso_lado = 0.3
-    peso_estrategia = 0.6
-    peso_randomico = 1.2
+    """Chance do CT vencer o round, já integrada sobre o fator randômico.
 
+    Antes esta função sorteava `random.uniform(-1, 1)` dentro da sigmoide (e
+    um cara ou coroa quando o par de estratégias não tinha regra), e depois
+    `decidir_vencedor_round` sorteava de novo. Agora a probabilidade é exata
+    (ver modelo_round.probabilidade_ct) e o round custa um sorteio só, com a
+    mesma distribuição de antes.
+    """
     diferenca_over = over_ct - over_tr
     vantagem_lado = 1 if lado_time == "ct" else -1
-    resultado_estrategia = estrategia_resultado(estrategia_ct, estrategia_tr, mapa)
-    vantagem_estrategia = 1 if resultado_estrategia == "ct" else -1
-
-    score = (
-        (peso_over * diferenca_over)
-        + (peso_lado * vantagem_lado)
-        + (peso_estrategia * vantagem_estrategia)
-        + (peso_randomico * random.uniform(-1, 1))
-    )
-
-    # Função sigmoide para limitar extremos
-    probabilidade = 1 / (1 + math.exp(-k * score))
-    return probabilidade
+    vantagem_estrategia = resultado_estrategias(estrategia_ct, estrategia_tr, mapa)
+    return probabilidade_ct(diferenca_over, vantagem_lado, vantagem_estrategia, k)
 
 
 def resetar_estatisticas_para_mapa(jogadores: list[dict], mapa: str):
@@ -580,6 +866,7 @@ def decidir_vencedor_round(
     estrategia_ct: str,
     estrategia_tr: str,
     mapa: str,
+    rng=random,
 ) -> str:
     """
     Decide o vencedor do round com base no over, lado, estratégias e fator randômico.
@@ -588,7 +875,7 @@ def decidir_vencedor_round(
         over_ct, over_tr, lado_time, estrategia_ct, estrategia_tr, mapa
     )
 
-    if random.random() < probabilidade_ct:
+    if rng.random() < probabilidade_ct:
         return "ct"
     else:
         return "tr"
@@ -600,23 +887,23 @@ def carregar_times_config(caminho_csv=TIMES_CSV):
     a configuração visual de cada time. Usa csv.reader (não DictReader) de
     propósito: o arquivo não tem linha de cabeçalho, então usar DictReader
     faria a primeira linha de dados virar cabeçalho e "sumir" com o primeiro
-    time da lista."""
-    config = {}
-    with open(caminho_csv, newline="", encoding="utf-8") as f:
-        reader = csv.reader(f)
-        for linha in reader:
-            if not linha or not linha[0].strip():
-                continue
-            nome, emoji, cor_nome = (linha + ["", ""])[:3]
-            cor = getattr(Fore, cor_nome.strip().upper(), "")
-            config[nome.strip().lower()] = {"emoji": emoji.strip(), "cor": cor}
-    return config
+    time da lista.
+
+    A leitura em si agora fica no registro em memória (registro_times.py):
+    o arquivo só é relido se mudar no disco."""
+    return obter_registro(arquivo_times=caminho_csv).times_config()
 
 
 def mostrar_estatisticas_por_mapa(
-    jogadores_time1, jogadores_time2, mapa, nome_time1, nome_time2, config
+    jogadores_time1,
+    jogadores_time2,
+    mapa,
+    nome_time1,
+    nome_time2,
+    config,
+    saida: Saida = SAIDA_TERMINAL,
 ):
-    print(f"\n📊 Estatísticas no mapa {mapa}:")
+    saida.escrever(f"\n📊 Estatísticas no mapa {mapa}:")
 
     for nome_time, jogadores in [
         (nome_time1, jogadores_time1),
@@ -625,7 +912,7 @@ def mostrar_estatisticas_por_mapa(
         cfg = config.get(nome_time, {"emoji": "", "cor": ""})
         cor, emoji = cfg["cor"], cfg["emoji"]
 
-        print(f"\n➡️ {cor}{emoji} {nome_time}{Style.RESET_ALL}")
+        saida.escrever(f"\n➡️ {cor}{emoji} {nome_time}{Style.RESET_ALL}")
         for p in sorted(
             jogadores,
             key=lambda x: x["estatisticas"]["mapas"][mapa]["kills"],
@@ -634,7 +921,7 @@ def mostrar_estatisticas_por_mapa(
             k = p["estatisticas"]["mapas"][mapa]["kills"]
             d = p["estatisticas"]["mapas"][mapa]["deaths"]
             diff = k - d
-            print(
+            saida.escrever(
                 f" - {p['nome']:<12} | "
                 f"K: {cor}{k:<3}{Style.RESET_ALL} "
                 f"D: {d:<3} | "
@@ -644,9 +931,14 @@ def mostrar_estatisticas_por_mapa(
 
 
 def mostrar_estatisticas_finais(
-    jogadores_time1, jogadores_time2, nome_time1, nome_time2, config
+    jogadores_time1,
+    jogadores_time2,
+    nome_time1,
+    nome_time2,
+    config,
+    saida: Saida = SAIDA_TERMINAL,
 ):
-    print("\n📊 Estatísticas finais acumuladas:")
+    saida.escrever("\n📊 Estatísticas finais acumuladas:")
 
     for nome_time, jogadores in [
         (nome_time1, jogadores_time1),
@@ -655,14 +947,14 @@ def mostrar_estatisticas_finais(
         cfg = config.get(nome_time, {"emoji": "", "cor": ""})
         cor, emoji = cfg["cor"], cfg["emoji"]
 
-        print(f"\n➡️ {cor}{emoji} {nome_time} (Totais){Style.RESET_ALL}")
+        saida.escrever(f"\n➡️ {cor}{emoji} {nome_time} (Totais){Style.RESET_ALL}")
         for p in sorted(
             jogadores, key=lambda x: x["estatisticas"]["total"]["kills"], reverse=True
         ):
             k = p["estatisticas"]["total"]["kills"]
             d = p["estatisticas"]["total"]["deaths"]
             diff = k - d
-            print(
+            saida.escrever(
                 f" - {p['nome']:<12} | "
                 f"K: {cor}{k:<3}{Style.RESET_ALL} "
                 f"D: {d:<3} | "
@@ -671,11 +963,11 @@ def mostrar_estatisticas_finais(
             )
 
     # Resumo por mapa
-    print("\n📌 Estatísticas por mapa:")
+    saida.escrever("\n📌 Estatísticas por mapa:")
     mapas = list(jogadores_time1[0]["estatisticas"]["mapas"].keys())
 
     for mapa in mapas:
-        print(f"\nMapa {mapa}:")
+        saida.escrever(f"\nMapa {mapa}:")
         for nome_time, jogadores in [
             (nome_time1, jogadores_time1),
             (nome_time2, jogadores_time2),
@@ -683,7 +975,7 @@ def mostrar_estatisticas_finais(
             cfg = config.get(nome_time, {"emoji": "", "cor": ""})
             cor, emoji = cfg["cor"], cfg["emoji"]
 
-            print(f"\n➡️ {cor}{emoji} {nome_time}{Style.RESET_ALL}")
+            saida.escrever(f"\n➡️ {cor}{emoji} {nome_time}{Style.RESET_ALL}")
             for p in sorted(
                 jogadores,
                 key=lambda x: x["estatisticas"]["mapas"][mapa]["kills"],
@@ -691,84 +983,101 @@ def mostrar_estatisticas_finais(
             ):
                 k = p["estatisticas"]["mapas"][mapa]["kills"]
                 d = p["estatisticas"]["mapas"][mapa]["deaths"]
-                print(
+                saida.escrever(
                     f" - {p['nome']:<12} | "
                     f"K: {cor}{k:<3}{Style.RESET_ALL} "
                     f"D: {d:<3}"
                 )
 
 
-def simular_partidas_em_lote_auto(
-    time1: str, time2: str, n: int = 100, modo: ModoJogo = "auto"
-):
-    """
-    Simula N partidas entre dois times, escolhendo mapas automaticamente,
-    e retorna K/D acumulado dos jogadores ao longo de todas as partidas.
+def _jogar_partida_do_lote(
+    time1: str,
+    time2: str,
+    modo: ModoJogo,
+    saida: Saida,
+    kills: Dict[str, int],
+    deaths: Dict[str, int],
+    times_jogador: Dict[str, str],
+    contexto: ContextoSimulacao = CONTEXTO_GLOBAL,
+    partida_id: int = 0,
+) -> Tuple[List[ResultadoMapa], str]:
+    """Uma partida de `simular_partidas_em_lote_auto`, somando K/D no lugar.
+
+    Devolve os mapas jogados e o vencedor. Fica separada para que os
+    processos de simulacao_paralela.py joguem exatamente a mesma partida.
+    `partida_id` só é usado para gravar a partida no gravador do contexto.
     """
-    resultados_partidas = []
-
-    # Estatísticas agregadas globais
-    kills_agg = defaultdict(list)
-    deaths_agg = defaultdict(list)
-    times_jogador = {}  # salvar qual time cada jogador pertence
-    vitorias = {time1: 0, time2: 0}
-
-    for i in range(n):
-        print(f"\n=== Simulação {i+1}/{n} ===")
-
-        # Escolhe mapas aleatoriamente (pode ser 3 mapas por partida)
-        mapas_disponiveis = list(estrategias_por_mapa.keys())
-        mapas_escolhidos = random.sample(
-            mapas_disponiveis, min(3, len(mapas_disponiveis))
-        )
-
-        # Carrega jogadores
-        df_jogadores = carregar_jogadores_de_arquivo(JOGADORES_CSV)
-        jogadores_time1 = obter_jogadores(time1, df_jogadores)
-        jogadores_time2 = obter_jogadores(time2, df_jogadores)
-
-        # salvar times
-        for j in jogadores_time1:
-            times_jogador[j["nome"]] = time1
-        for j in jogadores_time2:
-            times_jogador[j["nome"]] = time2
-
-        resultado = ResultadoPartida(
-            partida_id=ContadorPartidas.proxima_partida(), mapas=[]
+    # Elencos novos a cada simulação (as estatísticas são mutáveis),
+    # montados a partir do registro em memória
+    registro = contexto.obter_registro()
+    mapas_escolhidos = vetar_automatico(time1, time2, registro=registro)
+    jogadores_time1 = registro.jogadores(time1)
+    jogadores_time2 = registro.jogadores(time2)
+
+    # salvar times
+    for j in jogadores_time1:
+        times_jogador[j["nome"]] = time1
+    for j in jogadores_time2:
+        times_jogador[j["nome"]] = time2
+
+    mapas = []
+    for mapa in mapas_escolhidos:
+        resultado_mapa = jogar_mapa(
+            time1,
+            time2,
+            mapa,
+            modo,
+            jogadores_time1,
+            jogadores_time2,
+            saida,
+            contexto=contexto,
         )
+        mapas.append(resultado_mapa)
 
-        for mapa in mapas_escolhidos:
-            resultado_mapa = jogar_mapa(
-                time1, time2, mapa, modo, jogadores_time1, jogadores_time2
+        # Agrega kills e deaths globais
+        for jogador in jogadores_time1 + jogadores_time2:
+            estatisticas_mapa = jogador["estatisticas"]["mapas"][mapa]
+            kills[jogador["nome"]] += estatisticas_mapa["kills"]
+            deaths[jogador["nome"]] += estatisticas_mapa["deaths"]
+
+    # Determina vencedor da partida
+    vitorias_time1 = sum(1 for m in mapas if m.placar_time1 > m.placar_time2)
+    vitorias_time2 = sum(1 for m in mapas if m.placar_time2 > m.placar_time1)
+    vencedor = time1 if vitorias_time1 > vitorias_time2 else time2
+    if contexto.gravador is not None:
+        perdedor = time2 if vencedor == time1 else time1
+        contexto.gravador.registrar(
+            FimPartida(
+                vencedor,
+                perdedor,
+                ResultadoPartida(
+                    partida_id=partida_id,
+                    mapas=mapas,
+                    vencedor=vencedor,
+                    perdedor=perdedor,
+                    modo_jogo=modo,
+                ),
             )
-            resultado.mapas.append(resultado_mapa)
-
-            # Agrega kills e deaths globais
-            for jogador in jogadores_time1 + jogadores_time2:
-                kills_agg[jogador["nome"]].append(
-                    jogador["estatisticas"]["mapas"][mapa]["kills"]
-                )
-                deaths_agg[jogador["nome"]].append(
-                    jogador["estatisticas"]["mapas"][mapa]["deaths"]
-                )
-
-        # Determina vencedor da partida
-        vitorias_time1 = sum(
-            1 for m in resultado.mapas if m.placar_time1 > m.placar_time2
         )
-        vitorias_time2 = sum(
-            1 for m in resultado.mapas if m.placar_time2 > m.placar_time1
-        )
-        vencedor = time1 if vitorias_time1 > vitorias_time2 else time2
-        vitorias[vencedor] += 1
+    return mapas, vencedor
 
-        resultados_partidas.append(resultado)
 
-    # Calcula médias globais por jogador
+def _tabela_kd(
+    kills: Dict[str, int],
+    deaths: Dict[str, int],
+    times_jogador: Dict[str, str],
+    n: int,
+    erros_padrao: Optional[Dict[str, Tuple[float, float]]] = None,
+) -> pd.DataFrame:
+    """Médias por partida e K/D de cada jogador, como no resumo do lote.
+
+    Com `erros_padrao` ({jogador: (kills, deaths)}), a tabela ganha as
+    colunas "EP Kills" e "EP Deaths", o erro padrão de cada média.
+    """
     kd_geral = {}
-    for jogador in kills_agg.keys():
-        total_kills = sum(kills_agg[jogador])
-        total_deaths = sum(deaths_agg[jogador])
+    for jogador in kills.keys():
+        total_kills = kills[jogador]
+        total_deaths = deaths[jogador]
         kd_geral[jogador] = {
             "Time": times_jogador[jogador],
             "Kills": round(total_kills / n, 2),
@@ -777,10 +1086,141 @@ def simular_partidas_em_lote_auto(
                 (total_kills / total_deaths) if total_deaths != 0 else float("inf"), 2
             ),
         }
+        if erros_padrao is not None:
+            ep_kills, ep_deaths = erros_padrao[jogador]
+            kd_geral[jogador]["EP Kills"] = round(ep_kills, 3)
+            kd_geral[jogador]["EP Deaths"] = round(ep_deaths, 3)
 
     # Converte em DataFrame para mostrar tabela organizada
     kd_df = pd.DataFrame(kd_geral).T
-    kd_df = kd_df.sort_values(by=["Time", "K/D"], ascending=[True, False])
+    return kd_df.sort_values(by=["Time", "K/D"], ascending=[True, False])
+
+
+def _somar_lote(
+    time1: str,
+    time2: str,
+    n: int,
+    modo: ModoJogo,
+    saida: Saida,
+    workers: Optional[int],
+    semente: Optional[int],
+    contexto: ContextoSimulacao,
+    guardar_partidas: bool,
+    agregador: AgregadorLote,
+) -> List[ResultadoPartida]:
+    """Joga n partidas somando tudo em `agregador`, sem imprimir o resumo.
+
+    Devolve as partidas guardadas (só com `guardar_partidas`). Também usada
+    pelos blocos de parada_adaptativa.py.
+    """
+    resultados_partidas = []
+
+    if workers is not None:
+        if contexto.gravador is not None:
+            raise ValueError("o gravador de rounds não funciona com workers")
+        from simulacao_paralela import simular_partidas_paralelo
+
+        agregado = simular_partidas_paralelo(
+            time1,
+            time2,
+            n,
+            workers=workers,
+            semente=semente,
+            modo=modo,
+            histogramas=agregador.histogramas,
+        )
+        agregador.juntar(agregado["agregador"])
+    else:
+        for i in range(n):
+            saida.escrever(f"\n=== Simulação {i+1}/{n} ===")
+            kills = defaultdict(int)
+            deaths = defaultdict(int)
+            times_jogador = {}  # salvar qual time cada jogador pertence
+            partida_id = contexto.proxima_partida()
+            mapas, vencedor = _jogar_partida_do_lote(
+                time1,
+                time2,
+                modo,
+                saida,
+                kills,
+                deaths,
+                times_jogador,
+                contexto,
+                partida_id,
+            )
+            agregador.registrar_partida(kills, deaths, times_jogador, vencedor)
+            if guardar_partidas:
+                resultados_partidas.append(
+                    ResultadoPartida(partida_id=partida_id, mapas=mapas)
+                )
+
+    return resultados_partidas
+
+
+def simular_partidas_em_lote_auto(
+    time1: str,
+    time2: str,
+    n: int = 100,
+    modo: ModoJogo = "auto",
+    saida: Saida = SAIDA_NULA,
+    workers: Optional[int] = None,
+    semente: Optional[int] = None,
+    contexto: ContextoSimulacao = CONTEXTO_GLOBAL,
+    guardar_partidas: bool = False,
+    agregador: Optional[AgregadorLote] = None,
+):
+    """
+    Simula N partidas entre dois times, escolhendo mapas automaticamente,
+    e retorna K/D acumulado dos jogadores ao longo de todas as partidas.
+
+    A narração de cada round/mapa vai para `saida`, que por padrão descarta
+    tudo (ninguém lê 100 partidas narradas round a round, e imprimir isso
+    dominava o tempo da simulação). Só o resumo final é impresso.
+
+    Cada partida é somada num `AgregadorLote` (agregacao_lote.py) assim que
+    termina, então a memória não cresce com N. A tabela de K/D traz também
+    o erro padrão das médias ("EP Kills", "EP Deaths"). Os `ResultadoPartida`
+    só são guardados (e devolvidos) com `guardar_partidas=True`; para ter
+    as estatísticas por time ou os histogramas, passe o seu `agregador`
+    (por exemplo `AgregadorLote(histogramas=True)`), que é preenchido aqui.
+
+    Com `workers`, as N partidas são divididas em fatias de tamanho fixo e
+    jogadas num pool de processos (simulacao_paralela.py), cada fatia com a
+    sua semente derivada de `semente`. Os processos só devolvem agregadores,
+    então a lista de partidas volta vazia; o resultado depende só de
+    `semente`, não do número de processos. Sem `workers`, os sorteios,
+    elencos e ids vêm de `contexto` (com `semente`, de uma cópia dele com
+    `random.Random(semente)`), e as partidas vão para o gravador de
+    rounds do contexto, se houver (com `workers`, ter um gravador é erro).
+    """
+    if agregador is None:
+        agregador = AgregadorLote()
+    if semente is not None and workers is None:
+        contexto = contexto.com_semente(semente)
+    resultados_partidas = _somar_lote(
+        time1,
+        time2,
+        n,
+        modo,
+        saida,
+        workers,
+        semente,
+        contexto,
+        guardar_partidas,
+        agregador,
+    )
+
+    vitorias = {time1: 0, time2: 0}
+    vitorias.update(agregador.vitorias)
+
+    # Calcula médias globais por jogador
+    kd_df = _tabela_kd(
+        agregador.kills,
+        agregador.deaths,
+        agregador.times_jogador,
+        agregador.partidas,
+        agregador.erros_padrao(),
+    )
 
     # Exibe resumo
     print("\n=== RESUMO DA SIMULAÇÃO ===")
@@ -793,18 +1233,74 @@ def simular_partidas_em_lote_auto(
     return resultados_partidas, vitorias, kd_df
 
 
-# Mesma função, adaptada para um jogo apenas
-def simular_partida_auto(time1: str, time2: str, fase, modo: ModoJogo = "auto"):
-    """
-    Simula 1 partida entre dois times, escolhendo mapas automaticamente,
-    e retorna o vencedor, perdedor e ResultadoPartida completo com estatísticas atualizadas.
+def _partida_sorteada(
+    time1: str,
+    time2: str,
+    fase,
+    mapas: List[str],
+    resultado: ResultadoPartida,
+    memo: MemoMapas,
+    contexto: ContextoSimulacao,
+) -> Tuple[str, str, ResultadoPartida]:
+    """Série de `simular_partida_auto` com o placar de cada mapa sorteado."""
+    over_time1 = _over_medio(time1, contexto)
+    over_time2 = _over_medio(time2, contexto)
+    indice = contexto.obter_indice()
+    vitorias_time1 = vitorias_time2 = 0
+    for mapa in mapas:
+        placar_time1, placar_time2 = memo.sortear_placar(
+            over_time1, over_time2, mapa, contexto.rng
+        )
+        resultado_mapa = ResultadoMapa(
+            mapa=mapa,
+            time_ct=time1,
+            time_tr=time2,
+            placar_time1=placar_time1,
+            placar_time2=placar_time2,
+            rounds=placar_time1 + placar_time2,
+            rounds_extra=max(0, placar_time1 + placar_time2 - ROUNDS_TEMPO_NORMAL),
+            fase=fase,
+        )
+        indice.registrar_resultado(resultado_mapa)
+        resultado.mapas.append(resultado_mapa)
+        if placar_time1 > placar_time2:
+            vitorias_time1 += 1
+        else:
+            vitorias_time2 += 1
+        if vitorias_time1 == 2 or vitorias_time2 == 2:
+            break
+
+    if vitorias_time1 > vitorias_time2:
+        resultado.vencedor, resultado.perdedor = time1, time2
+    else:
+        resultado.vencedor, resultado.perdedor = time2, time1
+    return resultado.vencedor, resultado.perdedor, resultado
+
+
+def eventos_partida(
+    time1: str,
+    time2: str,
+    fase=None,
+    modo: ModoJogo = "auto",
+    mapas: Optional[List[str]] = None,
+    saida: Saida = SAIDA_NULA,
+    contexto: ContextoSimulacao = CONTEXTO_GLOBAL,
+) -> Generator[Evento, None, Tuple[str, str, ResultadoPartida]]:
+    """Gerador da série MD3 de `simular_partida_auto`: os eventos de cada
+    mapa e FimPartida. Retorna (vencedor, perdedor, ResultadoPartida).
+
+    Sem `mapas`, os mapas saem do veto automático.
     """
     resultado = ResultadoPartida(
-        partida_id=ContadorPartidas.proxima_partida(), mapas=[]
+        partida_id=contexto.proxima_partida(), mapas=[], modo_jogo=modo, fase=fase
     )
 
-    # Carrega jogadores
-    df_jogadores = carregar_jogadores_de_arquivo(JOGADORES_CSV)
+    # Carrega jogadores (do registro em memória, sem reler o CSV)
+    registro = contexto.obter_registro()
+
+    if mapas is None:
+        # Veto automático (tabela de chances por mapa em cache)
+        mapas = vetar_automatico(time1, time2, registro=registro)
 
     jogadores_time1 = [
         {
@@ -815,12 +1311,10 @@ def simular_partida_auto(time1: str, time2: str, fase, modo: ModoJogo = "auto"):
             "rounds": 0,
             "over": j.get("over", 1.0),
             "role": j.get("role", "rifler"),
-            "estatisticas": {
-                "mapas": {},  # estatísticas por mapa
-                "total": {"kills": 0, "deaths": 0, "rounds": 0},  # estatísticas gerais
-            },
+            # Visão no EstatisticasElenco novo que o registro monta por time
+            "estatisticas": j["estatisticas"],
         }
-        for j in obter_jogadores(time1, df_jogadores)
+        for j in registro.jogadores(time1)
     ]
 
     jogadores_time2 = [
@@ -832,26 +1326,25 @@ def simular_partida_auto(time1: str, time2: str, fase, modo: ModoJogo = "auto"):
             "rounds": 0,
             "over": j.get("over", 1.0),
             "role": j.get("role", "rifler"),
-            "estatisticas": {
-                "mapas": {},
-                "total": {"kills": 0, "deaths": 0, "rounds": 0},
-            },
+            "estatisticas": j["estatisticas"],
         }
-        for j in obter_jogadores(time2, df_jogadores)
+        for j in registro.jogadores(time2)
     ]
 
-    # Escolhe os mapas
-    mapas_escolhidos = random.sample(
-        list(estrategias_por_mapa.keys()), min(3, len(estrategias_por_mapa))
-    )
-
     vitorias_time1 = 0
     vitorias_time2 = 0
 
-    for mapa in mapas_escolhidos:
+    for mapa in mapas:
 
-        resultado_mapa = jogar_mapa(
-            time1, time2, mapa, modo, jogadores_time1, jogadores_time2
+        resultado_mapa = yield from eventos_mapa(
+            time1,
+            time2,
+            mapa,
+            modo,
+            jogadores_time1,
+            jogadores_time2,
+            saida,
+            contexto=contexto,
         )
         resultado_mapa.fase = fase
         resultado.mapas.append(resultado_mapa)
@@ -862,34 +1355,97 @@ def simular_partida_auto(time1: str, time2: str, fase, modo: ModoJogo = "auto"):
             1 for m in resultado.mapas if m.placar_time2 > m.placar_time1
         )
 
-        if not resultado.mapas:
-            raise RuntimeError("Nenhum mapa foi concluído.")
-
         # Verifica condição de vitória da partida
         if vitorias_time1 == 2 or vitorias_time2 == 2:
             break
 
+    if not resultado.mapas:
+        raise RuntimeError("Nenhum mapa foi concluído.")
+
     # Determina o vencedor final com base nas vitórias
     if vitorias_time1 > vitorias_time2:
         vencedor, perdedor = time1, time2
     else:
         vencedor, perdedor = time2, time1
+    resultado.vencedor, resultado.perdedor = vencedor, perdedor
 
-    # Adiciona estatísticas finais no ResultadoPartida
-    # resultado.fase = fase
-    resultado.estatisticas_jogadores = jogadores_time1 + jogadores_time2
-
+    # As estatísticas finais do ResultadoPartida são a soma das fotos de
+    # cada mapa (ResultadoPartida.estatisticas_jogadores)
+    yield FimPartida(vencedor, perdedor, resultado)
     return vencedor, perdedor, resultado
 
 
+# Mesma função, adaptada para um jogo apenas
+def simular_partida_auto(
+    time1: str,
+    time2: str,
+    fase,
+    modo: ModoJogo = "auto",
+    saida: Saida = SAIDA_NULA,
+    contexto: ContextoSimulacao = CONTEXTO_GLOBAL,
+    detalhar_rounds: bool = True,
+    memo: Optional[MemoMapas] = None,
+):
+    """
+    Simula 1 partida entre dois times, escolhendo mapas automaticamente,
+    e retorna o vencedor, perdedor e ResultadoPartida completo com estatísticas atualizadas.
+
+    Usada para partidas de terceiros em torneios, por isso a narração é
+    descartada por padrão (`saida`). Os rounds vêm de `eventos_partida` e,
+    se o contexto tiver um gravador (log_rounds.py), vão também para o log.
+
+    Com `detalhar_rounds=False`, os mapas não são jogados round a round: o
+    placar final de cada um é sorteado da distribuição do confronto em
+    `memo` (padrão: MEMO_MAPAS, ver memo_mapas.py). Os mapas saem sem
+    narração e sem estatísticas de jogadores; o resto do ResultadoPartida
+    (fase, vencedor, perdedor, rounds de overtime) vem igual. Sem rounds não
+    há o que gravar, então esse modo não aceita gravador no contexto.
+    """
+    if detalhar_rounds:
+        eventos = eventos_partida(
+            time1, time2, fase, modo, saida=saida, contexto=contexto
+        )
+        if contexto.gravador is not None:
+            eventos = contexto.gravador.gravar(eventos)
+        return _consumir(eventos, saida)
+
+    if contexto.gravador is not None:
+        raise ValueError("o gravador de rounds exige detalhar_rounds=True")
+    resultado = ResultadoPartida(
+        partida_id=contexto.proxima_partida(), mapas=[], modo_jogo=modo, fase=fase
+    )
+    mapas_escolhidos = vetar_automatico(
+        time1, time2, registro=contexto.obter_registro()
+    )
+    return _partida_sorteada(
+        time1,
+        time2,
+        fase,
+        mapas_escolhidos,
+        resultado,
+        memo if memo is not None else MEMO_MAPAS,
+        contexto,
+    )
+
+
 # Exemplo de uso:
 # resultados, vitorias, kills_media, deaths_media = simular_partidas_em_lote("FURIA", "MIBR", n=100)
 
 
-def simular_torneio_mata_mata(times, simular_partida_auto):
+def simular_torneio_mata_mata(
+    times,
+    simular_partida_auto,
+    saida: Saida = SAIDA_NULA,
+    contexto: ContextoSimulacao = CONTEXTO_GLOBAL,
+):
     """
     Simula um torneio de mata-mata completo.
     Retorna o ranking final, vitórias/derrotas e todas as partidas jogadas.
+
+    O sorteio da chave usa `contexto.rng`. A função de partida é chamada com
+    (time1, time2, fase); para que ela use o mesmo contexto, passe-a já
+    ligada a ele (ex.: functools.partial(simular_partida_auto,
+    contexto=contexto)).
     """
     vitorias = {time: 0 for time in times}
     derrotas = {time: 0 for time in times}
@@ -910,10 +1466,10 @@ def simular_torneio_mata_mata(times, simular_partida_auto):
         else:
             fase = f"Rodada {rodada}"
 
-        print(f"\n=== {fase} ===")
+        saida.escrever(f"\n=== {fase} ===")
 
         vencedores = []
-        random.shuffle(times)
+        contexto.rng.shuffle(times)
 
         for i in range(0, len(times), 2):
             time1 = times[i]
@@ -935,14 +1491,8 @@ def simular_torneio_mata_mata(times, simular_partida_auto):
     return ranking, vitorias, derrotas, partidas_jogadas
 
 
-def simular_torneios_em_lote(times, simular_partida, n=1):
-    """
-    Simula múltiplos torneios e coleta estatísticas de desempenho e partidas completas.
-    Retorna:
-      - estatísticas agregadas por time
-      - lista de todas as partidas jogadas (ResultadoPartida)
-    """
-    estatisticas = {
+def _estatisticas_torneio_vazias(times) -> Dict[str, Dict[str, Any]]:
+    return {
         time: {
             "campeao": 0,
             "vice": 0,
@@ -954,29 +1504,23 @@ def simular_torneios_em_lote(times, simular_partida, n=1):
         for time in times
     }
 
-    todas_as_partidas = []
 
-    for i in range(n):
-        print(f"\n🏆 Simulando Torneio {i+1}/{n}")
-        ranking, vitorias, derrotas, partidas_jogadas = simular_torneio_mata_mata(
-            times[:], simular_partida
-        )
-        todas_as_partidas.extend(partidas_jogadas)
+def _somar_torneio(estatisticas, ranking, vitorias, derrotas) -> None:
+    """Soma um torneio (ranking e vitórias/derrotas) às estatísticas do lote."""
+    for pos, time in enumerate(ranking, start=1):
+        estatisticas[time]["posicoes"].append(pos)
+        estatisticas[time]["vitorias_total"] += vitorias.get(time, 0)
+        estatisticas[time]["derrotas_total"] += derrotas.get(time, 0)
 
-        # Atualiza estatísticas dos times
-        for pos, time in enumerate(ranking, start=1):
-            estatisticas[time]["posicoes"].append(pos)
-            estatisticas[time]["vitorias_total"] += vitorias.get(time, 0)
-            estatisticas[time]["derrotas_total"] += derrotas.get(time, 0)
+        if pos == 1:
+            estatisticas[time]["campeao"] += 1
+        elif pos == 2:
+            estatisticas[time]["vice"] += 1
+        elif pos in (3, 4):
+            estatisticas[time]["top4"] += 1
 
-            if pos == 1:
-                estatisticas[time]["campeao"] += 1
-            elif pos == 2:
-                estatisticas[time]["vice"] += 1
-            elif pos in (3, 4):
-                estatisticas[time]["top4"] += 1
 
-    # Calcula médias
+def _calcular_medias_torneio(estatisticas, n: int) -> None:
     for time in estatisticas:
         posicoes = estatisticas[time]["posicoes"]
         estatisticas[time]["posicao_media"] = sum(posicoes) / len(posicoes)
@@ -984,6 +1528,78 @@ def simular_torneios_em_lote(times, simular_partida, n=1):
         estatisticas[time]["vitorias"] = estatisticas[time]["vitorias_total"]
         estatisticas[time]["derrotas"] = estatisticas[time]["derrotas_total"]
 
+
+def simular_torneios_em_lote(
+    times,
+    simular_partida,
+    n=1,
+    saida: Saida = SAIDA_NULA,
+    matriz=None,
+    rng=None,
+    workers: Optional[int] = None,
+    semente: Optional[int] = None,
+    contexto: ContextoSimulacao = CONTEXTO_GLOBAL,
+):
+    """
+    Simula múltiplos torneios e coleta estatísticas de desempenho e partidas completas.
+    Retorna:
+      - estatísticas agregadas por time
+      - lista de todas as partidas jogadas (ResultadoPartida)
+
+    Com `matriz` (MatrizConfronto ou array N x N de chances de vitória), o
+    lote roda no modo "só vencedores" de torneio_vetorizado.py: nenhuma
+    partida é jogada nem guardada ("partidas" volta vazia, e "posicoes"
+    não entra nas estatísticas), e o ranking é o da posição média.
+
+    Com `workers`, os torneios são divididos em fatias com semente própria
+    (derivada de `semente`) e jogados num pool de processos
+    (simulacao_paralela.py). O resultado tem a mesma estrutura e, para a
+    mesma semente, é o mesmo com qualquer número de processos;
+    `simular_partida` precisa ser uma função de módulo (picklável).
+    No caminho sequencial, o sorteio das chaves usa `contexto` (com
+    `semente`, uma cópia dele com `random.Random(semente)`); no vetorizado,
+    `semente` vale quando `rng` não é passado. Os caminhos vetorizado e
+    paralelo não jogam pelo contexto e recusam um gravador de rounds nele.
+    """
+    if contexto.gravador is not None and (matriz is not None or workers is not None):
+        raise ValueError("o gravador de rounds só funciona no caminho sequencial")
+    if matriz is not None:
+        if rng is None:
+            rng = semente
+        estatisticas = simular_chaves_vetorizado(times, matriz, n, rng)
+        saida.escrever(f"\n🏆 {n} torneios simulados (só vencedores)")
+        return {
+            "estatisticas": estatisticas,
+            "partidas": [],
+            "ranking": ranking_por_posicao_media(estatisticas),
+        }
+
+    if workers is not None:
+        from simulacao_paralela import simular_torneios_paralelo
+
+        estatisticas, todas_as_partidas, ranking = simular_torneios_paralelo(
+            times, simular_partida, n, workers=workers, semente=semente
+        )
+        saida.escrever(f"\n🏆 {n} torneios simulados em paralelo")
+    else:
+        if semente is not None:
+            contexto = contexto.com_semente(semente)
+        estatisticas = _estatisticas_torneio_vazias(times)
+        todas_as_partidas = []
+
+        for i in range(n):
+            saida.escrever(f"\n🏆 Simulando Torneio {i+1}/{n}")
+            ranking, vitorias, derrotas, partidas_jogadas = simular_torneio_mata_mata(
+                times[:], simular_partida, saida, contexto
+            )
+            todas_as_partidas.extend(partidas_jogadas)
+
+            # Atualiza estatísticas dos times
+            _somar_torneio(estatisticas, ranking, vitorias, derrotas)
+
+    # Calcula médias
+    _calcular_medias_torneio(estatisticas, n)
+
     return {
         "estatisticas": estatisticas,
         "partidas": todas_as_partidas,
@@ -10,6 +10,7 @@ from funcoes_simulacao_deepseek import (
     simular_partida_auto,
     ResultadoPartida,
 )
+from contexto_simulacao import ContextoSimulacao, CONTEXTO_GLOBAL
 from collections import defaultdict
 
 
@@ -257,18 +258,19 @@ def validar_num_grupos(times: List[str], num_grupos: int) -> int:
     return num_grupos
 
 
-def sortear_grupos(times: List[str], num_grupos: int) -> List[List[str]]:
+def sortear_grupos(times: List[str], num_grupos: int, rng=random) -> List[List[str]]:
     """Sorteia os times em grupos aleatórios.
 
     Args:
         times: Lista de times participantes
         num_grupos: Número de grupos desejado
+        rng: Gerador do sorteio (o `random` global por padrão)
 
     Returns:
         Lista de grupos com distribuição aleatória
     """
     times = times.copy()
-    random.shuffle(times)
+    rng.shuffle(times)
     return [times[i::num_grupos] for i in range(num_grupos)]
 
 
@@ -292,6 +294,7 @@ def realizar_jogo_dbelim(
     resultados: List[dict],
     modo_escolhido: int,
     jogo_do_usuario: bool = True,
+    contexto: ContextoSimulacao = CONTEXTO_GLOBAL,
 ) -> ResultadoPartida:
     """
     Realiza um jogo entre dois times e retorna o resultado da partida.
@@ -309,18 +312,28 @@ def realizar_jogo_dbelim(
     print(f"\nJogo entre: {time1} e {time2}!\n")
 
     if not jogo_do_usuario:
-        vencedor, perdedor, resultado = simular_partida_auto(time1, time2, rodada)
+        vencedor, perdedor, resultado = simular_partida_auto(
+            time1, time2, rodada, contexto=contexto
+        )
         resultado.vencedor = vencedor
         resultado.perdedor = perdedor
         return resultado
 
     if modo_escolhido == 1:
         resultado = jogar_partida(
-            modo="auto", time1=time1, time2=time2, fase_torneio=rodada
+            modo="auto",
+            time1=time1,
+            time2=time2,
+            fase_torneio=rodada,
+            contexto=contexto,
         )
     else:
         resultado = jogar_partida(
-            modo="manual", time1=time1, time2=time2, fase_torneio=rodada
+            modo="manual",
+            time1=time1,
+            time2=time2,
+            fase_torneio=rodada,
+            contexto=contexto,
         )
 
     if resultado is None:
@@ -328,7 +341,9 @@ def realizar_jogo_dbelim(
         # de mapas) — cai para auto-simulação em vez de propagar um
         # resultado quebrado (None) pro chaveamento.
         print("⚠️ Não foi possível concluir a partida, simulando automaticamente...")
-        vencedor, perdedor, resultado = simular_partida_auto(time1, time2, rodada)
+        vencedor, perdedor, resultado = simular_partida_auto(
+            time1, time2, rodada, contexto=contexto
+        )
         resultado.vencedor = vencedor
         resultado.perdedor = perdedor
 
@@ -341,6 +356,7 @@ def fase_grupos(
     num_classificados: int,
     ida_e_volta: bool,
     time_usuario: str = None,
+    contexto: ContextoSimulacao = CONTEXTO_GLOBAL,
 ) -> tuple:
     """Executa a fase de grupos do torneio.
 
@@ -358,11 +374,12 @@ def fase_grupos(
         ida_e_volta: Se True, jogos de ida e volta
         time_usuario: Nome do time controlado pelo jogador. Se None, todas
             as partidas são tratadas como de terceiros (100% automáticas).
+        contexto: Sorteios, elencos e ids de partida (contexto_simulacao.py)
 
     Returns:
         Tuple: (Lista de classificados, Lista de resultados)
     """
-    grupos = sortear_grupos(times, num_grupos)
+    grupos = sortear_grupos(times, num_grupos, rng=contexto.rng)
     exibir_grupos(grupos)
 
     classificados = []
@@ -392,14 +409,18 @@ def fase_grupos(
                         modo = "auto" if escolha == 1 else "manual"
 
                         resultado = jogar_partida(
-                            modo=modo, time1=time1, time2=time2, fase_torneio="Grupos"
+                            modo=modo,
+                            time1=time1,
+                            time2=time2,
+                            fase_torneio="Grupos",
+                            contexto=contexto,
                         )
                         if resultado is None:
                             print(
                                 "⚠️ Não foi possível concluir a partida manualmente, simulando automaticamente..."
                             )
                             vencedor_p, perdedor_p, resultado = simular_partida_auto(
-                                time1, time2, "Grupos"
+                                time1, time2, "Grupos", contexto=contexto
                             )
                             resultado.vencedor = vencedor_p
                             resultado.perdedor = perdedor_p
@@ -408,7 +429,7 @@ def fase_grupos(
                             f"\n🤖 {time1} vs {time2} — partida de terceiros, simulando automaticamente..."
                         )
                         vencedor_p, perdedor_p, resultado = simular_partida_auto(
-                            time1, time2, "Grupos"
+                            time1, time2, "Grupos", contexto=contexto
                         )
                         resultado.vencedor = vencedor_p
                         resultado.perdedor = perdedor_p
@@ -424,7 +445,10 @@ def fase_grupos(
 
 
 def fase_double_elimination(
-    times: List[str], resultados: List[dict], time_usuario: str = None
+    times: List[str],
+    resultados: List[dict],
+    time_usuario: str = None,
+    contexto: ContextoSimulacao = CONTEXTO_GLOBAL,
 ) -> tuple:
     """Executa uma chave de eliminação dupla.
 
@@ -456,7 +480,7 @@ def fase_double_elimination(
     perdedores = []
     rodada = 1
     times = times.copy()
-    random.shuffle(times)
+    contexto.rng.shuffle(times)
 
     # Fase inicial (todos os times começam na chave de vencedores)
     while len(times) > 1:
@@ -486,6 +510,7 @@ def fase_double_elimination(
                 resultados,
                 modo_escolhido,
                 jogo_do_usuario,
+                contexto,
             )
             resultados.append(resultado)
             novos_vencedores.append(resultado.vencedor)
@@ -517,6 +542,7 @@ def fase_double_elimination(
                     resultados,
                     modo_escolhido,
                     jogo_do_usuario,
+                    contexto,
                 )
                 resultados.append(resultado)
                 novos_perdedores_chave.append(resultado.vencedor)
@@ -528,8 +554,8 @@ def fase_double_elimination(
         perdedores.extend(novos_perdedores)
         times = vencedores
         rodada += 1
-        random.shuffle(vencedores)
-        random.shuffle(perdedores)
+        contexto.rng.shuffle(vencedores)
+        contexto.rng.shuffle(perdedores)
 
     # A chave de vencedores já decidiu seu campeão (times/vencedores tem 1 time).
     # Agora reduzimos a chave de perdedores a um único finalista, jogando
@@ -558,6 +584,7 @@ def fase_double_elimination(
                 resultados,
                 modo_escolhido,
                 jogo_do_usuario,
+                contexto,
             )
             resultados.append(resultado)
             proximos_perdedores.append(resultado.vencedor)
@@ -581,6 +608,7 @@ def fase_double_elimination(
         resultados,
         modo_escolhido,
         jogo_do_usuario,
+        contexto,
     )
     resultados.append(resultado)
 
@@ -588,7 +616,10 @@ def fase_double_elimination(
 
 
 def fase_mata_mata(
-    times: List[str], resultados: List[Dict], time_usuario: str = None
+    times: List[str],
+    resultados: List[Dict],
+    time_usuario: str = None,
+    contexto: ContextoSimulacao = CONTEXTO_GLOBAL,
 ) -> tuple:
     """Executa a fase eliminatória do torneio.
 
@@ -603,6 +634,7 @@ def fase_mata_mata(
         resultados: Lista para armazenar resultados
         time_usuario: Nome do time controlado pelo jogador. Se None, todas
             as partidas são tratadas como de terceiros (100% automáticas).
+        contexto: Sorteios, elencos e ids de partida (contexto_simulacao.py)
 
     Returns:
         Tuple: (Lista com campeão, Resultados atualizados)
@@ -621,7 +653,7 @@ def fase_mata_mata(
 
         novos_times = []
         times = times.copy()
-        random.shuffle(times)
+        contexto.rng.shuffle(times)
         for i in range(0, len(times), 2):
             time1, time2 = times[i], times[i + 1]
             print(f"\nJogo entre: {time1} e {time2}!\n")
@@ -639,7 +671,11 @@ def fase_mata_mata(
 
                 modo = "auto" if escolha == 1 else "manual"
                 resultado = jogar_partida(
-                    modo=modo, time1=time1, time2=time2, fase_torneio=fase_atual
+                    modo=modo,
+                    time1=time1,
+                    time2=time2,
+                    fase_torneio=fase_atual,
+                    contexto=contexto,
                 )
 
                 if resultado is None:
@@ -647,7 +683,9 @@ def fase_mata_mata(
                         "⚠️ Não foi possível concluir a partida manualmente, simulando automaticamente..."
                     )
                     vencedor_partida, perdedor_partida, resultado = (
-                        simular_partida_auto(time1, time2, fase_atual)
+                        simular_partida_auto(
+                            time1, time2, fase_atual, contexto=contexto
+                        )
                     )
                     resultado.vencedor = vencedor_partida
                     resultado.perdedor = perdedor_partida
@@ -657,7 +695,7 @@ def fase_mata_mata(
                     "🤖 Partida entre times de terceiros — simulando automaticamente..."
                 )
                 vencedor_partida, perdedor_partida, resultado = simular_partida_auto(
-                    time1, time2, fase_atual
+                    time1, time2, fase_atual, contexto=contexto
                 )
                 resultado.vencedor = vencedor_partida
                 resultado.perdedor = perdedor_partida
@@ -772,19 +810,17 @@ def salvar_estatisticas_torneio(resultados_partidas, ranking_times, nome_torneio
 
         for mapa in mapas:
             # Verifica se há estatísticas salvas no ResultadoMapa
-            if not hasattr(mapa, "estatisticas_jogadores"):
+            if not getattr(mapa, "estatisticas_jogadores", None):
                 print(f"Aviso: mapa {mapa.mapa} não possui estatísticas de jogadores.")
                 continue
 
+            # Uma foto imutável (EstatisticaJogador) por jogador do mapa
             for jogador in mapa.estatisticas_jogadores:
-                stats_mapa = jogador["estatisticas"]["mapas"].get(
-                    mapa.mapa, {"kills": 0, "deaths": 0, "rounds": 0}
-                )
-                kills = stats_mapa.get("kills", 0)
-                deaths = stats_mapa.get("deaths", 0)
-                rounds = stats_mapa.get("rounds", 0)
+                kills = jogador.kills
+                deaths = jogador.deaths
+                rounds = jogador.rounds
 
-                time_jogador = jogador["time"]
+                time_jogador = jogador.time
                 time_oponente = (
                     mapa.time_tr if time_jogador == mapa.time_ct else mapa.time_ct
                 )
@@ -798,16 +834,16 @@ def salvar_estatisticas_torneio(resultados_partidas, ranking_times, nome_torneio
                         "TimeTR": mapa.time_tr,
                         "Oponente": time_oponente,
                         "PlacarFinal": f"{mapa.placar_time1}-{mapa.placar_time2}",
-                        "Jogador": jogador["nome"],
-                        "Time": jogador["time"],
+                        "Jogador": jogador.nome,
+                        "Time": jogador.time,
                         "Kills": kills,
                         "Deaths": deaths,
                         "K/D": round(kills / max(1, deaths), 2),
                         "Rounds": rounds,
                         "KPR": round(kills / max(1, rounds), 2),
                         "DPR": round(deaths / max(1, rounds), 2),
-                        "Vitorias": vitorias_times.get(jogador["time"], 0),
-                        "Derrotas": derrotas_times.get(jogador["time"], 0),
+                        "Vitorias": vitorias_times.get(jogador.time, 0),
+                        "Derrotas": derrotas_times.get(jogador.time, 0),
                     }
                 )
 
@@ -2,8 +2,12 @@ import json
 
 import pandas as pd
 import random
-from typing import List, Dict, Any, Tuple
+from functools import lru_cache
+from typing import List, Dict, Any, Optional, Tuple
 from config import JOGADORES_CSV
+from estatisticas_jogadores import VisaoEstatisticas
+from registro_times import montar_jogador
+from sorteio_ponderado import TabelaAlias
 
 # ==============================================================================
 # 1. CARREGAMENTO E PREPARAÇÃO DOS DADOS (MODIFICADO)
@@ -61,39 +65,142 @@ def obter_jogadores(nome_time: str, df: pd.DataFrame) -> List[Dict[str, Any]]:
     cópias divergentes em funcoes_simulacao_deepseek.py e neste arquivo, e a
     versão usada em partidas manuais/torneio não incluía a chave "time",
     causando KeyError em salvar_estatisticas_torneio). Todo o resto do
-    código deve importar esta função em vez de redefini-la.
+    código deve importar esta função em vez de redefini-la. O formato do
+    dicionário vem de `registro_times.montar_jogador`, o mesmo usado pelo
+    registro em memória.
     """
     time_df = df[df["time"] == nome_time.lower()]
     if len(time_df) == 0:
         raise ValueError(f"Time '{nome_time.lower()}' não encontrado no CSV.")
 
-    jogadores = []
-    for _, row in time_df.iterrows():
-        # Normaliza o 'over'. Um jogador com over 80 terá 1.0.
-        over_normalizado = float(row["over"]) / 80.0
-
-        jogadores.append(
-            {
-                "nome": row["nick"],
-                "time": nome_time.lower(),
-                "over": over_normalizado,
-                "role": row["funcao"],
-                "kills": 0,
-                "deaths": 0,
-                # Estrutura já inicializada para evitar KeyError em registrar_kill/
-                # registrar_death, que esperam "estatisticas"->"total" preenchido.
-                "estatisticas": {
-                    "mapas": {},
-                    "total": {"kills": 0, "deaths": 0, "rounds": 0},
-                },
-            }
-        )
-    return jogadores
+    return [
+        montar_jogador(row["nick"], nome_time.lower(), row["over"], row["funcao"])
+        for _, row in time_df.iterrows()
+    ]
+
+
+class Escalacao:
+    """Elenco de um time num mapa, com os pesos de combate já calculados.
+
+    Os pesos de kill e death (e as tabelas de alias para sorteá-los) só
+    dependem dos jogadores, de CONFIG_COMBATE e de ROLE_WEIGHTS, nunca do
+    round. Eles são calculados quando o time entra no mapa e reaproveitados
+    em todos os rounds; se CONFIG_COMBATE ou ROLE_WEIGHTS mudarem em tempo
+    de execução, a próxima consulta recalcula tudo.
+
+    `jogadores` é a própria lista de dicionários do time (não uma cópia):
+    as kills e deaths continuam sendo registradas nela. Quando as
+    estatísticas dos jogadores vêm de um `EstatisticasElenco`, a célula de
+    cada jogador no mapa é calculada uma vez e cada registro vira dois
+    incrementos em array (ver estatisticas_jogadores.py).
+    """
+
+    def __init__(self, jogadores: List[Dict[str, Any]]):
+        if not isinstance(jogadores, list):
+            raise TypeError(
+                f"Esperava lista de jogadores, mas recebeu: {type(jogadores)} {jogadores}"
+            )
+        self.jogadores = jogadores
+        self._assinatura = None
+        self._celulas: Dict[str, List[Optional[Tuple]]] = {}
+        self._atualizar()
+
+    def _atualizar(self) -> None:
+        assinatura = _assinatura_combate()
+        if assinatura == self._assinatura:
+            return
+        self.pesos_kill = _pesos_combate(self.jogadores, "kill")
+        self.pesos_death = _pesos_combate(self.jogadores, "death")
+        self.tabela_kill = tabela_alias(self.pesos_kill)
+        self.tabela_death = tabela_alias(self.pesos_death)
+        self.soma_kill = self.tabela_kill.total
+        self.soma_death = self.tabela_death.total
+        self._assinatura = assinatura
+
+    def tabelas(self) -> Tuple[TabelaAlias, TabelaAlias]:
+        """(tabela de kill, tabela de death), em dia com a configuração."""
+        self._atualizar()
+        return self.tabela_kill, self.tabela_death
+
+    def _celulas_do_mapa(self, mapa: str) -> List[Optional[Tuple]]:
+        celulas = self._celulas.get(mapa)
+        if celulas is None:
+            celulas = self._celulas[mapa] = [_celula(j, mapa) for j in self.jogadores]
+        return celulas
+
+    def registrar_kill(self, indice: int, mapa: str) -> None:
+        celula = self._celulas_do_mapa(mapa)[indice]
+        if celula is None:
+            registrar_kill(self.jogadores[indice], mapa)
+            return
+        elenco, posicao, jogador_id = celula
+        elenco.kills[posicao] += 1
+        elenco.kills_total[jogador_id] += 1
+
+    def registrar_death(self, indice: int, mapa: str) -> None:
+        celula = self._celulas_do_mapa(mapa)[indice]
+        if celula is None:
+            registrar_death(self.jogadores[indice], mapa)
+            return
+        elenco, posicao, jogador_id = celula
+        elenco.deaths[posicao] += 1
+        elenco.deaths_total[jogador_id] += 1
+
+    def registrar_rounds(self, mapa: str, rounds: int) -> None:
+        """Soma os rounds do mapa a todos os jogadores da escalação."""
+        for jogador, celula in zip(self.jogadores, self._celulas_do_mapa(mapa)):
+            if celula is None:
+                estatisticas = jogador["estatisticas"]
+                estatisticas["mapas"][mapa]["rounds"] += rounds
+                estatisticas["total"]["rounds"] += rounds
+                continue
+            elenco, posicao, jogador_id = celula
+            elenco.rounds[posicao] += rounds
+            elenco.rounds_total[jogador_id] += rounds
+
+
+def _celula(jogador: Dict[str, Any], mapa: str) -> Optional[Tuple]:
+    """(elenco, célula do mapa, id) do jogador, ou None se as estatísticas
+    dele forem um dict comum."""
+    estatisticas = jogador["estatisticas"]
+    if not isinstance(estatisticas, VisaoEstatisticas):
+        return None
+    elenco, jogador_id = estatisticas.elenco, estatisticas.jogador_id
+    return elenco, elenco.celula(jogador_id, mapa), jogador_id
+
+
+def _assinatura_combate() -> tuple:
+    """Tudo de que os pesos dependem, fora os jogadores."""
+    return (
+        CONFIG_COMBATE["EXPOENTE_OVER"],
+        CONFIG_COMBATE["MULTIPLICADOR_OVER"],
+        CONFIG_COMBATE["BASE_PESO"],
+        tuple(ROLE_WEIGHTS["kill"].items()),
+        tuple(ROLE_WEIGHTS["death"].items()),
+    )
 
 
 def simular_kills_do_round(
-    time_vencedor: str, jogadores_ct: List[Dict], jogadores_tr: List[Dict], mapa
+    time_vencedor: str,
+    jogadores_ct,
+    jogadores_tr,
+    mapa,
+    rng=random,
 ):
+    """Sorteia as kills do round e registra kills/deaths nos jogadores.
+
+    `jogadores_ct` e `jogadores_tr` podem ser `Escalacao` (o normal:
+    `jogar_mapa` monta uma por time) ou listas de jogadores, que aí são
+    convertidas a cada round. `rng` é o gerador usado nos sorteios (o
+    `random` global por padrão; ver contexto_simulacao.py).
+
+    Returns:
+        Lista de (matador, morto), pelo nome, na ordem em que saíram.
+    """
+    if not isinstance(jogadores_ct, Escalacao):
+        jogadores_ct = Escalacao(jogadores_ct)
+    if not isinstance(jogadores_tr, Escalacao):
+        jogadores_tr = Escalacao(jogadores_tr)
 
     vencedores, perdedores = (
         (jogadores_ct, jogadores_tr)
@@ -102,97 +209,93 @@ def simular_kills_do_round(
     )
 
     kills_vencedor = (
-        random.choice([4, 5])
-        if random.random() < CONFIG_COMBATE["CHANCE_4_A_5_KILLS"]
-        else random.randint(1, 3)
+        rng.choice([4, 5])
+        if rng.random() < CONFIG_COMBATE["CHANCE_4_A_5_KILLS"]
+        else rng.randint(1, 3)
     )
 
     max_kills_perdedor = min(kills_vencedor - 1, 5) if kills_vencedor > 0 else 0
 
     kills_perdedor = (
-        random.randint(0, max_kills_perdedor)
-        if random.random() < CONFIG_COMBATE["CHANCE_PERDEDOR_MATA"]
-        else random.randint(kills_vencedor, 5)
+        rng.randint(0, max_kills_perdedor)
+        if rng.random() < CONFIG_COMBATE["CHANCE_PERDEDOR_MATA"]
+        else rng.randint(kills_vencedor, 5)
     )
 
-    if not isinstance(vencedores, list):
-        raise TypeError(
-            f"Esperava lista de jogadores, mas recebeu: {type(vencedores)} {vencedores}"
-        )
-
-    pesos_kill_vencedores = [
-        (p["over"] ** CONFIG_COMBATE["EXPOENTE_OVER"])
-        * ROLE_WEIGHTS["kill"].get(p["role"], 1.0)
-        * CONFIG_COMBATE["MULTIPLICADOR_OVER"]
-        + CONFIG_COMBATE["BASE_PESO"]
-        for p in vencedores
-    ]
-    pesos_death_perdedores = [
-        (p["over"] ** CONFIG_COMBATE["EXPOENTE_OVER"])
-        * ROLE_WEIGHTS["death"].get(p["role"], 1.0)
-        * CONFIG_COMBATE["MULTIPLICADOR_OVER"]
-        + CONFIG_COMBATE["BASE_PESO"]
-        for p in perdedores
-    ]
+    # Tabelas de alias dos pesos de kill e death de cada elenco, já
+    # montadas na Escalacao: cada kill é um sorteio O(1).
+    kill_vencedores, death_vencedores = vencedores.tabelas()
+    kill_perdedores, death_perdedores = perdedores.tabelas()
 
-    pesos_kill_perdedores = [
-        (p["over"] ** CONFIG_COMBATE["EXPOENTE_OVER"])
-        * ROLE_WEIGHTS["kill"].get(p["role"], 1.0)
-        * CONFIG_COMBATE["MULTIPLICADOR_OVER"]
-        + CONFIG_COMBATE["BASE_PESO"]
-        for p in perdedores
-    ]
-    pesos_death_vencedores = [
-        (p["over"] ** CONFIG_COMBATE["EXPOENTE_OVER"])
-        * ROLE_WEIGHTS["death"].get(p["role"], 1.0)
-        * CONFIG_COMBATE["MULTIPLICADOR_OVER"]
-        + CONFIG_COMBATE["BASE_PESO"]
-        for p in vencedores
-    ]
+    abates: List[Tuple[str, str]] = []
 
     # Vencedor mata perdedor
-    if kills_vencedor > 0 and sum(pesos_death_perdedores) > 0:
-        mortos = sorteio_sem_repeticao_com_pesos(
-            perdedores,
-            weights=pesos_death_perdedores,
-            k=min(kills_vencedor, len(perdedores)),
-        )
-        for morto in mortos:
-            registrar_death(morto, mapa)
-            killer = random.choices(vencedores, weights=pesos_kill_vencedores, k=1)[0]
-            registrar_kill(killer, mapa)
+    if kills_vencedor > 0 and death_perdedores.total > 0:
+        for morto in death_perdedores.sortear_sem_reposicao(kills_vencedor, rng):
+            perdedores.registrar_death(morto, mapa)
+            matador = kill_vencedores.sortear(rng)
+            vencedores.registrar_kill(matador, mapa)
+            abates.append(
+                (
+                    vencedores.jogadores[matador]["nome"],
+                    perdedores.jogadores[morto]["nome"],
+                )
+            )
 
     # Perdedor mata vencedor
-    if kills_perdedor > 0 and sum(pesos_death_vencedores) > 0:
-        mortos = sorteio_sem_repeticao_com_pesos(
-            vencedores,
-            weights=pesos_death_vencedores,
-            k=min(kills_perdedor, len(vencedores)),
-        )
-        for morto in mortos:
-            registrar_death(morto, mapa)
-            killer = random.choices(perdedores, weights=pesos_kill_perdedores, k=1)[0]
-            registrar_kill(killer, mapa)
-
-
-def sorteio_sem_repeticao_com_pesos(populacao, weights, k):
+    if kills_perdedor > 0 and death_vencedores.total > 0:
+        for morto in death_vencedores.sortear_sem_reposicao(kills_perdedor, rng):
+            vencedores.registrar_death(morto, mapa)
+            matador = kill_perdedores.sortear(rng)
+            perdedores.registrar_kill(matador, mapa)
+            abates.append(
+                (
+                    perdedores.jogadores[matador]["nome"],
+                    vencedores.jogadores[morto]["nome"],
+                )
+            )
+
+    return abates
+
+
+def _pesos_combate(
+    jogadores: List[Dict],
+    tipo: str,
+    config: Optional[Dict[str, float]] = None,
+    pesos_funcao: Optional[Dict[str, Dict[str, float]]] = None,
+) -> Tuple[float, ...]:
+    """Peso de cada jogador para matar (tipo "kill") ou morrer ("death").
+
+    `config` e `pesos_funcao` substituem CONFIG_COMBATE e ROLE_WEIGHTS sem
+    mexer nos globais (ver sensibilidade.py).
+    """
+    config = CONFIG_COMBATE if config is None else config
+    pesos_funcao = ROLE_WEIGHTS if pesos_funcao is None else pesos_funcao
+    return tuple(
+        (p["over"] ** config["EXPOENTE_OVER"])
+        * pesos_funcao[tipo].get(p["role"], 1.0)
+        * config["MULTIPLICADOR_OVER"]
+        + config["BASE_PESO"]
+        for p in jogadores
+    )
+
+
+@lru_cache(maxsize=1024)
+def tabela_alias(pesos: Tuple[float, ...]) -> TabelaAlias:
+    """Tabela de alias dos pesos; a chave são os próprios pesos, então uma
+    mudança em CONFIG_COMBATE ou no elenco nunca reaproveita tabela velha."""
+    return TabelaAlias(pesos)
+
+
+def sorteio_sem_repeticao_com_pesos(populacao, weights, k, rng=random):
+    """k itens distintos de `populacao`, sorteados em sequência pelos pesos.
+
+    Mantida pela interface; por baixo usa a mesma tabela de alias de
+    simular_kills_do_round (ver sorteio_ponderado.py).
+    """
     assert len(populacao) == len(weights)
-    populacao = populacao[:]
-    weights = weights[:]
-    selected = []
-    for _ in range(k):
-        if not populacao:
-            break
-        total = sum(weights)
-        r = random.uniform(0, total)
-        upto = 0
-        for i, w in enumerate(weights):
-            if upto + w >= r:
-                selected.append(populacao.pop(i))
-                weights.pop(i)
-                break
-            upto += w
-    return selected
+    indices = tabela_alias(tuple(weights)).sortear_sem_reposicao(k, rng)
+    return [populacao[i] for i in indices]
 
 
 def registrar_kill(jogador, mapa):
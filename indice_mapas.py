@@ -0,0 +1,258 @@
+"""Índice de desempenho por time e mapa, atualizado a cada mapa jogado.
+
+Para saber "como a Furia vai na Nuke?" era preciso simular de novo ou
+reler todos os estatisticas_torneio_*.csv com pandas. Aqui cada mapa que
+termina em `jogar_mapa` soma, para os dois times, vitória ou derrota e os
+rounds a favor e contra, em contadores por:
+
+- time e mapa;
+- lado inicial ("ct" para quem começou de CT, "tr" para o outro);
+- adversário;
+
+e as combinações entre eles (e também sem o mapa). Cada mapa atualiza
+alguns contadores num dicionário e cada consulta é uma busca só.
+
+O índice da sessão (`obter_indice`) fica só em memória. Gravar em disco é
+opcional: `persistir_indice` lê INDICE_MAPAS_JSON, passa a usá-lo como
+índice da sessão e o salva de volta no fim do processo (ou com `salvar`).
+O programa interativo (Menu_Helper.py) liga a persistência; testes e lotes
+descartáveis (de um milhão de partidas, ou as rodadas de parada
+adaptativa) não mexem no arquivo.
+
+Lotes em paralelo jogam cada fatia com um índice próprio e o juntam ao da
+sessão (ver simulacao_paralela.py). Os torneios do motor vetorizado não
+passam por `jogar_mapa` e não entram no índice.
+"""
+
+import atexit
+import json
+import logging
+import os
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Dict, Iterator, List, Optional, Tuple
+import pandas as pd
+from config import INDICE_MAPAS_JSON
+
+logger = logging.getLogger(__name__)
+
+# (time, mapa, lado inicial, adversário); "" é "qualquer um"
+Chave = Tuple[str, str, str, str]
+LADOS = ("ct", "tr")
+
+
+@dataclass(slots=True)
+class DesempenhoMapa:
+    """Resultado de uma consulta ao índice."""
+
+    vitorias: int = 0
+    derrotas: int = 0
+    rounds_pro: int = 0
+    rounds_contra: int = 0
+
+    @property
+    def jogos(self) -> int:
+        return self.vitorias + self.derrotas
+
+    @property
+    def taxa_vitoria(self) -> float:
+        return self.vitorias / self.jogos if self.jogos else 0.0
+
+    @property
+    def saldo_rounds(self) -> int:
+        return self.rounds_pro - self.rounds_contra
+
+
+class IndiceMapas:
+    """Contadores [vitórias, derrotas, rounds a favor, rounds contra] por chave."""
+
+    def __init__(self, arquivo: Optional[str] = None):
+        self.arquivo = os.path.abspath(arquivo) if arquivo else None
+        self.contagens: Dict[Chave, List[int]] = {}
+        self.alterado = False
+
+    # ---------- atualização ----------
+    def registrar(
+        self,
+        time_ct: str,
+        time_tr: str,
+        mapa: str,
+        placar_ct: int,
+        placar_tr: int,
+    ) -> None:
+        """Soma um mapa jogado; `time_ct` é quem começou de CT."""
+        time_ct, time_tr = time_ct.lower(), time_tr.lower()
+        self._somar(time_ct, mapa, "ct", time_tr, placar_ct, placar_tr)
+        self._somar(time_tr, mapa, "tr", time_ct, placar_tr, placar_ct)
+        self.alterado = True
+
+    def registrar_resultado(self, resultado) -> None:
+        """Soma um `ResultadoMapa` (time_ct é o time 1)."""
+        self.registrar(
+            resultado.time_ct,
+            resultado.time_tr,
+            resultado.mapa,
+            resultado.placar_time1,
+            resultado.placar_time2,
+        )
+
+    def _somar(
+        self, time: str, mapa: str, lado: str, adversario: str, pro: int, contra: int
+    ) -> None:
+        venceu = 1 if pro > contra else 0
+        for chave_mapa in (mapa, ""):
+            for chave_lado in (lado, ""):
+                for chave_adversario in (adversario, ""):
+                    chave = (time, chave_mapa, chave_lado, chave_adversario)
+                    contagem = self.contagens.get(chave)
+                    if contagem is None:
+                        contagem = self.contagens[chave] = [0, 0, 0, 0]
+                    contagem[0] += venceu
+                    contagem[1] += 1 - venceu
+                    contagem[2] += pro
+                    contagem[3] += contra
+
+    def juntar(self, outro: "IndiceMapas") -> None:
+        """Soma os contadores de outro índice (ex.: de uma fatia paralela)."""
+        for chave, valores in outro.contagens.items():
+            contagem = self.contagens.get(chave)
+            if contagem is None:
+                self.contagens[chave] = list(valores)
+            else:
+                for i, valor in enumerate(valores):
+                    contagem[i] += valor
+        self.alterado = self.alterado or bool(outro.contagens)
+
+    # ---------- consultas ----------
+    def consultar(
+        self,
+        time: str,
+        mapa: str = "",
+        lado: str = "",
+        adversario: str = "",
+    ) -> DesempenhoMapa:
+        """Desempenho do time; cada filtro vazio significa "todos"."""
+        if lado and lado not in LADOS:
+            raise ValueError(f"Lado deve ser um de {', '.join(LADOS)}")
+        contagem = self.contagens.get(
+            (time.lower(), mapa, lado, adversario.lower()), (0, 0, 0, 0)
+        )
+        return DesempenhoMapa(*contagem)
+
+    def mapas(self, time: str) -> List[str]:
+        time = time.lower()
+        return sorted(
+            mapa
+            for t, mapa, lado, adversario in self.contagens
+            if t == time and mapa and not lado and not adversario
+        )
+
+    def tabela(self, time: str) -> pd.DataFrame:
+        """Uma linha por mapa jogado pelo time, para relatórios."""
+        linhas = []
+        for mapa in self.mapas(time):
+            geral = self.consultar(time, mapa)
+            linhas.append(
+                {
+                    "Mapa": mapa,
+                    "Jogos": geral.jogos,
+                    "Vitórias": geral.vitorias,
+                    "Taxa": round(geral.taxa_vitoria, 3),
+                    "Saldo": geral.saldo_rounds,
+                    **{
+                        f"Taxa {lado.upper()}": round(
+                            self.consultar(time, mapa, lado).taxa_vitoria, 3
+                        )
+                        for lado in LADOS
+                    },
+                }
+            )
+        return pd.DataFrame(linhas)
+
+    # ---------- persistência ----------
+    @classmethod
+    def carregar(cls, arquivo: str) -> "IndiceMapas":
+        indice = cls(arquivo)
+        try:
+            with open(indice.arquivo, encoding="utf-8") as f:
+                dados = json.load(f)
+            indice.contagens = {
+                tuple(chave.split("|")): valores
+                for chave, valores in dados["contagens"].items()
+            }
+        except FileNotFoundError:
+            pass
+        except (json.JSONDecodeError, KeyError, OSError) as e:
+            logger.warning("Índice de mapas '%s' ignorado: %s", arquivo, e)
+        return indice
+
+    def salvar(self) -> None:
+        if not self.arquivo or not self.alterado:
+            return
+        dados = {
+            "contagens": {
+                "|".join(chave): valores for chave, valores in self.contagens.items()
+            }
+        }
+        # Escreve num temporário e troca, para nunca deixar um JSON pela metade.
+        temporario = self.arquivo + ".tmp"
+        with open(temporario, "w", encoding="utf-8") as f:
+            json.dump(dados, f, ensure_ascii=False)
+        os.replace(temporario, self.arquivo)
+        self.alterado = False
+
+
+_indice_sessao: Optional[IndiceMapas] = None
+
+
+_salvar_no_fim = False
+
+
+def obter_indice() -> IndiceMapas:
+    """Índice da sessão (em memória, a não ser que `persistir_indice` tenha
+    sido chamado)."""
+    global _indice_sessao
+    if _indice_sessao is None:
+        _indice_sessao = IndiceMapas()
+    return _indice_sessao
+
+
+def persistir_indice(arquivo: str = INDICE_MAPAS_JSON) -> IndiceMapas:
+    """Passa a guardar o índice da sessão em `arquivo`.
+
+    O índice é lido do arquivo, soma o que a sessão já tinha contado e é
+    salvo de volta no fim do processo.
+    """
+    global _indice_sessao, _salvar_no_fim
+    indice = IndiceMapas.carregar(arquivo)
+    if _indice_sessao is not None:
+        indice.juntar(_indice_sessao)
+    _indice_sessao = indice
+    if not _salvar_no_fim:
+        atexit.register(_salvar_sessao)
+        _salvar_no_fim = True
+    return indice
+
+
+def _salvar_sessao() -> None:
+    if _indice_sessao is not None:
+        try:
+            _indice_sessao.salvar()
+        except OSError as e:
+            logger.warning("Não foi possível salvar o índice de mapas: %s", e)
+
+
+@contextmanager
+def indice_isolado() -> Iterator[IndiceMapas]:
+    """Troca o índice da sessão por um vazio (sem arquivo) durante o bloco.
+
+    Usado pelas fatias paralelas: o que a fatia jogar fica no índice
+    devolvido, para ser juntado ao da sessão pelo processo pai.
+    """
+    global _indice_sessao
+    anterior = _indice_sessao
+    _indice_sessao = IndiceMapas()
+    try:
+        yield _indice_sessao
+    finally:
+        _indice_sessao = anterior
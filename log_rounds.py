@@ -0,0 +1,413 @@
+"""Log binário compacto dos rounds, e o replay das partidas a partir dele.
+
+Do que acontece round a round só sobravam os contadores de kills e deaths
+de cada jogador no fim do mapa; qualquer outra análise (qual estratégia
+ganha mais, quem mata quem, como evoluiu o placar) exigia simular tudo de
+novo.
+
+`GravadorRounds` consome os eventos de eventos_jogo.py e grava cada
+partida como um bloco binário:
+
+- cabeçalho da partida (`CAB_PARTIDA`): id da partida, número de nomes e
+  de mapas;
+- tabela de nomes (times, mapas, fase e jogadores), cada um com um byte de
+  tamanho e o texto em UTF-8. Todo o resto do bloco aponta para ela por
+  índice;
+- para cada mapa, um cabeçalho (`CAB_MAPA`), um par (jogador, time) por
+  jogador e um registro de tamanho fixo (`ROUND`, 26 bytes) por round: número,
+  quem venceu e de que lado, as estratégias de CT e TR e até 10 abates
+  (matador, morto).
+
+Um milhão de rounds ocupa uns 26 MB. `reproduzir` refaz os
+`ResultadoPartida` (com placares e fotos dos jogadores), `tabela_kd` as
+médias por jogador e `tabela_rounds` põe cada round numa linha de
+DataFrame, tudo sem jogar nada de novo.
+
+Para gravar as partidas de `simular_partida_auto` (e dos torneios que a
+usam), de `jogar_partida` e de `simular_partidas_em_lote_auto`, passe o
+gravador no contexto:
+
+    with GravadorRounds("rounds.bin") as gravador:
+        contexto = ContextoSimulacao(gravador=gravador)
+        ...
+    partidas = list(reproduzir("rounds.bin"))
+"""
+
+import struct
+from dataclasses import dataclass
+from typing import (
+    Any,
+    BinaryIO,
+    Dict,
+    Generator,
+    Iterable,
+    Iterator,
+    List,
+    Tuple,
+    Union,
+)
+import pandas as pd
+from eventos_jogo import Evento, FimMapa, FimPartida, FimRound, InicioMapa
+from estatisticas_jogadores import fotografar_mapa
+from funcoes_simulacao_deepseek import (
+    ROUNDS_TEMPO_NORMAL,
+    ResultadoMapa,
+    ResultadoPartida,
+    _tabela_kd,
+)
+
+MAGIA = b"CS2R"
+VERSAO = 1
+# magia, versão, id da partida, nº de nomes, nº de mapas
+CAB_PARTIDA = struct.Struct("<4sBIBB")
+# mapa, fase, time 1, time 2 (índices de nome), nº de jogadores, nº de rounds
+CAB_MAPA = struct.Struct("<BBBBBH")
+# número, bits (lado vencedor, time 2 venceu), estratégia CT, estratégia TR,
+# nº de abates e os pares (matador, morto)
+MAX_ABATES = 10
+ROUND = struct.Struct(f"<HBBBB{2 * MAX_ABATES}s")
+
+_TR = 1  # bit do lado vencedor
+_TIME2 = 2  # bit do time vencedor
+
+Destino = Union[str, BinaryIO]
+
+
+class GravadorRounds:
+    """Grava no log binário os rounds das partidas que passam por ele.
+
+    Args:
+        destino: Caminho (aberto em modo de acréscimo na primeira partida)
+            ou arquivo binário já aberto.
+    """
+
+    def __init__(self, destino: Destino):
+        self.destino = destino
+        self._arquivo = None
+        self.partidas = 0
+        self.rounds = 0
+        self._limpar()
+
+    def _limpar(self) -> None:
+        self._nomes: Dict[str, int] = {}
+        self._mapas: List[Tuple[InicioMapa, bytes, ResultadoMapa]] = []
+        self._inicio = None
+        self._rounds = bytearray()
+
+    def _id(self, nome: Any) -> int:
+        nome = "" if nome is None else str(nome)
+        indice = self._nomes.get(nome)
+        if indice is None:
+            if len(self._nomes) >= 255:
+                raise ValueError("Mais de 255 nomes numa partida")
+            if len(nome.encode("utf-8")) > 255:
+                raise ValueError(f"Nome longo demais para o log: {nome!r}")
+            indice = self._nomes[nome] = len(self._nomes)
+        return indice
+
+    # ---------- gravação ----------
+    def gravar(
+        self, eventos: Generator[Evento, None, Any]
+    ) -> Generator[Evento, None, Any]:
+        """Repassa os eventos do gerador, gravando cada partida que termina.
+
+        O valor de retorno do gerador é mantido. Mapas soltos (de
+        `eventos_mapa`, sem FimPartida) são gravados como uma partida de id 0
+        quando o gerador acaba; uma partida interrompida no meio não é
+        gravada.
+        """
+        self._limpar()
+        while True:
+            try:
+                evento = next(eventos)
+            except StopIteration as fim:
+                self.finalizar()
+                return fim.value
+            self.registrar(evento)
+            yield evento
+
+    def registrar(self, evento: Evento) -> None:
+        """Acrescenta um evento à partida em andamento."""
+        if isinstance(evento, InicioMapa):
+            for nome in (evento.mapa, evento.time1, evento.time2):
+                self._id(nome)
+            for nome, time in evento.jogadores:
+                self._id(nome)
+                self._id(time)
+            self._inicio = evento
+            self._rounds = bytearray()
+        elif isinstance(evento, FimRound):
+            if len(evento.abates) > MAX_ABATES:
+                raise ValueError(f"Mais de {MAX_ABATES} abates num round")
+            bits = _TR if evento.lado_vencedor == "tr" else 0
+            if evento.vencedor != self._inicio.time1:
+                bits |= _TIME2
+            self._rounds += ROUND.pack(
+                evento.numero,
+                bits,
+                evento.estrategia_ct,
+                evento.estrategia_tr,
+                len(evento.abates),
+                bytes(self._nomes[nome] for abate in evento.abates for nome in abate),
+            )
+        elif isinstance(evento, FimMapa):
+            self._mapas.append((self._inicio, bytes(self._rounds), evento.resultado))
+        elif isinstance(evento, FimPartida):
+            self._escrever(evento.resultado.partida_id)
+
+    def descartar(self) -> None:
+        """Joga fora a partida em andamento (ex.: uma série que deu erro)."""
+        self._limpar()
+
+    def finalizar(self) -> None:
+        """Grava os mapas que ficaram sem FimPartida (partida de id 0)."""
+        if self._mapas:
+            self._escrever(0)
+
+    def _escrever(self, partida_id: int) -> None:
+        # A fase só é conhecida no fim (eventos_partida a marca depois do
+        # FimMapa), então o id dela sai aqui
+        fases = [self._id(resultado.fase) for _, _, resultado in self._mapas]
+        bloco = bytearray(
+            CAB_PARTIDA.pack(
+                MAGIA, VERSAO, partida_id, len(self._nomes), len(self._mapas)
+            )
+        )
+        for nome in self._nomes:
+            texto = nome.encode("utf-8")
+            bloco.append(len(texto))
+            bloco += texto
+        for (inicio, rounds, _), fase in zip(self._mapas, fases):
+            bloco += CAB_MAPA.pack(
+                self._nomes[inicio.mapa],
+                fase,
+                self._nomes[inicio.time1],
+                self._nomes[inicio.time2],
+                len(inicio.jogadores),
+                len(rounds) // ROUND.size,
+            )
+            bloco += bytes(
+                self._nomes[nome] for jogador in inicio.jogadores for nome in jogador
+            )
+            bloco += rounds
+            self.rounds += len(rounds) // ROUND.size
+
+        if self._arquivo is None:
+            self._arquivo = (
+                open(self.destino, "ab")
+                if isinstance(self.destino, str)
+                else self.destino
+            )
+        self._arquivo.write(bloco)
+        self.partidas += 1
+        self._limpar()
+
+    def fechar(self) -> None:
+        """Fecha o arquivo (só se foi o gravador que o abriu)."""
+        if self._arquivo is not None and isinstance(self.destino, str):
+            self._arquivo.close()
+            self._arquivo = None
+
+    def __enter__(self) -> "GravadorRounds":
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.fechar()
+
+
+# ==================== LEITURA ====================
+@dataclass(slots=True)
+class MapaLog:
+    """Um mapa como está no log: nomes já resolvidos e os rounds crus."""
+
+    mapa: str
+    fase: str
+    time1: str
+    time2: str
+    jogadores: List[Tuple[str, str]]  # (nome, time), o time 1 primeiro
+    ids_jogadores: List[int]  # índice de cada jogador na tabela de nomes
+    rounds: memoryview  # registros ROUND
+
+    def iterar_rounds(self) -> Iterator[Tuple[int, int, int, int, int, bytes]]:
+        return ROUND.iter_unpack(self.rounds)
+
+
+def _ler(origem: Destino) -> bytes:
+    if isinstance(origem, str):
+        with open(origem, "rb") as f:
+            return f.read()
+    return origem.read()
+
+
+def ler_log(origem: Destino) -> Iterator[Tuple[int, List[MapaLog]]]:
+    """(id da partida, mapas) de cada bloco do log, na ordem gravada."""
+    visao = memoryview(_ler(origem))
+    pos = 0
+    try:
+        while pos < len(visao):
+            magia, versao, partida_id, n_nomes, n_mapas = CAB_PARTIDA.unpack_from(
+                visao, pos
+            )
+            if magia != MAGIA or versao != VERSAO:
+                raise ValueError(f"Bloco inválido na posição {pos}")
+            pos += CAB_PARTIDA.size
+            nomes = []
+            for _ in range(n_nomes):
+                tamanho = visao[pos]
+                nomes.append(bytes(visao[pos + 1 : pos + 1 + tamanho]).decode("utf-8"))
+                pos += 1 + tamanho
+            mapas = []
+            for _ in range(n_mapas):
+                mapa, fase, time1, time2, n_jogadores, n_rounds = CAB_MAPA.unpack_from(
+                    visao, pos
+                )
+                pos += CAB_MAPA.size
+                ids = visao[pos : pos + 2 * n_jogadores].tolist()
+                pos += 2 * n_jogadores
+                fim = pos + n_rounds * ROUND.size
+                if fim > len(visao):
+                    raise ValueError("Log de rounds truncado")
+                mapas.append(
+                    MapaLog(
+                        nomes[mapa],
+                        nomes[fase],
+                        nomes[time1],
+                        nomes[time2],
+                        [(nomes[a], nomes[b]) for a, b in zip(ids[::2], ids[1::2])],
+                        ids[::2],
+                        visao[pos:fim],
+                    )
+                )
+                pos = fim
+            yield partida_id, mapas
+    except (struct.error, IndexError, UnicodeDecodeError) as e:
+        raise ValueError(f"Log de rounds truncado ou corrompido: {e}") from e
+
+
+def reproduzir_mapa(mapa_log: MapaLog) -> ResultadoMapa:
+    """ResultadoMapa com placar, rounds, fase e a foto dos jogadores (kills e
+    deaths contados dos abates)."""
+    posicao = {id_nome: i for i, id_nome in enumerate(mapa_log.ids_jogadores)}
+    kills = [0] * len(posicao)
+    deaths = [0] * len(posicao)
+    vitorias_time2 = 0
+    n_rounds = 0
+    for _, bits, _, _, n_abates, abates in mapa_log.iterar_rounds():
+        n_rounds += 1
+        if bits & _TIME2:
+            vitorias_time2 += 1
+        for i in range(0, 2 * n_abates, 2):
+            kills[posicao[abates[i]]] += 1
+            deaths[posicao[abates[i + 1]]] += 1
+
+    foto = fotografar_mapa(
+        (
+            {
+                "nome": nome,
+                "time": time,
+                "estatisticas": {
+                    "mapas": {
+                        mapa_log.mapa: {
+                            "kills": kills[i],
+                            "deaths": deaths[i],
+                            "rounds": n_rounds,
+                        }
+                    }
+                },
+            }
+            for i, (nome, time) in enumerate(mapa_log.jogadores)
+        ),
+        mapa_log.mapa,
+    )
+    return ResultadoMapa(
+        mapa=mapa_log.mapa,
+        time_ct=mapa_log.time1,
+        time_tr=mapa_log.time2,
+        placar_time1=n_rounds - vitorias_time2,
+        placar_time2=vitorias_time2,
+        rounds=n_rounds,
+        rounds_extra=max(0, n_rounds - ROUNDS_TEMPO_NORMAL),
+        fase=mapa_log.fase,
+        estatisticas_jogadores=foto,
+    )
+
+
+def reproduzir(origem: Destino) -> Iterator[ResultadoPartida]:
+    """As partidas do log, uma por vez, como `ResultadoPartida`.
+
+    `vencedor` e `perdedor` saem dos mapas vencidos e a fase, dos mapas. O
+    modo de jogo não é gravado: as partidas do log são de
+    `simular_partida_auto`, então voltam como "auto".
+    """
+    for partida_id, mapas_log in ler_log(origem):
+        mapas = [reproduzir_mapa(m) for m in mapas_log]
+        resultado = ResultadoPartida(
+            partida_id=partida_id,
+            mapas=mapas,
+            modo_jogo="auto",
+            fase=mapas[0].fase if mapas else "",
+        )
+        if mapas:
+            time1, time2 = mapas[0].time_ct, mapas[0].time_tr
+            vitorias_time1 = sum(m.vencedor == time1 for m in mapas)
+            if vitorias_time1 * 2 > len(mapas):
+                resultado.vencedor, resultado.perdedor = time1, time2
+            else:
+                resultado.vencedor, resultado.perdedor = time2, time1
+        yield resultado
+
+
+def tabela_kd(partidas: Iterable[ResultadoPartida]) -> pd.DataFrame:
+    """Médias de kills e deaths por partida e K/D de cada jogador, no
+    formato do resumo de `simular_partidas_em_lote_auto`."""
+    kills: Dict[str, int] = {}
+    deaths: Dict[str, int] = {}
+    times_jogador: Dict[str, str] = {}
+    n = 0
+    for partida in partidas:
+        n += 1
+        for jogador in partida.estatisticas_jogadores:
+            kills[jogador.nome] = kills.get(jogador.nome, 0) + jogador.kills
+            deaths[jogador.nome] = deaths.get(jogador.nome, 0) + jogador.deaths
+            times_jogador[jogador.nome] = jogador.time
+    return _tabela_kd(kills, deaths, times_jogador, n)
+
+
+def tabela_rounds(origem: Destino) -> pd.DataFrame:
+    """Um round por linha, para análises sem simular de novo."""
+    linhas = []
+    for partida_id, mapas_log in ler_log(origem):
+        for mapa_log in mapas_log:
+            for (
+                numero,
+                bits,
+                estrategia_ct,
+                estrategia_tr,
+                n_abates,
+                _,
+            ) in mapa_log.iterar_rounds():
+                linhas.append(
+                    (
+                        partida_id,
+                        mapa_log.mapa,
+                        numero,
+                        mapa_log.time2 if bits & _TIME2 else mapa_log.time1,
+                        "tr" if bits & _TR else "ct",
+                        estrategia_ct,
+                        estrategia_tr,
+                        n_abates,
+                    )
+                )
+    return pd.DataFrame(
+        linhas,
+        columns=[
+            "Partida",
+            "Mapa",
+            "Round",
+            "Vencedor",
+            "Lado",
+            "Estratégia CT",
+            "Estratégia TR",
+            "Abates",
+        ],
+    )
@@ -0,0 +1,207 @@
+"""Matriz de confrontos: chance de vitória MD3 de cada time contra cada time.
+
+As simulações de torneio (`simular_torneio_mata_mata`, `fase_grupos`,
+`fase_double_elimination`) repetem a partida inteira em
+`simular_partida_auto` mesmo quando só interessa quem venceu. Com a
+distribuição exata de distribuicao_exata.py, a chance de cada confronto pode
+ser calculada uma vez e o sorteio de uma partida vira uma consulta à tabela.
+
+A matriz é calculada em paralelo (os pares são distribuídos num pool de
+processos) e salva em MATRIZ_CONFRONTO_JSON. O cache tem duas chaves:
+
+- assinatura do modelo: pesos do round, regras de estratégia, mapas,
+  times.csv, CONFIG_COMBATE e a forma de escolher os mapas da série (veto
+  automático). Se qualquer um mudar, tudo é recalculado;
+- assinatura do elenco de cada time (as linhas dele em jogadores.csv). Se
+  só o elenco de um time mudou, só a linha e a coluna dele são recalculadas.
+
+A matriz não é simétrica: o time 1 começa de CT em todos os mapas (como em
+`jogar_mapa`), então P(a vence b) e 1 - P(b vence a) podem diferir um pouco.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Sequence, Tuple
+import modelo_round
+from config import MATRIZ_CONFRONTO_JSON, TIMES_CSV, JOGADORES_CSV
+from distribuicao_exata import distribuicao_exata_md3
+from estrategias_deepseek import estrategias_por_mapa, matrizes_resultado_por_mapa
+from gerador_kills_deaths import CONFIG_COMBATE
+from registro_times import obter_registro
+from veto_automatico import vetar_automatico
+
+logger = logging.getLogger(__name__)
+
+# Abaixo disso o custo de subir os processos não compensa.
+_MIN_PARES_PARALELO = 64
+
+
+def _hash(dados) -> str:
+    texto = json.dumps(dados, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(texto.encode("utf-8")).hexdigest()
+
+
+def assinatura_modelo(arquivo_times: str = TIMES_CSV) -> str:
+    """Tudo que, se mudar, invalida a matriz inteira."""
+    parametros = {
+        nome: getattr(modelo_round, nome)
+        for nome in dir(modelo_round)
+        if nome.isupper() and not nome.startswith("_")
+    }
+    with open(arquivo_times, "rb") as f:
+        conteudo_times = hashlib.sha256(f.read()).hexdigest()
+    return _hash(
+        {
+            "modelo_round": parametros,
+            "estrategias": estrategias_por_mapa,
+            "regras": matrizes_resultado_por_mapa,
+            "times_csv": conteudo_times,
+            "config_combate": CONFIG_COMBATE,
+            "mapas_da_serie": "veto_automatico",
+        }
+    )
+
+
+class MatrizConfronto:
+    """Chances MD3 entre os times, com o time 1 começando de CT."""
+
+    def __init__(
+        self, times: Sequence[str], probabilidades: Dict[Tuple[str, str], float]
+    ):
+        self.times = list(times)
+        self.probabilidades = probabilidades
+
+    def prob_vitoria(self, time1: str, time2: str) -> float:
+        try:
+            return self.probabilidades[(time1.lower(), time2.lower())]
+        except KeyError:
+            raise ValueError(f"Confronto {time1} x {time2} não está na matriz")
+
+    def sortear_vencedor(self, time1: str, time2: str, rng=random) -> str:
+        """Sorteia o vencedor da série com um único número aleatório."""
+        return time1 if rng.random() < self.prob_vitoria(time1, time2) else time2
+
+    def como_array(self):
+        """Matriz NumPy (N, N) na ordem de `times`; a diagonal é 0.5."""
+        import numpy as np
+
+        indice = {t: i for i, t in enumerate(self.times)}
+        matriz = np.full((len(self.times), len(self.times)), 0.5)
+        for (t1, t2), p in self.probabilidades.items():
+            if t1 in indice and t2 in indice:
+                matriz[indice[t1], indice[t2]] = p
+        return matriz
+
+
+def _calcular_par(par: Tuple[str, str, float, float]) -> Tuple[str, str, float]:
+    """Unidade de trabalho dos processos: só recebe números, não lê CSV."""
+    time1, time2, over1, over2 = par
+    # Os mesmos três mapas de `simular_partida_auto` (veto automático)
+    mapas = vetar_automatico(time1, time2, over1, over2)
+    serie = distribuicao_exata_md3(
+        time1, time2, mapas, over_time1=over1, over_time2=over2
+    )
+    return time1, time2, serie.prob_vitoria_time1
+
+
+def calcular_pares(
+    pendentes: Sequence[Tuple[str, str, float, float]],
+    processos: Optional[int] = None,
+) -> List[Tuple[str, str, float]]:
+    """Calcula os pares (time1, time2, over1, over2), em paralelo se compensar."""
+    if processos == 1 or len(pendentes) < _MIN_PARES_PARALELO:
+        return [_calcular_par(par) for par in pendentes]
+    with ProcessPoolExecutor(max_workers=processos) as executor:
+        return list(executor.map(_calcular_par, pendentes, chunksize=16))
+
+
+def _carregar_cache(arquivo: str) -> dict:
+    try:
+        with open(arquivo, encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+    except (json.JSONDecodeError, OSError) as e:
+        logger.warning("Cache de confrontos '%s' ignorado: %s", arquivo, e)
+        return {}
+
+
+def _salvar_cache(arquivo: str, dados: dict) -> None:
+    # Escreve num temporário e troca, para nunca deixar um JSON pela metade.
+    temporario = arquivo + ".tmp"
+    with open(temporario, "w", encoding="utf-8") as f:
+        json.dump(dados, f, ensure_ascii=False)
+    os.replace(temporario, arquivo)
+
+
+def construir_matriz_confronto(
+    times: Optional[Sequence[str]] = None,
+    arquivo: Optional[str] = MATRIZ_CONFRONTO_JSON,
+    processos: Optional[int] = None,
+    arquivo_times: str = TIMES_CSV,
+    arquivo_jogadores: str = JOGADORES_CSV,
+) -> MatrizConfronto:
+    """Monta (ou atualiza a partir do cache) a matriz de confrontos.
+
+    Args:
+        times: Times da matriz. Padrão: `funcoes_prejogo_deepseek.times`
+            ou, se a lista estiver vazia, todos os times com elenco.
+        arquivo: JSON do cache. None desliga o cache em disco.
+        processos: Número de processos. 1 calcula tudo no processo atual;
+            None usa o padrão do ProcessPoolExecutor.
+    """
+    registro = obter_registro(arquivo_times, arquivo_jogadores)
+    if times is None:
+        from funcoes_prejogo_deepseek import times as times_cadastrados
+
+        times = times_cadastrados or sorted(registro.overs_medios())
+    times = [t.strip().lower() for t in times]
+
+    modelo = assinatura_modelo(arquivo_times)
+    elencos = {t: _hash(registro.elenco(t)) for t in times}
+
+    cache = _carregar_cache(arquivo) if arquivo else {}
+    if cache.get("modelo") != modelo:
+        cache = {"modelo": modelo, "elencos": {}, "probabilidades": {}}
+
+    # Time com elenco novo ou alterado: a linha e a coluna dele são refeitas.
+    alterados = {t for t in times if cache["elencos"].get(t) != elencos[t]}
+    guardadas = {
+        chave: p
+        for chave, p in cache["probabilidades"].items()
+        if not alterados.intersection(chave.split("|"))
+    }
+    probabilidades: Dict[Tuple[str, str], float] = {}
+    pendentes: List[Tuple[str, str, float, float]] = []
+    for t1 in times:
+        for t2 in times:
+            if t1 == t2:
+                continue
+            chave = f"{t1}|{t2}"
+            if t1 not in alterados and t2 not in alterados and chave in guardadas:
+                probabilidades[(t1, t2)] = guardadas[chave]
+            else:
+                pendentes.append(
+                    (t1, t2, registro.over_medio(t1), registro.over_medio(t2))
+                )
+
+    if pendentes:
+        logger.info(
+            "Matriz de confrontos: %d pares a calcular (%d em cache)",
+            len(pendentes),
+            len(probabilidades),
+        )
+        for t1, t2, p in calcular_pares(pendentes, processos):
+            probabilidades[(t1, t2)] = p
+
+    if arquivo and (pendentes or alterados):
+        guardadas.update({f"{t1}|{t2}": p for (t1, t2), p in probabilidades.items()})
+        cache["elencos"].update(elencos)
+        cache["probabilidades"] = guardadas
+        _salvar_cache(arquivo, cache)
+
+    return MatrizConfronto(times, probabilidades)
@@ -0,0 +1,147 @@
+"""Cache de distribuições de placar por mapa, com despejo LRU.
+
+Num lote de torneios, as partidas automáticas repetem os mesmos confrontos
+(over do time 1, over do time 2, mapa) milhares de vezes, e cada uma
+jogava o mapa round a round. Quando ninguém vai olhar os rounds (nem as
+kills), basta sortear o placar final da distribuição do confronto.
+
+`MemoMapas` guarda, por (over1, over2, mapa), os placares possíveis e uma
+tabela de alias com as probabilidades (sorteio_ponderado.py): sortear um
+placar custa um número aleatório. Na primeira vez que um confronto
+aparece, a distribuição vem da programação dinâmica exata
+(distribuicao_exata.py) ou, com `monte_carlo=n`, de n mapas no motor
+vetorizado.
+
+Os overs entram na chave arredondados para múltiplos de `passo`. O over
+médio de cinco jogadores com over inteiro é múltiplo de 0,2, então com o
+passo padrão (0,1) os times reais nunca caem na mesma chave por
+arredondamento. Quando o cache enche, sai o confronto usado há mais tempo.
+"""
+
+from collections import OrderedDict
+from typing import Optional, Tuple
+import numpy as np
+from distribuicao_exata import Placar, distribuicao_placares, probabilidade_round_ct
+from sorteio_ponderado import TabelaAlias
+
+ChaveMapa = Tuple[float, float, str]
+
+
+class DistribuicaoSorteavel:
+    """Placares de um confronto e a tabela de alias para sorteá-los."""
+
+    __slots__ = ("placares", "tabela")
+
+    def __init__(self, placares: Tuple[Placar, ...], probabilidades):
+        self.placares = placares
+        self.tabela = TabelaAlias(probabilidades)
+
+    def sortear(self, rng) -> Placar:
+        return self.placares[self.tabela.sortear(rng)]
+
+
+class MemoMapas:
+    """Distribuições de placar por confronto quantizado, com LRU e contadores.
+
+    Args:
+        capacidade: Máximo de confrontos guardados.
+        passo: Resolução da quantização dos overs.
+        monte_carlo: Se passado, cada falha é preenchida com esse número
+            de mapas simulados no motor vetorizado em vez da conta exata.
+        semente: Semente do Monte Carlo.
+    """
+
+    def __init__(
+        self,
+        capacidade: int = 4096,
+        passo: float = 0.1,
+        monte_carlo: Optional[int] = None,
+        semente: Optional[int] = None,
+    ):
+        if capacidade < 1:
+            raise ValueError("capacidade deve ser pelo menos 1")
+        if passo <= 0:
+            raise ValueError("passo deve ser positivo")
+        self.capacidade = capacidade
+        self.passo = passo
+        self.monte_carlo = monte_carlo
+        self._rng = np.random.default_rng(semente)
+        self._itens: "OrderedDict[ChaveMapa, DistribuicaoSorteavel]" = OrderedDict()
+        self.acertos = 0
+        self.falhas = 0
+        self.despejos = 0
+
+    def __len__(self) -> int:
+        return len(self._itens)
+
+    @property
+    def taxa_acerto(self) -> float:
+        consultas = self.acertos + self.falhas
+        return self.acertos / consultas if consultas else 0.0
+
+    def _quantizar(self, over: float) -> float:
+        return round(round(over / self.passo) * self.passo, 6)
+
+    def chave(self, over_time1: float, over_time2: float, mapa: str) -> ChaveMapa:
+        return self._quantizar(over_time1), self._quantizar(over_time2), mapa
+
+    def distribuicao(
+        self, over_time1: float, over_time2: float, mapa: str
+    ) -> DistribuicaoSorteavel:
+        """Distribuição do confronto, calculada só na primeira consulta."""
+        chave = self.chave(over_time1, over_time2, mapa)
+        item = self._itens.get(chave)
+        if item is not None:
+            self.acertos += 1
+            self._itens.move_to_end(chave)
+            return item
+
+        self.falhas += 1
+        item = self._preencher(*chave)
+        self._itens[chave] = item
+        if len(self._itens) > self.capacidade:
+            self._itens.popitem(last=False)
+            self.despejos += 1
+        return item
+
+    def sortear_placar(
+        self, over_time1: float, over_time2: float, mapa: str, rng
+    ) -> Placar:
+        """Placar final (time 1, time 2), com o time 1 começando de CT."""
+        return self.distribuicao(over_time1, over_time2, mapa).sortear(rng)
+
+    def _preencher(
+        self, over_time1: float, over_time2: float, mapa: str
+    ) -> DistribuicaoSorteavel:
+        if self.monte_carlo:
+            # Import local: o motor vetorizado só é carregado se for usado
+            from motor_vetorizado import simular_mapas_vetorizado
+
+            n = self.monte_carlo
+            placar1, placar2 = simular_mapas_vetorizado(
+                np.full(n, over_time1), np.full(n, over_time2), [mapa] * n, self._rng
+            )
+            pares, contagens = np.unique(
+                np.stack([placar1, placar2], axis=1), axis=0, return_counts=True
+            )
+            return DistribuicaoSorteavel(
+                tuple((int(a), int(b)) for a, b in pares), contagens.tolist()
+            )
+
+        placares = distribuicao_placares(
+            probabilidade_round_ct(over_time1, over_time2, mapa),
+            probabilidade_round_ct(over_time2, over_time1, mapa),
+        )
+        ordenados = sorted(placares.items())
+        return DistribuicaoSorteavel(
+            tuple(placar for placar, _ in ordenados), [p for _, p in ordenados]
+        )
+
+    def limpar(self) -> None:
+        """Esvazia o cache e zera os contadores."""
+        self._itens.clear()
+        self.acertos = self.falhas = self.despejos = 0
+
+
+# Cache compartilhado da sessão (padrão de `simular_partida_auto`).
+MEMO_MAPAS = MemoMapas()
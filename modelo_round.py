@@ -0,0 +1,118 @@
+"""Parâmetros do modelo de decisão de round.
+
+Os pesos abaixo ficavam como variáveis locais dentro de
+`calcular_probabilidade_vitoria`. Agora que existe mais de um motor de
+simulação (o round a round de funcoes_simulacao_deepseek.py e o vetorizado
+de motor_vetorizado.py), eles moram aqui para que os dois usem exatamente
+o mesmo modelo — mudar um peso num lugar e esquecer do outro faria os
+motores divergirem em silêncio.
+
+O score de um round, do ponto de vista do CT, é:
+
+    score = PESO_OVER * (over_ct - over_tr)
+          + PESO_LADO * vantagem_lado          (+1 CT, -1 TR)
+          + PESO_ESTRATEGIA * vantagem_estrat  (+1 se a regra favorece o CT)
+          + PESO_RANDOMICO * U,  U ~ Uniforme(-1, 1)
+
+e a chance do CT vencer é a sigmoide 1 / (1 + exp(-K_SIGMOIDE * score)).
+"""
+
+import math
+from functools import lru_cache
+
+PESO_OVER = 0.3
+PESO_LADO = 0.3
+PESO_ESTRATEGIA = 0.6
+PESO_RANDOMICO = 1.2
+K_SIGMOIDE = 0.1
+
+# Formato de mapa (MR12): 12 rounds por half, 13 para vencer; overtime em
+# MR3 (3 rounds por lado), vence quem abrir 3 a mais que o placar do início
+# do overtime — ver jogar_mapa / jogar_ot.
+ROUNDS_POR_HALF = 12
+META_MAPA = 13
+ROUNDS_POR_HALF_OT = 3
+ROUNDS_META_OT = 3
+
+
+# ==================== PROBABILIDADE EXATA ====================
+# `calcular_probabilidade_vitoria` sorteava U e `decidir_vencedor_round`
+# sorteava de novo contra a sigmoide: dois números aleatórios e um exp por
+# round para o que, no fim, é um único Bernoulli. Integrando a sigmoide
+# sobre U ~ Uniforme(-1, 1), com a = parte determinística do score e
+# c = PESO_RANDOMICO:
+#
+#     P(CT) = 1/2 ∫ σ(k(a + c·u)) du  (u de -1 a 1)
+#           = [softplus(k(a + c)) - softplus(k(a - c))] / (2·k·c)
+#
+# que dá exatamente a mesma distribuição com um sorteio só.
+
+# Resolução da tabela: a diferença de over é arredondada para múltiplos de
+# PASSO_DIFERENCA_OVER. Médias de elencos de 5 jogadores com over inteiro
+# são múltiplos de 0.2, então na prática a tabela é exata.
+PASSO_DIFERENCA_OVER = 0.01
+
+# Códigos de vantagem de estratégia (os mesmos de resultado_estrategias):
+# 1 = regra favorece o CT, -1 = favorece o TR, 0 = sem regra (cara ou coroa).
+_ESTRATEGIAS_VALIDAS = (1, -1, 0)
+
+
+def _softplus(x: float) -> float:
+    """log(1 + e^x) sem overflow para |x| grande."""
+    return max(x, 0.0) + math.log1p(math.exp(-abs(x)))
+
+
+def probabilidade_ct_exata(
+    diferenca_over: float,
+    vantagem_lado: int,
+    vantagem_estrategia: int,
+    k: float = K_SIGMOIDE,
+) -> float:
+    """Chance exata do CT vencer o round, já integrada sobre o fator randômico.
+
+    `vantagem_estrategia` 0 é o caso sem regra: a média entre a estratégia
+    favorecer o CT e favorecer o TR, como o cara ou coroa de
+    `estrategia_resultado`.
+    """
+    if vantagem_estrategia not in _ESTRATEGIAS_VALIDAS:
+        raise ValueError(f"Vantagem de estratégia inválida: {vantagem_estrategia}")
+    if vantagem_estrategia == 0:
+        return 0.5 * (
+            probabilidade_ct_exata(diferenca_over, vantagem_lado, 1, k)
+            + probabilidade_ct_exata(diferenca_over, vantagem_lado, -1, k)
+        )
+
+    a = (
+        PESO_OVER * diferenca_over
+        + PESO_LADO * vantagem_lado
+        + PESO_ESTRATEGIA * vantagem_estrategia
+    )
+    c = PESO_RANDOMICO
+    if k * c == 0:
+        return 1 / (1 + math.exp(-k * a))
+    return (_softplus(k * (a + c)) - _softplus(k * (a - c))) / (2 * k * c)
+
+
+@lru_cache(maxsize=4096)
+def _probabilidade_tabelada(
+    balde_over: int, vantagem_lado: int, vantagem_estrategia: int, k: float
+) -> float:
+    return probabilidade_ct_exata(
+        balde_over * PASSO_DIFERENCA_OVER, vantagem_lado, vantagem_estrategia, k
+    )
+
+
+def probabilidade_ct(
+    diferenca_over: float,
+    vantagem_lado: int,
+    vantagem_estrategia: int,
+    k: float = K_SIGMOIDE,
+) -> float:
+    """Versão tabelada de `probabilidade_ct_exata`, para o loop de rounds.
+
+    A chave é (balde da diferença de over, lado, estratégia): cada confronto
+    usa só um punhado de entradas, calculadas na primeira vez e servidas da
+    tabela a partir daí.
+    """
+    balde = round(diferenca_over / PASSO_DIFERENCA_OVER)
+    return _probabilidade_tabelada(balde, vantagem_lado, vantagem_estrategia, k)
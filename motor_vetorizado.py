@@ -0,0 +1,292 @@
+"""Motor de mapas vetorizado (NumPy).
+
+`jogar_half` -> `decidir_vencedor_round` -> `calcular_probabilidade_vitoria`
+joga um round por vez em Python puro, com chamadas a `random` e `math.exp`
+em cada round. Isso é ótimo para narrar uma partida, mas inviável para
+lotes grandes (100 mil partidas em `simular_partidas_em_lote_auto`, milhares
+de chaves em `simular_torneios_em_lote`).
+
+Este motor recebe arrays de confrontos (over médio de cada time e id do
+mapa) e joga o mesmo round de TODOS os mapas de uma vez, com sorteios em
+lote. As regras são as mesmas de `jogar_mapa`/`jogar_ot`:
+
+- MR12: time 1 começa de CT, troca de lado após 12 rounds, 13 vence;
+- 12-12 vai para overtime MR3: meta = placar do início do OT + 3, time 1
+  de CT nos 3 primeiros rounds e de TR nos 3 seguintes, e o half é
+  interrompido assim que alguém alcança a meta.
+
+Não há estatística de jogador aqui — só placares. Quem precisa de kills e
+deaths continua usando `jogar_mapa`.
+
+Para comparar cenários (o mesmo time com um jogador trocado, por exemplo),
+o motor aceita um `FluxoComum` no lugar do gerador: os números aleatórios
+ficam amarrados ao round de cada mapa, e os dois cenários veem exatamente os
+mesmos sorteios (números aleatórios comuns). O fluxo também faz amostragem
+antitética. Ver reducao_variancia.py.
+"""
+
+from typing import Optional, Sequence, Tuple, Union
+import numpy as np
+from estrategias_deepseek import estrategias_por_mapa, matrizes_resultado_por_mapa
+from modelo_round import (
+    PESO_OVER,
+    PESO_LADO,
+    PESO_ESTRATEGIA,
+    PESO_RANDOMICO,
+    K_SIGMOIDE,
+    ROUNDS_POR_HALF,
+    META_MAPA,
+    ROUNDS_POR_HALF_OT,
+    ROUNDS_META_OT,
+)
+
+# Ordem fixa dos mapas: o id de um mapa é a posição dele nesta tupla.
+MAPAS: Tuple[str, ...] = tuple(estrategias_por_mapa.keys())
+_ID_MAPA = {nome: i for i, nome in enumerate(MAPAS)}
+
+
+def _montar_tabela_estrategias() -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Empilha as matrizes de estrategias_deepseek num array (mapa, ct, tr).
+
+    Os mapas têm quantidades diferentes de estratégias, então a tabela é
+    preenchida com zeros (cara ou coroa) até o maior tamanho — essas células
+    extras nunca são sorteadas, porque o índice de cada lado é limitado ao
+    total de estratégias daquele mapa.
+    """
+    total_ct = np.array([len(estrategias_por_mapa[m]["ct"]) for m in MAPAS])
+    total_tr = np.array([len(estrategias_por_mapa[m]["tr"]) for m in MAPAS])
+    tabela = np.zeros((len(MAPAS), total_ct.max(), total_tr.max()), dtype=np.int8)
+    for i, mapa in enumerate(MAPAS):
+        for idx_ct, linha in enumerate(matrizes_resultado_por_mapa.get(mapa, [])):
+            tabela[i, idx_ct, : len(linha)] = linha
+    return tabela, total_ct, total_tr
+
+
+_TABELA_ESTRATEGIAS, _TOTAL_CT, _TOTAL_TR = _montar_tabela_estrategias()
+
+GeradorOuSemente = Union[np.random.Generator, int, None]
+
+
+def ids_mapas(mapas: Sequence[Union[str, int]]) -> np.ndarray:
+    """Converte nomes (ou ids já numéricos) de mapas em array de ids."""
+    if isinstance(mapas, np.ndarray) and np.issubdtype(mapas.dtype, np.integer):
+        if mapas.size and (mapas.min() < 0 or mapas.max() >= len(MAPAS)):
+            raise ValueError("Id de mapa fora do intervalo")
+        return mapas.astype(np.int64, copy=False)
+    try:
+        return np.array(
+            [m if isinstance(m, (int, np.integer)) else _ID_MAPA[m] for m in mapas],
+            dtype=np.int64,
+        )
+    except KeyError as e:
+        raise ValueError(f"Mapa {e} não encontrado nas estratégias")
+
+
+def _probabilidade_ct(diferenca_over: np.ndarray, resultado: np.ndarray) -> np.ndarray:
+    """`modelo_round.probabilidade_ct_exata` aplicada a arrays (lado sempre CT).
+
+    O fator randômico já vem integrado na fórmula fechada, e pares sem regra
+    (resultado 0) recebem a média entre favorecer CT e TR — um sorteio por
+    round em vez de três (ruído, cara ou coroa e o round em si).
+    """
+    k, c = K_SIGMOIDE, PESO_RANDOMICO
+    base = PESO_OVER * diferenca_over + PESO_LADO
+
+    def integrada(a: np.ndarray) -> np.ndarray:
+        if k * c == 0:
+            return 1.0 / (1.0 + np.exp(-k * a))
+        return (np.logaddexp(0.0, k * (a + c)) - np.logaddexp(0.0, k * (a - c))) / (
+            2 * k * c
+        )
+
+    favorece_ct = integrada(base + PESO_ESTRATEGIA)
+    favorece_tr = integrada(base - PESO_ESTRATEGIA)
+    return np.where(
+        resultado > 0,
+        favorece_ct,
+        np.where(resultado < 0, favorece_tr, 0.5 * (favorece_ct + favorece_tr)),
+    )
+
+
+class FluxoComum:
+    """Números aleatórios amarrados ao round, para comparar cenários.
+
+    O round r de cada mapa usa sempre os mesmos três uniformes (estratégia
+    do CT, estratégia do TR e o round em si), tirados de um gerador semeado
+    com (semente, r) — não importa quantos mapas ainda estão em jogo nem o
+    que aconteceu antes. Dois cenários simulados com fluxos de mesma
+    semente veem os mesmos sorteios, e a diferença entre eles fica só com o
+    efeito da mudança, não com o ruído.
+
+    Com `antitetico=True`, a segunda metade dos mapas usa 1 - u onde a
+    primeira metade usou u: o mapa i e o mapa i + ceil(n/2) formam um par
+    com resultados negativamente correlacionados.
+    """
+
+    def __init__(self, semente: Optional[int] = None, antitetico: bool = False):
+        if semente is None:
+            semente = int(np.random.SeedSequence().generate_state(1)[0])
+        self.semente = semente
+        self.antitetico = antitetico
+
+    def uniformes(self, rodada: int, n: int) -> np.ndarray:
+        """Array (3, n) de uniformes do round `rodada` de n mapas."""
+        rng = np.random.default_rng([self.semente, rodada])
+        # Linha i = os três uniformes do mapa i: o mapa i recebe os mesmos
+        # números qualquer que seja n (desde que n > i).
+        if not self.antitetico:
+            return rng.random((n, 3)).T
+        metade = rng.random(((n + 1) // 2, 3))
+        return np.concatenate([metade, 1.0 - metade])[:n].T
+
+
+def _jogar_rounds(
+    uniformes: np.ndarray,
+    over_time1: np.ndarray,
+    over_time2: np.ndarray,
+    mapas: np.ndarray,
+    time1_ct: bool,
+) -> np.ndarray:
+    """Joga um round em cada mapa recebido e devolve True onde o time 1 venceu.
+
+    `uniformes` tem formato (3, n): estratégia do CT, do TR e o round.
+    """
+    if time1_ct:
+        diferenca_over = over_time1 - over_time2
+    else:
+        diferenca_over = over_time2 - over_time1
+
+    # Mesmo modelo de calcular_probabilidade_vitoria, do ponto de vista do
+    # CT (lado_time é sempre "ct" em jogar_half, então vantagem_lado = +1).
+    # Cada lado sorteia uma estratégia uniforme (como escolher_estrategia no
+    # modo auto) e a matriz compilada diz quem o par favorece. O mínimo só
+    # importa para o 1 - 0 do fluxo antitético.
+    total_ct, total_tr = _TOTAL_CT[mapas], _TOTAL_TR[mapas]
+    idx_ct = np.minimum((uniformes[0] * total_ct).astype(np.int64), total_ct - 1)
+    idx_tr = np.minimum((uniformes[1] * total_tr).astype(np.int64), total_tr - 1)
+    resultado = _TABELA_ESTRATEGIAS[mapas, idx_ct, idx_tr]
+    probabilidade_ct = _probabilidade_ct(diferenca_over, resultado)
+    ct_venceu = uniformes[2] < probabilidade_ct
+    return ct_venceu if time1_ct else ~ct_venceu
+
+
+def simular_mapas_vetorizado(
+    over_time1: Sequence[float],
+    over_time2: Sequence[float],
+    mapas: Sequence[Union[str, int]],
+    rng: GeradorOuSemente = None,
+    fluxo: Optional[FluxoComum] = None,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Simula N mapas em paralelo e devolve os placares finais.
+
+    Args:
+        over_time1: Over médio do time 1 (começa de CT) em cada mapa.
+        over_time2: Over médio do time 2 em cada mapa.
+        mapas: Nome ou id (posição em MAPAS) do mapa de cada confronto.
+        rng: Gerador NumPy (ou semente) usado em todos os sorteios.
+        fluxo: Se passado, os sorteios vêm dele (round a round) e `rng` é
+            ignorado.
+
+    Returns:
+        Tupla (placar_time1, placar_time2), arrays de inteiros de tamanho N.
+    """
+    rng = np.random.default_rng(rng)
+    over_time1 = np.asarray(over_time1, dtype=np.float64)
+    over_time2 = np.asarray(over_time2, dtype=np.float64)
+    ids = ids_mapas(mapas)
+
+    if not (len(over_time1) == len(over_time2) == len(ids)):
+        raise ValueError("over_time1, over_time2 e mapas devem ter o mesmo tamanho")
+
+    n = len(ids)
+    placar1 = np.zeros(n, dtype=np.int64)
+    placar2 = np.zeros(n, dtype=np.int64)
+    # Quantos rounds cada mapa em jogo já disputou: todos os mapas que
+    # jogam uma rodada do laço estão no mesmo round do mapa.
+    rodada = 0
+
+    def sortear(idx: np.ndarray) -> np.ndarray:
+        nonlocal rodada
+        if fluxo is None:
+            uniformes = rng.random((3, idx.size))
+        else:
+            uniformes = fluxo.uniformes(rodada, n)[:, idx]
+        rodada += 1
+        return uniformes
+
+    def jogar_half(em_jogo: np.ndarray, max_rounds: int, meta, time1_ct: bool):
+        """Joga até max_rounds, tirando do half os mapas que batem a meta."""
+        no_half = em_jogo.copy()
+        for _ in range(max_rounds):
+            idx = np.flatnonzero(no_half)
+            if idx.size == 0:
+                break
+            venceu = _jogar_rounds(
+                sortear(idx), over_time1[idx], over_time2[idx], ids[idx], time1_ct
+            )
+            placar1[idx] += venceu
+            placar2[idx] += ~venceu
+            meta_idx = meta[idx] if isinstance(meta, np.ndarray) else meta
+            no_half[idx] = (placar1[idx] < meta_idx) & (placar2[idx] < meta_idx)
+
+    todos = np.ones(n, dtype=bool)
+    # Primeiro half: time 1 de CT. Segundo half: time 2 de CT.
+    jogar_half(todos, ROUNDS_POR_HALF, META_MAPA, time1_ct=True)
+    jogar_half(
+        (placar1 < META_MAPA) & (placar2 < META_MAPA),
+        ROUNDS_POR_HALF,
+        META_MAPA,
+        time1_ct=False,
+    )
+
+    # Overtimes (MR3), repetidos enquanto algum mapa seguir empatado.
+    em_ot = placar1 == placar2
+    while em_ot.any():
+        meta = np.maximum(placar1, placar2) + ROUNDS_META_OT
+        for time1_ct in (True, False):
+            jogar_half(em_ot, ROUNDS_POR_HALF_OT, meta, time1_ct=time1_ct)
+            decidido = ((placar1 >= meta) & (placar1 > placar2)) | (
+                (placar2 >= meta) & (placar2 > placar1)
+            )
+            em_ot &= ~decidido
+
+    return placar1, placar2
+
+
+def simular_md3_vetorizado(
+    over_time1: Sequence[float],
+    over_time2: Sequence[float],
+    mapas: Sequence[Sequence[Union[str, int]]],
+    rng: GeradorOuSemente = None,
+    fluxo: Optional[FluxoComum] = None,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Simula N séries melhor de 3 em paralelo.
+
+    `mapas` tem formato (N, 3): os dois picks e o decider de cada série. Os
+    três mapas são sorteados de uma vez (o terceiro é descartado quando a
+    série termina 2-0), o que mantém tudo vetorizado sem mudar o resultado.
+
+    Com `fluxo`, os mapas da série k são os mapas 3k, 3k+1 e 3k+2 do fluxo;
+    no modo antitético e com N par, a série k faz par com a série k + N/2.
+
+    Returns:
+        Tupla (mapas_time1, mapas_time2) com os mapas vencidos por cada time.
+    """
+    rng = np.random.default_rng(rng)
+    over_time1 = np.asarray(over_time1, dtype=np.float64)
+    over_time2 = np.asarray(over_time2, dtype=np.float64)
+    ids = np.array([ids_mapas(serie) for serie in mapas], dtype=np.int64)
+    if ids.ndim != 2 or ids.shape[1] != 3:
+        raise ValueError("mapas deve ter formato (N, 3)")
+
+    n = len(ids)
+    placar1, placar2 = simular_mapas_vetorizado(
+        np.repeat(over_time1, 3), np.repeat(over_time2, 3), ids.ravel(), rng, fluxo
+    )
+    venceu = (placar1 > placar2).reshape(n, 3)
+
+    mapas_time1 = venceu[:, 0].astype(np.int64) + venceu[:, 1]
+    decisivo = mapas_time1 == 1  # 1-1 depois de dois mapas
+    mapas_time1 = mapas_time1 + (decisivo & venceu[:, 2])
+    jogados = np.where(decisivo, 3, 2)
+    return mapas_time1, jogados - mapas_time1
@@ -0,0 +1,410 @@
+"""Chances exatas de torneio (sem amostragem) a partir da matriz de confrontos.
+
+Os três formatos de `criar_torneio` têm estrutura pequena o bastante para
+serem resolvidos de forma exata, dado P(time1 vence time2) para cada
+confronto (matriz_confronto.py):
+
+- mata-mata (`fase_mata_mata`): recursão sobre as sub-chaves — a chance de
+  um time vencer uma sub-chave é a de vencer a metade dele vezes a de
+  vencer quem sair da outra metade;
+- grupos (`fase_grupos`): programação dinâmica sobre o vetor de pontos do
+  grupo, partida a partida, com o mesmo critério de classificação (pontos,
+  e no empate a ordem do grupo). Os classificados seguem para o mata-mata,
+  grupo a grupo, como em `criar_torneio`;
+- double elimination (`fase_double_elimination`): a sequência de jogos
+  (com as mesmas regras de bye e final) é reescrita como jogos entre vagas,
+  e a distribuição de quem ocupa cada vaga é mantida em blocos
+  independentes, que só se juntam quando um jogo cruza dois deles.
+
+Tudo aqui é para uma chave fixa: os times jogam na ordem recebida (0x1,
+2x3, ...), com o primeiro de cada par como time 1. As funções de torneio
+sorteiam a chave (`random.shuffle`); para seeding é justamente a chave fixa
+que interessa, e a chance com sorteio é a média sobre as ordens possíveis.
+"""
+
+from typing import Callable, Dict, List, Mapping, Sequence, Tuple, Union
+import numpy as np
+
+ProbConfronto = Callable[[str, str], float]
+
+
+def _funcao_probabilidade(matriz) -> ProbConfronto:
+    """Aceita uma MatrizConfronto ou um dicionário {(time1, time2): p}."""
+    if hasattr(matriz, "prob_vitoria"):
+        return matriz.prob_vitoria
+    if isinstance(matriz, Mapping):
+        return lambda time1, time2: matriz[(time1, time2)]
+    raise TypeError("matriz deve ser uma MatrizConfronto ou um dicionário de pares")
+
+
+def _potencia_de_2(quantidade: int) -> bool:
+    return quantidade >= 1 and quantidade & (quantidade - 1) == 0
+
+
+# ==================== MATA-MATA ====================
+def _vencer_chave(
+    folhas: Sequence[Dict[str, float]],
+    prob: ProbConfronto,
+    avancos: Dict[str, List[float]],
+    fase: int,
+) -> Dict[str, float]:
+    """P(cada time vencer a chave formada por `folhas`).
+
+    Cada folha é a distribuição (independente das outras) de quem ocupa
+    aquela posição da chave — um time só, com chance 1, no mata-mata puro.
+    `fase` é o índice da partida decisiva desta chave em `avancos`, onde a
+    chance de vencer cada partida é acumulada.
+    """
+    if len(folhas) == 1:
+        return folhas[0]
+    meio = len(folhas) // 2
+    esquerda = _vencer_chave(folhas[:meio], prob, avancos, fase - 1)
+    direita = _vencer_chave(folhas[meio:], prob, avancos, fase - 1)
+    resultado = {}
+    # Quem vem da metade de cima joga como time 1 (como no pareamento
+    # times[i] x times[i + 1] das funções de torneio).
+    for t1, p1 in esquerda.items():
+        resultado[t1] = p1 * sum(p2 * prob(t1, t2) for t2, p2 in direita.items())
+    for t2, p2 in direita.items():
+        resultado[t2] = p2 * sum(
+            p1 * (1.0 - prob(t1, t2)) for t1, p1 in esquerda.items()
+        )
+    for time, p in resultado.items():
+        avancos[time][fase] += p
+    return resultado
+
+
+def odds_mata_mata(chave: Sequence[str], matriz) -> Dict[str, List[float]]:
+    """Chance de cada time vencer cada fase de um mata-mata com chave fixa.
+
+    Returns:
+        {time: [P(vence a 1ª fase), P(vence a 2ª), ..., P(campeão)]}.
+    """
+    if not _potencia_de_2(len(chave)) or len(chave) < 2:
+        raise ValueError("Número de times deve ser potência de 2 para mata-mata")
+    fases = len(chave).bit_length() - 1
+    avancos = {time: [0.0] * fases for time in chave}
+    _vencer_chave(
+        [{time: 1.0} for time in chave],
+        _funcao_probabilidade(matriz),
+        avancos,
+        fases - 1,
+    )
+    return avancos
+
+
+# ==================== GRUPOS ====================
+def _classificacao(grupo: Sequence[str], pontos: Sequence[int]) -> Tuple[str, ...]:
+    """Mesmo sort estável de fase_grupos: pontos, e no empate a ordem do grupo."""
+    ordem = sorted(range(len(grupo)), key=lambda i: -pontos[i])
+    return tuple(grupo[i] for i in ordem)
+
+
+def distribuicao_grupo(
+    grupo: Sequence[str], matriz, ida_e_volta: bool = False
+) -> Dict[Tuple[str, ...], float]:
+    """Distribuição exata da classificação final de um grupo.
+
+    Returns:
+        {classificação (tupla do 1º ao último): probabilidade}.
+    """
+    prob = _funcao_probabilidade(matriz)
+    partidas = [
+        (i, j)
+        for i in range(len(grupo))
+        for j in range(i + 1, len(grupo))
+        for _ in range(2 if ida_e_volta else 1)
+    ]
+
+    # Estado: vitórias de cada time (os pontos são 3 por vitória, então a
+    # ordem é a mesma).
+    estados: Dict[Tuple[int, ...], float] = {tuple([0] * len(grupo)): 1.0}
+    for i, j in partidas:
+        p = prob(grupo[i], grupo[j])
+        proximos: Dict[Tuple[int, ...], float] = {}
+        for vitorias, p_estado in estados.items():
+            for vencedor, p_jogo in ((i, p), (j, 1.0 - p)):
+                if p_jogo <= 0.0:
+                    continue
+                novo = list(vitorias)
+                novo[vencedor] += 1
+                novo = tuple(novo)
+                proximos[novo] = proximos.get(novo, 0.0) + p_estado * p_jogo
+        estados = proximos
+
+    classificacoes: Dict[Tuple[str, ...], float] = {}
+    for vitorias, p in estados.items():
+        ordem = _classificacao(grupo, vitorias)
+        classificacoes[ordem] = classificacoes.get(ordem, 0.0) + p
+    return classificacoes
+
+
+def odds_fase_grupos(
+    grupos: Sequence[Sequence[str]],
+    matriz,
+    num_classificados: int,
+    ida_e_volta: bool = False,
+) -> Dict[str, Dict[str, Union[float, List[float]]]]:
+    """Chances exatas do formato grupos + mata-mata de `criar_torneio`.
+
+    Returns:
+        {time: {"posicoes": [P(1º no grupo), ...], "classifica": p,
+        "avancos": [P(vence cada fase do mata-mata)], "campeao": p}}.
+    """
+    total = num_classificados * len(grupos)
+    if not _potencia_de_2(total) or total < 2:
+        raise ValueError(
+            "Número de classificados deve ser potência de 2 para mata-mata"
+        )
+
+    fases = total.bit_length() - 1
+    odds = {}
+    # Por grupo: {classificados em ordem: probabilidade}
+    cortes_por_grupo = []
+    for grupo in grupos:
+        for time in grupo:
+            odds[time] = {
+                "posicoes": [0.0] * len(grupo),
+                "classifica": 0.0,
+                "avancos": [0.0] * fases,
+                "campeao": 0.0,
+            }
+        cortes: Dict[Tuple[str, ...], float] = {}
+        for ordem, p in distribuicao_grupo(grupo, matriz, ida_e_volta).items():
+            for posicao, time in enumerate(ordem):
+                odds[time]["posicoes"][posicao] += p
+            corte = ordem[:num_classificados]
+            cortes[corte] = cortes.get(corte, 0.0) + p
+        for corte, p in cortes.items():
+            for time in corte:
+                odds[time]["classifica"] += p
+        cortes_por_grupo.append(cortes)
+
+    # A chave do mata-mata é montada grupo a grupo (como em criar_torneio),
+    # e como o número de classificados por grupo é potência de 2, cada
+    # grupo ocupa uma sub-chave inteira. Dentro dela, o mata-mata é
+    # resolvido para cada combinação de classificados; acima dela, os
+    # grupos são independentes e entram como folhas da chave.
+    prob = _funcao_probabilidade(matriz)
+    fases_grupo = num_classificados.bit_length() - 1
+    avancos = {time: odds[time]["avancos"] for time in odds}
+    vencedores_por_grupo = []
+    for cortes in cortes_por_grupo:
+        vencedor_grupo: Dict[str, float] = {}
+        for corte, p_corte in cortes.items():
+            if fases_grupo == 0:
+                vencedor_grupo[corte[0]] = vencedor_grupo.get(corte[0], 0.0) + p_corte
+                continue
+            for time, avancos_corte in odds_mata_mata(corte, matriz).items():
+                for fase, p in enumerate(avancos_corte):
+                    avancos[time][fase] += p_corte * p
+                vencedor_grupo[time] = (
+                    vencedor_grupo.get(time, 0.0) + p_corte * avancos_corte[-1]
+                )
+        vencedores_por_grupo.append(vencedor_grupo)
+    _vencer_chave(vencedores_por_grupo, prob, avancos, fases - 1)
+
+    for time in odds:
+        odds[time]["campeao"] = odds[time]["avancos"][-1]
+    return odds
+
+
+# ==================== DOUBLE ELIMINATION ====================
+# Cada posição das listas de fase_double_elimination (chave de vencedores,
+# chave de perdedores) vira uma "vaga" numerada. Sem os shuffles, a ordem
+# dos jogos entre vagas é fixa e só depende do número de times, então o
+# torneio pode ser descrito como uma sequência de jogos entre vagas.
+#
+# Para resolver, as vagas são agrupadas em blocos independentes, cada um
+# com a distribuição conjunta de quem ocupa as suas vagas. Um jogo entre
+# vagas de blocos diferentes junta os dois blocos; o vencedor (e o
+# perdedor, na chave de cima) ocupa vagas novas, e as vagas dos eliminados
+# somem — o que mantém os blocos pequenos até as rodadas finais.
+
+# (vaga_time1, vaga_time2, vaga_do_vencedor, vaga_do_perdedor ou None)
+JogoVagas = Tuple[int, int, int, Union[int, None]]
+
+
+def _roteiro_double_elimination(
+    total_times: int,
+) -> Tuple[List[JogoVagas], Union[Tuple[int, int], None], int]:
+    """Mesma sequência de jogos de fase_double_elimination, sem shuffles.
+
+    Returns:
+        (jogos, final, vaga do campeão). `final` é (vaga do campeão da
+        chave de cima, vaga do finalista da de baixo), ou None quando não
+        há final (torneio de 1 time).
+    """
+    proxima_vaga = total_times
+    jogos: List[JogoVagas] = []
+
+    def nova_vaga() -> int:
+        nonlocal proxima_vaga
+        proxima_vaga += 1
+        return proxima_vaga - 1
+
+    def jogar(vagas: List[int], com_perdedor: bool) -> Tuple[List[int], List[int]]:
+        """Bye para o último se for ímpar; devolve (vencedores, perdedores)."""
+        vencedores, perdedores = [], []
+        if len(vagas) % 2 == 1:
+            vencedores.append(vagas[-1])
+            vagas = vagas[:-1]
+        for i in range(0, len(vagas), 2):
+            vencedor = nova_vaga()
+            perdedor = nova_vaga() if com_perdedor else None
+            jogos.append((vagas[i], vagas[i + 1], vencedor, perdedor))
+            vencedores.append(vencedor)
+            if com_perdedor:
+                perdedores.append(perdedor)
+        return vencedores, perdedores
+
+    cima = list(range(total_times))
+    baixo: List[int] = []
+    while len(cima) > 1:
+        cima, novos_perdedores = jogar(cima, com_perdedor=True)
+        if baixo:
+            baixo, _ = jogar(baixo, com_perdedor=False)
+        baixo = baixo + novos_perdedores
+    while len(baixo) > 1:
+        baixo, _ = jogar(baixo, com_perdedor=False)
+
+    if not baixo:
+        return jogos, None, cima[0] if cima else -1
+    campeao = nova_vaga()
+    return jogos, (cima[0], baixo[0]), campeao
+
+
+def _somar_repetidas(
+    times: np.ndarray, prob: np.ndarray, total_times: int
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Soma as linhas repetidas (mesmos times nas mesmas vagas).
+
+    Cada linha vira um número na base `total_times`, o que deixa o
+    np.unique unidimensional — bem mais rápido que o np.unique(axis=0).
+    """
+    colunas = times.shape[1]
+    if total_times**colunas >= 2**63:
+        unicas, inverso = np.unique(times, axis=0, return_inverse=True)
+        return unicas, np.bincount(inverso.ravel(), weights=prob)
+
+    pesos = total_times ** np.arange(colunas, dtype=np.int64)
+    chaves, inverso = np.unique(times @ pesos, return_inverse=True)
+    unicas = (chaves[:, None] // pesos) % total_times
+    return unicas, np.bincount(inverso, weights=prob)
+
+
+class _Bloco:
+    """Distribuição conjunta dos times (por índice) que ocupam um grupo de vagas.
+
+    `times` tem uma linha por combinação possível e uma coluna por vaga, e
+    `prob` a chance de cada linha — em arrays NumPy porque os blocos das
+    rodadas finais chegam a centenas de milhares de combinações.
+    """
+
+    def __init__(self, vagas: List[int], times: np.ndarray, prob: np.ndarray):
+        self.vagas = vagas
+        self.times = times
+        self.prob = prob
+
+    def juntar(self, outro: "_Bloco") -> "_Bloco":
+        n1, n2 = len(self.prob), len(outro.prob)
+        return _Bloco(
+            self.vagas + outro.vagas,
+            np.hstack(
+                [np.repeat(self.times, n2, axis=0), np.tile(outro.times, (n1, 1))]
+            ),
+            np.repeat(self.prob, n2) * np.tile(outro.prob, n1),
+        )
+
+    def jogar(
+        self,
+        vaga1: int,
+        vaga2: int,
+        vaga_vencedor: int,
+        vaga_perdedor: Union[int, None],
+        matriz: np.ndarray,
+    ) -> None:
+        """Substitui as vagas do jogo pela do vencedor (e a do perdedor)."""
+        i, j = self.vagas.index(vaga1), self.vagas.index(vaga2)
+        time1, time2 = self.times[:, i], self.times[:, j]
+        p1 = matriz[time1, time2]
+        resto = np.delete(self.times, [i, j], axis=1)
+
+        def linhas(vencedor: np.ndarray, perdedor: np.ndarray) -> np.ndarray:
+            colunas = [resto, vencedor[:, None]]
+            if vaga_perdedor is not None:
+                colunas.append(perdedor[:, None])
+            return np.hstack(colunas)
+
+        times = np.vstack([linhas(time1, time2), linhas(time2, time1)])
+        prob = np.concatenate([self.prob * p1, self.prob * (1.0 - p1)])
+        possivel = prob > 0.0
+        self.times, self.prob = _somar_repetidas(
+            times[possivel], prob[possivel], len(matriz)
+        )
+
+        self.vagas = [v for v in self.vagas if v not in (vaga1, vaga2)]
+        self.vagas.append(vaga_vencedor)
+        if vaga_perdedor is not None:
+            self.vagas.append(vaga_perdedor)
+
+
+def odds_double_elimination(
+    chave: Sequence[str], matriz
+) -> Dict[str, Dict[str, float]]:
+    """Chances exatas de `fase_double_elimination` para uma chave fixa.
+
+    Segue as mesmas regras (bye para o último quando a chave é ímpar, final
+    lower até sobrar um, final única sem "reset"), só que sem os
+    `random.shuffle` entre as rodadas.
+
+    Returns:
+        {time: {"campeao": p, "final": p}} — "final" é a chance de jogar a
+        final (como vencedor da chave de cima ou da de baixo).
+    """
+    prob = _funcao_probabilidade(matriz)
+    odds = {time: {"campeao": 0.0, "final": 0.0} for time in chave}
+    if not chave:
+        return odds
+    if len(chave) == 1:
+        odds[chave[0]]["campeao"] = 1.0
+        return odds
+
+    tabela = np.array([[0.5 if a == b else prob(a, b) for b in chave] for a in chave])
+    jogos, final, _ = _roteiro_double_elimination(len(chave))
+    bloco_da_vaga = {
+        vaga: _Bloco([vaga], np.array([[vaga]]), np.ones(1))
+        for vaga in range(len(chave))
+    }
+
+    def unir(vaga1: int, vaga2: int) -> _Bloco:
+        bloco1, bloco2 = bloco_da_vaga[vaga1], bloco_da_vaga[vaga2]
+        if bloco1 is bloco2:
+            return bloco1
+        bloco = bloco1.juntar(bloco2)
+        for vaga in bloco.vagas:
+            bloco_da_vaga[vaga] = bloco
+        return bloco
+
+    for vaga1, vaga2, vaga_vencedor, vaga_perdedor in jogos:
+        bloco = unir(vaga1, vaga2)
+        bloco.jogar(vaga1, vaga2, vaga_vencedor, vaga_perdedor, tabela)
+        del bloco_da_vaga[vaga1], bloco_da_vaga[vaga2]
+        bloco_da_vaga[vaga_vencedor] = bloco
+        if vaga_perdedor is not None:
+            bloco_da_vaga[vaga_perdedor] = bloco
+
+    vaga_cima, vaga_baixo = final
+    bloco = unir(vaga_cima, vaga_baixo)
+    cima = bloco.times[:, bloco.vagas.index(vaga_cima)]
+    baixo = bloco.times[:, bloco.vagas.index(vaga_baixo)]
+    p_cima = tabela[cima, baixo]
+    total = len(chave)
+    final_cima = np.bincount(cima, weights=bloco.prob, minlength=total)
+    final_baixo = np.bincount(baixo, weights=bloco.prob, minlength=total)
+    campeao = np.bincount(cima, weights=bloco.prob * p_cima, minlength=total)
+    campeao += np.bincount(baixo, weights=bloco.prob * (1.0 - p_cima), minlength=total)
+    for indice, time in enumerate(chave):
+        odds[time]["final"] = float(final_cima[indice] + final_baixo[indice])
+        odds[time]["campeao"] = float(campeao[indice])
+    return odds
@@ -0,0 +1,264 @@
+"""Lotes que param sozinhos quando a precisão pedida é atingida.
+
+`simular_partidas_em_lote_auto(n=...)` e `simular_torneios_em_lote(n=...)`
+pedem o n de antemão, e na dúvida todo mundo pedia 100 mil. Só que a
+precisão de uma proporção estimada depende dela mesma: num confronto
+desequilibrado (p perto de 0 ou 1), poucos milhares de partidas já dão
+±0,5%, e o resto do lote era desperdício.
+
+Aqui quem chama dá a meia-largura desejada do intervalo de confiança
+(`precisao=0.005` para ±0,5%) e o lote roda em blocos até todas as
+estimativas acompanhadas atingirem a meta, ou até `n_max`:
+
+- partidas: a chance de vitória de cada time;
+- torneios: a chance de título de cada time.
+
+Os intervalos são de Wilson, que não degeneram quando p fica perto de 0 ou
+de 1 (o caso que mais interessa aqui). O resultado traz os intervalos
+atingidos, quantas simulações foram feitas e se a meta foi cumprida.
+
+Os blocos usam o mesmo código dos lotes normais. Com `semente`, cada bloco
+recebe uma semente derivada dela (sementes_das_fatias), então o lote se
+repete igual — inclusive o ponto em que parou.
+"""
+
+import math
+from statistics import NormalDist
+from typing import Any, Dict, List, Optional, Tuple
+import numpy as np
+from agregacao_lote import AgregadorLote
+from contexto_simulacao import ContextoSimulacao, CONTEXTO_GLOBAL
+from funcoes_simulacao_deepseek import (
+    ModoJogo,
+    _somar_lote,
+    _tabela_kd,
+    simular_torneios_em_lote,
+)
+from saida_simulacao import Saida, SAIDA_NULA
+from simulacao_paralela import sementes_das_fatias
+from torneio_vetorizado import ranking_por_posicao_media
+
+# (proporção estimada, limite inferior, limite superior)
+Intervalo = Tuple[float, float, float]
+
+
+def intervalo_wilson(sucessos: int, n: int, confianca: float = 0.95) -> Intervalo:
+    """Intervalo de Wilson para uma proporção (sucessos em n tentativas)."""
+    if n < 1:
+        return 0.0, 0.0, 1.0
+    z = NormalDist().inv_cdf((1 + confianca) / 2)
+    p = sucessos / n
+    denominador = 1 + z * z / n
+    centro = (p + z * z / (2 * n)) / denominador
+    meia = z * math.sqrt(p * (1 - p) / n + z * z / (4 * n * n)) / denominador
+    return p, max(0.0, centro - meia), min(1.0, centro + meia)
+
+
+def _atingiu(intervalos: Dict[str, Intervalo], precisao: float) -> bool:
+    return all((alto - baixo) / 2 <= precisao for _, baixo, alto in intervalos.values())
+
+
+def _semente_do_bloco(semente: Optional[int], indice: int) -> Optional[int]:
+    if semente is None:
+        return None
+    # SeedSequence.spawn é prefixo-estável: o bloco k tem sempre a mesma semente
+    return sementes_das_fatias(semente, indice + 1)[indice]
+
+
+def _validar(precisao: float, bloco: int, n_max: int) -> None:
+    if precisao <= 0:
+        raise ValueError("precisao deve ser positiva")
+    if bloco < 1 or n_max < 1:
+        raise ValueError("bloco e n_max devem ser pelo menos 1")
+
+
+def simular_partidas_ate_precisao(
+    time1: str,
+    time2: str,
+    precisao: float = 0.005,
+    confianca: float = 0.95,
+    bloco: int = 1000,
+    n_max: int = 100_000,
+    modo: ModoJogo = "auto",
+    saida: Saida = SAIDA_NULA,
+    workers: Optional[int] = None,
+    semente: Optional[int] = None,
+    contexto: ContextoSimulacao = CONTEXTO_GLOBAL,
+    guardar_partidas: bool = False,
+    agregador: Optional[AgregadorLote] = None,
+) -> Dict[str, Any]:
+    """Joga time1 x time2 em blocos até a chance de vitória ter ±`precisao`.
+
+    Returns:
+        {"n": partidas jogadas, "atingiu": bool, "intervalos": {time:
+        (p, baixo, alto)}, "vitorias", "kd_df" (como no lote normal),
+        "partidas" (só com `guardar_partidas`), "agregador"}.
+    """
+    _validar(precisao, bloco, n_max)
+    if agregador is None:
+        agregador = AgregadorLote()
+    if semente is not None and workers is None:
+        contexto = contexto.com_semente(semente)
+
+    partidas: List = []
+    indice = 0
+    while True:
+        quantidade = min(bloco, n_max - agregador.partidas)
+        partidas.extend(
+            _somar_lote(
+                time1,
+                time2,
+                quantidade,
+                modo,
+                saida,
+                workers,
+                _semente_do_bloco(semente, indice),
+                contexto,
+                guardar_partidas,
+                agregador,
+            )
+        )
+        indice += 1
+        intervalos = {
+            time: intervalo_wilson(
+                agregador.vitorias.get(time, 0), agregador.partidas, confianca
+            )
+            for time in (time1, time2)
+        }
+        atingiu = _atingiu(intervalos, precisao)
+        if atingiu or agregador.partidas >= n_max:
+            break
+
+    vitorias = {time1: 0, time2: 0}
+    vitorias.update(agregador.vitorias)
+    kd_df = _tabela_kd(
+        agregador.kills,
+        agregador.deaths,
+        agregador.times_jogador,
+        agregador.partidas,
+        agregador.erros_padrao(),
+    )
+
+    print("\n=== RESUMO DA SIMULAÇÃO ===")
+    print(
+        f"Partidas simuladas: {agregador.partidas} "
+        f"({'meta atingida' if atingiu else 'limite n_max atingido'})"
+    )
+    for time, (p, baixo, alto) in intervalos.items():
+        print(f"{time}: {p:.2%} [{baixo:.2%}, {alto:.2%}]")
+    print("\n📊 Média de K/D acumulado por jogador:")
+    print(kd_df)
+
+    return {
+        "n": agregador.partidas,
+        "atingiu": atingiu,
+        "intervalos": intervalos,
+        "vitorias": vitorias,
+        "kd_df": kd_df,
+        "partidas": partidas,
+        "agregador": agregador,
+    }
+
+
+def _juntar_estatisticas(total, parcial, n_total: int, n_parcial: int) -> None:
+    """Soma as estatísticas de um bloco de torneios às do lote (já com médias)."""
+    n = n_total + n_parcial
+    for time, dados in parcial.items():
+        if time not in total:
+            total[time] = dict(dados)
+            if "posicoes" in dados:
+                total[time]["posicoes"] = list(dados["posicoes"])
+            continue
+        soma = total[time]
+        for chave in ("campeao", "vice", "top4", "vitorias_total", "derrotas_total"):
+            soma[chave] += dados[chave]
+        if "posicoes" in soma:
+            soma["posicoes"].extend(dados["posicoes"])
+        soma["posicao_media"] = (
+            soma["posicao_media"] * n_total + dados["posicao_media"] * n_parcial
+        ) / n
+        soma["vitorias_media"] = soma["vitorias_total"] / n
+        soma["vitorias"] = soma["vitorias_total"]
+        soma["derrotas"] = soma["derrotas_total"]
+
+
+def simular_torneios_ate_precisao(
+    times,
+    simular_partida,
+    precisao: float = 0.005,
+    confianca: float = 0.95,
+    bloco: int = 200,
+    n_max: int = 100_000,
+    saida: Saida = SAIDA_NULA,
+    matriz=None,
+    rng=None,
+    workers: Optional[int] = None,
+    semente: Optional[int] = None,
+    contexto: ContextoSimulacao = CONTEXTO_GLOBAL,
+    guardar_partidas: bool = False,
+) -> Dict[str, Any]:
+    """Simula torneios em blocos até a chance de título de cada time ter
+    ±`precisao`.
+
+    Os parâmetros de simulação são os de `simular_torneios_em_lote` (com
+    `matriz`, os blocos rodam no modo vetorizado).
+
+    Returns:
+        O dicionário de `simular_torneios_em_lote` ("estatisticas",
+        "partidas" — só com `guardar_partidas` —, "ranking") mais "n",
+        "atingiu" e "intervalos" ({time: (p, baixo, alto)} do título).
+    """
+    _validar(precisao, bloco, n_max)
+    if semente is not None:
+        if matriz is not None and rng is None:
+            rng = np.random.default_rng(semente)
+        elif workers is None:
+            contexto = contexto.com_semente(semente)
+
+    estatisticas: Dict[str, Dict[str, Any]] = {}
+    partidas: List = []
+    n = 0
+    indice = 0
+    while True:
+        quantidade = min(bloco, n_max - n)
+        resultado = simular_torneios_em_lote(
+            times,
+            simular_partida,
+            quantidade,
+            saida=saida,
+            matriz=matriz,
+            rng=rng,
+            workers=workers,
+            semente=_semente_do_bloco(semente, indice),
+            contexto=contexto,
+        )
+        _juntar_estatisticas(estatisticas, resultado["estatisticas"], n, quantidade)
+        if guardar_partidas:
+            partidas.extend(resultado["partidas"])
+        n += quantidade
+        indice += 1
+        intervalos = {
+            time: intervalo_wilson(dados["campeao"], n, confianca)
+            for time, dados in estatisticas.items()
+        }
+        atingiu = _atingiu(intervalos, precisao)
+        if atingiu or n >= n_max:
+            break
+
+    ranking = (
+        ranking_por_posicao_media(estatisticas)
+        if matriz is not None
+        else resultado["ranking"]
+    )
+    saida.escrever(
+        f"\n🏆 {n} torneios simulados "
+        f"({'meta atingida' if atingiu else 'limite n_max atingido'})"
+    )
+    return {
+        "estatisticas": estatisticas,
+        "partidas": partidas,
+        "ranking": ranking,
+        "n": n,
+        "atingiu": atingiu,
+        "intervalos": intervalos,
+    }
@@ -0,0 +1,174 @@
+"""Comparação de cenários com redução de variância (CRN e antitéticos).
+
+Para decidir entre "time X com o jogador A" e "time X com o jogador B", a
+gente rodava dois lotes independentes e comparava as taxas de vitória. O
+efeito de trocar um jogador é pequeno (décimos do over médio), e o ruído de
+dois lotes independentes engolia a diferença: era preciso um n enorme para
+o intervalo da diferença não cruzar o zero.
+
+Aqui os dois cenários são simulados no motor vetorizado com o mesmo
+`FluxoComum` (motor_vetorizado.py): cada round de cada série usa os mesmos
+números aleatórios nos dois cenários, e os mapas de cada série também são
+os mesmos. As séries ficam pareadas e o intervalo é o da diferença pareada,
+cuja variância cai tanto quanto os resultados dos dois cenários são
+correlacionados — numa troca de jogador, quase totalmente.
+
+Para estimar um cenário só, `estimar_vitoria` usa pares antitéticos (u e
+1 - u): as duas séries do par tendem a errar para lados opostos, e a média
+do par varia menos que a de duas séries independentes.
+"""
+
+import math
+from statistics import NormalDist
+from typing import Any, Dict, Optional, Sequence, Tuple
+import numpy as np
+from motor_vetorizado import MAPAS, FluxoComum, simular_md3_vetorizado
+from registro_times import RegistroTimes, obter_registro
+
+# (estimativa, limite inferior, limite superior)
+Intervalo = Tuple[float, float, float]
+
+
+def _z(confianca: float) -> float:
+    return NormalDist().inv_cdf((1 + confianca) / 2)
+
+
+def _intervalo_media(valores: np.ndarray, confianca: float) -> Intervalo:
+    media = float(np.mean(valores))
+    if len(valores) < 2:
+        return media, media, media
+    meia = _z(confianca) * float(np.std(valores, ddof=1)) / math.sqrt(len(valores))
+    return media, media - meia, media + meia
+
+
+def diferenca_pareada(
+    a: Sequence[float], b: Sequence[float], confianca: float = 0.95
+) -> Intervalo:
+    """Média de a - b e o intervalo de confiança, com as amostras pareadas."""
+    a, b = np.asarray(a, dtype=np.float64), np.asarray(b, dtype=np.float64)
+    if a.shape != b.shape:
+        raise ValueError("As amostras pareadas devem ter o mesmo tamanho")
+    return _intervalo_media(a - b, confianca)
+
+
+def media_antitetica(valores: Sequence[float], confianca: float = 0.95) -> Intervalo:
+    """Média e intervalo de amostras em pares antitéticos (i, i + n/2)."""
+    valores = np.asarray(valores, dtype=np.float64)
+    if len(valores) % 2:
+        raise ValueError("Amostras antitéticas vêm em pares (n par)")
+    metade = len(valores) // 2
+    return _intervalo_media((valores[:metade] + valores[metade:]) / 2, confianca)
+
+
+def _mapas_das_series(n: int, semente: int) -> np.ndarray:
+    """Três mapas distintos por série, os mesmos para qualquer cenário."""
+    rng = np.random.default_rng([semente, 2**32])
+    return np.argsort(rng.random((n, len(MAPAS))), axis=1)[:, :3]
+
+
+def _vitorias_md3(
+    over_time: float, over_adversario: float, mapas: np.ndarray, fluxo: FluxoComum
+) -> np.ndarray:
+    n = len(mapas)
+    mapas_time, mapas_adversario = simular_md3_vetorizado(
+        np.full(n, over_time), np.full(n, over_adversario), mapas, fluxo=fluxo
+    )
+    return (mapas_time > mapas_adversario).astype(np.float64)
+
+
+def comparar_overs(
+    over_a: float,
+    over_b: float,
+    over_adversario: float,
+    n: int = 10_000,
+    semente: Optional[int] = None,
+    confianca: float = 0.95,
+) -> Dict[str, Any]:
+    """Compara a chance de vitória (MD3) de dois overs contra o mesmo rival.
+
+    Os dois cenários jogam as mesmas n séries (mesmos mapas, mesmos
+    sorteios round a round).
+
+    Returns:
+        {"vitoria_a": p_a, "vitoria_b": p_b, "diferenca": (p_a - p_b,
+        baixo, alto), "correlacao": correlação entre as séries pareadas,
+        "n": n}.
+    """
+    if n < 2:
+        raise ValueError("n deve ser pelo menos 2")
+    fluxo = FluxoComum(semente)
+    mapas = _mapas_das_series(n, fluxo.semente)
+    a = _vitorias_md3(over_a, over_adversario, mapas, fluxo)
+    b = _vitorias_md3(over_b, over_adversario, mapas, fluxo)
+    correlacao = float(np.corrcoef(a, b)[0, 1]) if a.std() > 0 and b.std() > 0 else 1.0
+    return {
+        "vitoria_a": float(a.mean()),
+        "vitoria_b": float(b.mean()),
+        "diferenca": diferenca_pareada(a, b, confianca),
+        "correlacao": correlacao,
+        "n": n,
+    }
+
+
+def over_com_substituicao(
+    time: str,
+    sai: str,
+    over_entra: float,
+    registro: Optional[RegistroTimes] = None,
+) -> float:
+    """Over médio do time com o jogador `sai` trocado por um de `over_entra`."""
+    registro = registro if registro is not None else obter_registro()
+    overs = [
+        over_entra if nick.lower() == sai.lower() else over
+        for nick, _, over in registro.elenco(time)
+    ]
+    if not any(nick.lower() == sai.lower() for nick, _, _ in registro.elenco(time)):
+        raise ValueError(f"Jogador '{sai}' não está no elenco de '{time}'")
+    return sum(overs) / len(overs)
+
+
+def comparar_escalacoes(
+    time: str,
+    adversario: str,
+    sai: str,
+    over_entra: float,
+    n: int = 10_000,
+    semente: Optional[int] = None,
+    confianca: float = 0.95,
+    registro: Optional[RegistroTimes] = None,
+) -> Dict[str, Any]:
+    """Elenco atual (cenário A) contra o elenco com a troca (cenário B).
+
+    Mesmo retorno de `comparar_overs`; "diferenca" é A - B, então um valor
+    negativo significa que a troca melhora o time.
+    """
+    registro = registro if registro is not None else obter_registro()
+    return comparar_overs(
+        registro.over_medio(time),
+        over_com_substituicao(time, sai, over_entra, registro),
+        registro.over_medio(adversario),
+        n=n,
+        semente=semente,
+        confianca=confianca,
+    )
+
+
+def estimar_vitoria(
+    over_time: float,
+    over_adversario: float,
+    n: int = 10_000,
+    semente: Optional[int] = None,
+    antitetico: bool = True,
+    confianca: float = 0.95,
+) -> Intervalo:
+    """Chance de vitória numa MD3, com intervalo (antitético por padrão)."""
+    n += n % 2
+    fluxo = FluxoComum(semente, antitetico=antitetico)
+    # Metades repetidas: a série k e a k + n/2 jogam os mesmos mapas
+    mapas = _mapas_das_series(n // 2, fluxo.semente)
+    vitorias = _vitorias_md3(
+        over_time, over_adversario, np.concatenate([mapas, mapas]), fluxo
+    )
+    if antitetico:
+        return media_antitetica(vitorias, confianca)
+    return _intervalo_media(vitorias, confianca)
@@ -0,0 +1,191 @@
+"""Registro em memória de times e elencos.
+
+Antes, cada half de `jogar_half` chamava `calcular_over_medio` duas vezes —
+e cada chamada reabria e relia `jogadores.csv` inteiro com csv.DictReader.
+`jogar_partida`, `simular_partida_auto` e cada iteração de
+`simular_partidas_em_lote_auto` ainda faziam um `pd.read_csv` novo e
+reliam `times.csv`. Em simulações em lote, a leitura de arquivo tomava a
+maior parte do tempo, não a simulação em si.
+
+Agora os dois CSVs são lidos uma única vez por sessão e servidos da
+memória (over médio, lista de jogadores e configuração visual, todos com
+lookup O(1) por nome de time). O cache só é invalidado quando o arquivo
+muda no disco — a assinatura usada é (mtime em ns, tamanho), conferida com
+um `os.stat` barato a cada consulta, então editar o CSV no meio da sessão
+continua funcionando sem reiniciar o programa.
+"""
+
+import csv
+import os
+from typing import Any, Dict, List, Optional, Tuple
+from colorama import Fore
+from config import TIMES_CSV, JOGADORES_CSV
+from estatisticas_jogadores import EstatisticasElenco, VisaoEstatisticas
+
+# (nick, função, over original do CSV)
+LinhaJogador = Tuple[str, str, float]
+
+
+def _assinatura(caminho: str) -> Tuple[int, int]:
+    """Identifica a versão do arquivo no disco sem precisar lê-lo."""
+    info = os.stat(caminho)
+    return info.st_mtime_ns, info.st_size
+
+
+def montar_jogador(
+    nome: str,
+    time: str,
+    over: float,
+    role: str,
+    estatisticas: Optional[VisaoEstatisticas] = None,
+) -> Dict[str, Any]:
+    """Monta o dicionário de jogador usado pela simulação.
+
+    `over` é o valor original do CSV — aqui ele é normalizado (um jogador
+    com over 80 fica com 1.0), exatamente como `obter_jogadores` sempre fez.
+    Cada chamada devolve um dicionário novo: as estatísticas são mutáveis e
+    não podem ser compartilhadas entre partidas.
+
+    `estatisticas` é a visão do jogador no `EstatisticasElenco` do time (ver
+    `RegistroTimes.jogadores`); sem ela, o jogador ganha um elenco só seu.
+    """
+    if estatisticas is None:
+        estatisticas = EstatisticasElenco(1).visao(0)
+    return {
+        "nome": nome,
+        "time": time,
+        "over": float(over) / 80.0,
+        "role": role,
+        "kills": 0,
+        "deaths": 0,
+        # Já inicializada: registrar_kill/registrar_death esperam
+        # "estatisticas"->"total" preenchido.
+        "estatisticas": estatisticas,
+    }
+
+
+class RegistroTimes:
+    """Times e elencos carregados uma vez e servidos da memória.
+
+    Os nomes de time são normalizados (strip + minúsculo) dos dois lados —
+    no CSV e na consulta —, então "Furia" no arquivo e "furia" no menu
+    resolvem para o mesmo time.
+    """
+
+    def __init__(
+        self, arquivo_times: str = TIMES_CSV, arquivo_jogadores: str = JOGADORES_CSV
+    ):
+        self.arquivo_times = os.path.abspath(arquivo_times)
+        self.arquivo_jogadores = os.path.abspath(arquivo_jogadores)
+
+        self._assinatura_times: Optional[Tuple[int, int]] = None
+        self._assinatura_jogadores: Optional[Tuple[int, int]] = None
+
+        self._config: Dict[str, Dict[str, str]] = {}
+        self._elencos: Dict[str, Tuple[LinhaJogador, ...]] = {}
+        self._overs: Dict[str, float] = {}
+
+    # ---------- carregamento ----------
+    def _atualizar_jogadores(self) -> None:
+        assinatura = _assinatura(self.arquivo_jogadores)
+        if assinatura == self._assinatura_jogadores:
+            return
+
+        elencos: Dict[str, List[LinhaJogador]] = {}
+        with open(self.arquivo_jogadores, "r", newline="", encoding="utf-8") as f:
+            for linha in csv.DictReader(f):
+                time = linha["time"].strip().lower()
+                elencos.setdefault(time, []).append(
+                    (linha["nick"], linha["funcao"], float(linha["over"]))
+                )
+
+        self._elencos = {time: tuple(linhas) for time, linhas in elencos.items()}
+        self._overs = {
+            time: sum(over for _, _, over in linhas) / len(linhas)
+            for time, linhas in self._elencos.items()
+        }
+        self._assinatura_jogadores = assinatura
+
+    def _atualizar_times(self) -> None:
+        assinatura = _assinatura(self.arquivo_times)
+        if assinatura == self._assinatura_times:
+            return
+
+        # Sem cabeçalho, colunas fixas: nome,emoji,cor (ver carregar_times_config).
+        config = {}
+        with open(self.arquivo_times, newline="", encoding="utf-8") as f:
+            for linha in csv.reader(f):
+                if not linha or not linha[0].strip():
+                    continue
+                nome, emoji, cor_nome = (linha + ["", ""])[:3]
+                cor = getattr(Fore, cor_nome.strip().upper(), "")
+                config[nome.strip().lower()] = {"emoji": emoji.strip(), "cor": cor}
+
+        self._config = config
+        self._assinatura_times = assinatura
+
+    # ---------- consultas ----------
+    def over_medio(self, time: str) -> float:
+        self._atualizar_jogadores()
+        try:
+            return self._overs[time.strip().lower()]
+        except KeyError:
+            raise ValueError(f"Nenhum jogador encontrado para o time '{time}'")
+
+    def overs_medios(self) -> Dict[str, float]:
+        self._atualizar_jogadores()
+        return dict(self._overs)
+
+    def elenco(self, time: str) -> Tuple[LinhaJogador, ...]:
+        """Linhas cruas (nick, função, over) do elenco, sem copiar nada."""
+        self._atualizar_jogadores()
+        try:
+            return self._elencos[time.strip().lower()]
+        except KeyError:
+            raise ValueError(f"Time '{time.lower()}' não encontrado no CSV.")
+
+    def jogadores(self, time: str) -> List[Dict[str, Any]]:
+        """Lista nova de jogadores do time, no formato de `obter_jogadores`.
+
+        Os jogadores da lista dividem um `EstatisticasElenco` novo, com o id
+        de cada um sendo a posição no elenco.
+        """
+        nome_time = time.strip().lower()
+        elenco = self.elenco(time)
+        estatisticas = EstatisticasElenco(len(elenco))
+        return [
+            montar_jogador(nick, nome_time, over, funcao, estatisticas.visao(i))
+            for i, (nick, funcao, over) in enumerate(elenco)
+        ]
+
+    def times_config(self) -> Dict[str, Dict[str, str]]:
+        self._atualizar_times()
+        return self._config
+
+
+_registros: Dict[Tuple[str, str], RegistroTimes] = {}
+
+
+def obter_registro(
+    arquivo_times: str = TIMES_CSV, arquivo_jogadores: str = JOGADORES_CSV
+) -> RegistroTimes:
+    """Devolve o registro compartilhado da sessão para esse par de arquivos.
+
+    A chave usa caminho absoluto, então trocar de diretório (como fazem os
+    testes de integração) nunca reaproveita o cache de outro `times.csv`.
+    """
+    chave = (os.path.abspath(arquivo_times), os.path.abspath(arquivo_jogadores))
+    registro = _registros.get(chave)
+    if registro is None:
+        registro = _registros[chave] = RegistroTimes(*chave)
+    return registro
+
+
+def instalar_registro(registro: RegistroTimes) -> None:
+    """Usa um registro já carregado como o registro da sessão.
+
+    Feito para processos filhos: o registro vem pronto do processo pai (por
+    pickle) e, como a assinatura dos arquivos vem junto, o CSV não é relido
+    enquanto não mudar no disco.
+    """
+    _registros[(registro.arquivo_times, registro.arquivo_jogadores)] = registro
@@ -0,0 +1,80 @@
+"""Destinos de saída (sinks) para a narração da simulação.
+
+Todo round de `jogar_half` imprime uma linha, e `jogar_mapa`,
+`jogar_partida` e as funções de estatísticas imprimem tabelas coloridas —
+inclusive dentro de `simular_partidas_em_lote_auto` e
+`simular_torneios_em_lote`, onde ninguém lê nada disso e o terminal vira o
+gargalo da simulação.
+
+Agora as funções de simulação recebem um parâmetro `saida` e escrevem nele
+em vez de chamar `print` diretamente:
+
+- SaidaTerminal: o comportamento de sempre (imprime na hora). Com
+  `buffer_linhas > 0`, acumula as linhas e escreve em blocos;
+- SaidaNula: descarta tudo — padrão das simulações em lote e de torneio;
+- SaidaLog: manda a narração para o logging (simulador.log), sem as
+  cores ANSI do colorama.
+"""
+
+import logging
+import re
+import sys
+from abc import ABC, abstractmethod
+from typing import List, Optional
+
+_CODIGO_ANSI = re.compile(r"\x1b\[[0-9;]*m")
+
+
+class Saida(ABC):
+    """Interface comum: `escrever` recebe uma linha pronta (como o print)."""
+
+    @abstractmethod
+    def escrever(self, texto: str = "") -> None:
+        """Escreve uma linha de narração."""
+
+    def descarregar(self) -> None:
+        """Garante que tudo que foi escrito já saiu (ex.: antes de um input())."""
+
+
+class SaidaNula(Saida):
+    def escrever(self, texto: str = "") -> None:
+        pass
+
+
+class SaidaTerminal(Saida):
+    def __init__(self, buffer_linhas: int = 0):
+        self.buffer_linhas = buffer_linhas
+        self._pendentes: List[str] = []
+
+    def escrever(self, texto: str = "") -> None:
+        if self.buffer_linhas <= 0:
+            print(texto)
+            return
+        self._pendentes.append(texto)
+        if len(self._pendentes) >= self.buffer_linhas:
+            self.descarregar()
+
+    def descarregar(self) -> None:
+        if self._pendentes:
+            # sys.stdout é resolvido na hora (e não guardado no __init__)
+            # para respeitar redirecionamentos, como o redirect_stdout dos testes.
+            sys.stdout.write("\n".join(self._pendentes) + "\n")
+            self._pendentes.clear()
+
+
+class SaidaLog(Saida):
+    def __init__(
+        self, logger: Optional[logging.Logger] = None, nivel: int = logging.INFO
+    ):
+        self.logger = logger or logging.getLogger("simulador.narracao")
+        self.nivel = nivel
+
+    def escrever(self, texto: str = "") -> None:
+        texto = _CODIGO_ANSI.sub("", texto).strip("\n")
+        if texto:
+            self.logger.log(self.nivel, texto)
+
+
+# Instâncias padrão (sem estado), usadas como valor default dos parâmetros.
+SAIDA_NULA = SaidaNula()
+SAIDA_TERMINAL = SaidaTerminal()
@@ -0,0 +1,263 @@
+"""E se...? Quanto as chances mudam com um over, ROLE_WEIGHTS ou CONFIG_COMBATE.
+
+Para responder "quanto sobe a chance de título se o AWPer for de 88 para
+92?" era preciso editar jogadores.csv e rodar `simular_torneios_em_lote` de
+novo. `analisar_sensibilidade` recebe o cenário base (times e formato) e as
+perturbações, e devolve as chances exatas (odds_exatas.py) antes e depois e
+a diferença por time. Nada global é alterado: os CSVs, CONFIG_COMBATE e
+ROLE_WEIGHTS ficam como estão, e as perturbações só existem na chamada.
+
+O que cada perturbação afeta no modelo:
+
+- over de um jogador: muda o over médio do time, que é tudo de que o
+  resultado de um round depende (modelo_round.py). A matriz base (a de
+  `construir_matriz_confronto`, com cache em disco) é reaproveitada e só
+  os confrontos dos times com over médio alterado são recalculados;
+- ROLE_WEIGHTS e os pesos de CONFIG_COMBATE (EXPOENTE_OVER,
+  MULTIPLICADOR_OVER, BASE_PESO): só decidem *quem* mata e morre dentro do
+  time, não quem vence o round. As chances de torneio não mudam; o efeito
+  aparece na participação esperada de cada jogador nas kills e deaths do
+  time;
+- CHANCE_4_A_5_KILLS e CHANCE_PERDEDOR_MATA: mudam quantas kills saem por
+  round (vencedor e perdedor), também sem mexer em quem vence.
+"""
+
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from gerador_kills_deaths import CONFIG_COMBATE, ROLE_WEIGHTS, _pesos_combate
+from matriz_confronto import (
+    MatrizConfronto,
+    calcular_pares,
+    construir_matriz_confronto,
+)
+from odds_exatas import odds_double_elimination, odds_fase_grupos, odds_mata_mata
+from registro_times import RegistroTimes, montar_jogador, obter_registro
+
+FORMATOS = ("mata_mata", "grupos", "double_elimination")
+
+
+def _com_substituicoes(base: Dict, alteracoes: Optional[Dict], nome: str) -> Dict:
+    """Cópia de `base` com as chaves de `alteracoes` trocadas (todas já
+    existentes em `base`)."""
+    copia = dict(base)
+    for chave, valor in (alteracoes or {}).items():
+        if chave not in base:
+            raise ValueError(f"'{chave}' não existe em {nome}")
+        copia[chave] = valor
+    return copia
+
+
+def _pesos_funcao(alteracoes: Optional[Dict[str, Dict[str, float]]]) -> Dict:
+    pesos = {tipo: dict(funcoes) for tipo, funcoes in ROLE_WEIGHTS.items()}
+    for tipo, funcoes in (alteracoes or {}).items():
+        if tipo not in pesos:
+            raise ValueError(f"'{tipo}' não existe em ROLE_WEIGHTS")
+        pesos[tipo].update(funcoes)
+    return pesos
+
+
+def _elencos_perturbados(
+    times: Sequence[str], overs: Dict[str, float], registro: RegistroTimes
+) -> Dict[str, List[Tuple[str, str, float]]]:
+    """Elenco (nick, função, over) de cada time com os overs novos."""
+    pendentes = {nick.lower(): over for nick, over in overs.items()}
+    elencos = {}
+    for time in times:
+        elenco = []
+        for nick, funcao, over in registro.elenco(time):
+            elenco.append((nick, funcao, pendentes.pop(nick.lower(), over)))
+        elencos[time] = elenco
+    if pendentes:
+        raise ValueError(
+            f"Jogadores fora dos times do cenário: {', '.join(sorted(pendentes))}"
+        )
+    return elencos
+
+
+def matriz_perturbada(
+    base: MatrizConfronto,
+    overs_medios: Dict[str, float],
+    processos: Optional[int] = None,
+    registro: Optional[RegistroTimes] = None,
+) -> Tuple[MatrizConfronto, List[Tuple[str, str]]]:
+    """Copia a matriz base recalculando só os confrontos dos times em
+    `overs_medios` ({time: over médio novo}).
+
+    Returns:
+        (matriz nova, pares recalculados).
+    """
+    registro = registro if registro is not None else obter_registro()
+    pendentes = [
+        (
+            t1,
+            t2,
+            overs_medios.get(t1, registro.over_medio(t1)),
+            overs_medios.get(t2, registro.over_medio(t2)),
+        )
+        for t1, t2 in base.probabilidades
+        if t1 in overs_medios or t2 in overs_medios
+    ]
+    probabilidades = dict(base.probabilidades)
+    for t1, t2, p in calcular_pares(pendentes, processos):
+        probabilidades[(t1, t2)] = p
+    return MatrizConfronto(base.times, probabilidades), [
+        (t1, t2) for t1, t2, _, _ in pendentes
+    ]
+
+
+def _odds(formato: str, times, grupos, num_classificados, ida_e_volta, matriz):
+    if formato == "mata_mata":
+        return {
+            time: {"avancos": avancos, "campeao": avancos[-1]}
+            for time, avancos in odds_mata_mata(times, matriz).items()
+        }
+    if formato == "grupos":
+        return odds_fase_grupos(grupos, matriz, num_classificados, ida_e_volta)
+    return odds_double_elimination(times, matriz)
+
+
+def _diferenca(cenario, base):
+    """cenário - base, campo a campo (números, listas e dicionários)."""
+    if isinstance(base, dict):
+        return {chave: _diferenca(cenario[chave], base[chave]) for chave in base}
+    if isinstance(base, list):
+        return [_diferenca(c, b) for c, b in zip(cenario, base)]
+    return cenario - base
+
+
+def kills_por_round(config: Dict[str, float]) -> Dict[str, float]:
+    """Kills esperadas por round do time vencedor e do perdedor, pelas
+    mesmas regras de `simular_kills_do_round`."""
+    chance_4_a_5 = config["CHANCE_4_A_5_KILLS"]
+    chance_perdedor = config["CHANCE_PERDEDOR_MATA"]
+    vencedor = {4: chance_4_a_5 / 2, 5: chance_4_a_5 / 2}
+    for kills in (1, 2, 3):
+        vencedor[kills] = (1 - chance_4_a_5) / 3
+    # Perdedor: 0..k-1 com chance_perdedor, senão k..5 (uniformes)
+    perdedor = sum(
+        p
+        * (chance_perdedor * (kills - 1) / 2 + (1 - chance_perdedor) * (kills + 5) / 2)
+        for kills, p in vencedor.items()
+    )
+    return {
+        "vencedor": sum(kills * p for kills, p in vencedor.items()),
+        "perdedor": perdedor,
+    }
+
+
+def _participacoes(
+    elencos: Dict[str, List[Tuple[str, str, float]]],
+    config: Dict[str, float],
+    pesos_funcao: Dict,
+) -> Dict[str, Dict[str, Any]]:
+    """Fração esperada das kills e deaths do time que cabe a cada jogador."""
+    participacoes = {}
+    for time, elenco in elencos.items():
+        # Mesmo dicionário da simulação: o over entra normalizado (over / 80)
+        jogadores = [
+            montar_jogador(nick, time, over, funcao) for nick, funcao, over in elenco
+        ]
+        pesos = {
+            tipo: _pesos_combate(jogadores, tipo, config, pesos_funcao)
+            for tipo in ("kill", "death")
+        }
+        for i, (nick, _, _) in enumerate(elenco):
+            participacoes[nick] = {
+                "time": time,
+                "kills": pesos["kill"][i] / sum(pesos["kill"]),
+                "deaths": pesos["death"][i] / sum(pesos["death"]),
+            }
+    return participacoes
+
+
+def analisar_sensibilidade(
+    times: Optional[Sequence[str]] = None,
+    overs: Optional[Dict[str, float]] = None,
+    role_weights: Optional[Dict[str, Dict[str, float]]] = None,
+    config_combate: Optional[Dict[str, float]] = None,
+    formato: str = "mata_mata",
+    grupos: Optional[Sequence[Sequence[str]]] = None,
+    num_classificados: int = 2,
+    ida_e_volta: bool = False,
+    matriz: Optional[MatrizConfronto] = None,
+    registro: Optional[RegistroTimes] = None,
+    processos: Optional[int] = None,
+) -> Dict[str, Any]:
+    """Chances do cenário base e do cenário perturbado, e a diferença.
+
+    Args:
+        times: Chave do mata-mata ou do double elimination, na ordem em que
+            os times se enfrentam (como em odds_exatas.py). No formato
+            "grupos" vem de `grupos`.
+        overs: {nick: over novo} de jogadores dos times do cenário.
+        role_weights: Pesos de função a trocar, ex.: {"kill": {"AWP": 1.2}}.
+        config_combate: Entradas de CONFIG_COMBATE a trocar.
+        formato: "mata_mata", "grupos" ou "double_elimination".
+        matriz: Matriz base já calculada (padrão: `construir_matriz_confronto`
+            dos times do cenário, com o cache em disco e os CSVs de
+            `registro`).
+        registro: Registro de times do cenário (padrão: o da sessão).
+
+    Returns:
+        {"base": odds, "cenario": odds, "deltas": cenário - base por time
+        (mesmo formato das odds), "recalculados": [(time1, time2)],
+        "jogadores": {nick: {"time", "kills", "deaths"}} (participação
+        esperada no cenário), "deltas_jogadores": {nick: {"kills",
+        "deaths"}}, "kills_por_round": {"base": ..., "cenario": ...}}.
+    """
+    if formato not in FORMATOS:
+        raise ValueError(f"Formato deve ser um de {', '.join(FORMATOS)}")
+    if formato == "grupos":
+        if not grupos:
+            raise ValueError("O formato 'grupos' precisa de `grupos`")
+        grupos = [[t.strip().lower() for t in grupo] for grupo in grupos]
+        times = [t for grupo in grupos for t in grupo]
+    elif not times:
+        raise ValueError("O cenário precisa de `times`")
+    else:
+        times = [t.strip().lower() for t in times]
+
+    registro = registro if registro is not None else obter_registro()
+    config = _com_substituicoes(CONFIG_COMBATE, config_combate, "CONFIG_COMBATE")
+    pesos_funcao = _pesos_funcao(role_weights)
+    base_elencos = {time: list(registro.elenco(time)) for time in times}
+    elencos = _elencos_perturbados(times, overs or {}, registro)
+
+    if matriz is None:
+        # A matriz base sai dos mesmos CSVs do registro do cenário
+        matriz = construir_matriz_confronto(
+            times,
+            processos=processos,
+            arquivo_times=registro.arquivo_times,
+            arquivo_jogadores=registro.arquivo_jogadores,
+        )
+    overs_medios = {}
+    for time, elenco in elencos.items():
+        over_medio = sum(over for _, _, over in elenco) / len(elenco)
+        if over_medio != registro.over_medio(time):
+            overs_medios[time] = over_medio
+    nova, recalculados = matriz_perturbada(matriz, overs_medios, processos, registro)
+
+    argumentos = (formato, times, grupos, num_classificados, ida_e_volta)
+    base = _odds(*argumentos, matriz)
+    cenario = _odds(*argumentos, nova)
+
+    participacao_base = _participacoes(base_elencos, CONFIG_COMBATE, ROLE_WEIGHTS)
+    participacao = _participacoes(elencos, config, pesos_funcao)
+    return {
+        "base": base,
+        "cenario": cenario,
+        "deltas": _diferenca(cenario, base),
+        "recalculados": recalculados,
+        "jogadores": participacao,
+        "deltas_jogadores": {
+            nick: {
+                campo: dados[campo] - participacao_base[nick][campo]
+                for campo in ("kills", "deaths")
+            }
+            for nick, dados in participacao.items()
+        },
+        "kills_por_round": {
+            "base": kills_por_round(CONFIG_COMBATE),
+            "cenario": kills_por_round(config),
+        },
+    }
@@ -0,0 +1,257 @@
+"""Execução em paralelo de lotes de simulação (pool de processos).
+
+As partidas de `simular_partidas_em_lote_auto` e os torneios de
+`simular_torneios_em_lote` são independentes entre si, mas rodavam um atrás
+do outro num núcleo só. Aqui o lote é dividido em fatias de tamanho fixo
+(PARTIDAS_POR_FATIA, TORNEIOS_POR_FATIA), e cada fatia:
+
+- tem a sua semente, derivada da semente do lote e do índice da fatia
+  (`np.random.SeedSequence.spawn`), então o resultado depende só da semente
+  e de n — não de quantos processos rodaram nem de qual pegou cada fatia;
+- joga com o mesmo código do lote sequencial. Nas partidas, devolve só um
+  `AgregadorLote` (somas, médias e variâncias), nunca os
+  `ResultadoPartida`; nos torneios, devolve as estatísticas parciais e as
+  partidas, para montar exatamente a estrutura de `simular_torneios_em_lote`;
+- é somada às outras na ordem das fatias, o que deixa a junção
+  determinística;
+- joga com um índice de mapas próprio (indice_mapas.py), devolvido junto e
+  somado ao índice da sessão do processo pai.
+
+Os ids de partida (`ContadorPartidas`) também são por fatia: a fatia k usa
+a faixa [primeiro + k * IDS_POR_FATIA, primeiro + (k + 1) * IDS_POR_FATIA),
+onde `primeiro` é o próximo id do processo pai. Não há colisão entre fatias
+e os ids não dependem de qual processo jogou cada fatia. No fim, o contador
+do pai avança para depois da última faixa.
+
+O registro de times (registro_times.py) é carregado uma vez no processo pai
+e enviado a cada processo na inicialização do pool, em vez de cada processo
+(ou cada partida) reler os CSVs.
+
+Cada fatia de partidas tem o seu `ContextoSimulacao` (contexto_simulacao.py),
+com um `random.Random` próprio. Já a função de partida dos torneios é
+opaca e usa o `random` global: a fatia de torneios o semeia no começo. Nos
+processos filhos isso não afeta ninguém, e quando a fatia roda no próprio
+processo (workers=1) o estado do `random` é restaurado no fim.
+"""
+
+import random
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+import numpy as np
+from agregacao_lote import AgregadorLote
+from contexto_simulacao import ContextoSimulacao
+from indice_mapas import IndiceMapas, indice_isolado, obter_indice
+from funcoes_simulacao_deepseek import (
+    ContadorPartidas,
+    ModoJogo,
+    _estatisticas_torneio_vazias,
+    _jogar_partida_do_lote,
+    _somar_torneio,
+    simular_torneio_mata_mata,
+)
+from registro_times import RegistroTimes, instalar_registro, obter_registro
+from saida_simulacao import SAIDA_NULA
+
+# Partidas por fatia: grande o bastante para o custo de despachar a tarefa
+# sumir, pequeno o bastante para dividir bem entre muitos núcleos.
+PARTIDAS_POR_FATIA = 500
+TORNEIOS_POR_FATIA = 50
+
+# Ids de partida reservados para cada fatia (a fatia é o prefixo do id).
+IDS_POR_FATIA = 1_000_000
+
+# (time1, time2, quantidade, semente, modo, histogramas)
+TarefaPartidas = Tuple[str, str, int, int, str, bool]
+# (índice da fatia, times, simular_partida, quantidade, semente, primeiro id)
+TarefaTorneios = Tuple[int, List[str], Callable, int, int, int]
+
+
+def sementes_das_fatias(semente: Optional[int], total_fatias: int) -> List[int]:
+    """Uma semente independente por fatia, derivada da semente do lote."""
+    filhas = np.random.SeedSequence(semente).spawn(total_fatias)
+    return [
+        int.from_bytes(filha.generate_state(4).tobytes(), "little") for filha in filhas
+    ]
+
+
+def tamanhos_das_fatias(n: int, por_fatia: int) -> List[int]:
+    """Divide n em fatias de `por_fatia` (a última pode ser menor)."""
+    if n < 1:
+        raise ValueError("n deve ser pelo menos 1")
+    return [min(por_fatia, n - inicio) for inicio in range(0, n, por_fatia)]
+
+
+def _iniciar_processo(registro: RegistroTimes) -> None:
+    instalar_registro(registro)
+
+
+def _registro_carregado() -> RegistroTimes:
+    registro = obter_registro()
+    # Força a leitura dos CSVs aqui, para o pickle já levar os elencos.
+    registro.overs_medios()
+    registro.times_config()
+    return registro
+
+
+@contextmanager
+def _random_semeado(semente: int):
+    """Semeia o `random` global durante a fatia e devolve o estado anterior."""
+    estado = random.getstate()
+    random.seed(semente)
+    try:
+        yield
+    finally:
+        random.setstate(estado)
+
+
+def _jogar_fatia_partidas(
+    tarefa: TarefaPartidas,
+) -> Tuple[AgregadorLote, IndiceMapas]:
+    """Joga uma fatia do lote e devolve só o agregador e o índice de mapas."""
+    time1, time2, quantidade, semente, modo, histogramas = tarefa
+    indice = IndiceMapas()
+    contexto = ContextoSimulacao(semente=semente, indice=indice)
+    agregador = AgregadorLote(histogramas=histogramas)
+    for _ in range(quantidade):
+        kills: Dict[str, int] = defaultdict(int)
+        deaths: Dict[str, int] = defaultdict(int)
+        times_jogador: Dict[str, str] = {}
+        _, vencedor = _jogar_partida_do_lote(
+            time1, time2, modo, SAIDA_NULA, kills, deaths, times_jogador, contexto
+        )
+        agregador.registrar_partida(kills, deaths, times_jogador, vencedor)
+    return agregador, indice
+
+
+def _executar(funcao, tarefas: list, workers: int) -> list:
+    """Roda as tarefas (no processo atual se workers=1), na ordem recebida."""
+    if workers == 1:
+        return [funcao(tarefa) for tarefa in tarefas]
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_iniciar_processo,
+        initargs=(_registro_carregado(),),
+    ) as executor:
+        return list(executor.map(funcao, tarefas))
+
+
+def simular_partidas_paralelo(
+    time1: str,
+    time2: str,
+    n: int,
+    workers: Optional[int] = None,
+    semente: Optional[int] = None,
+    modo: ModoJogo = "auto",
+    por_fatia: int = PARTIDAS_POR_FATIA,
+    histogramas: bool = False,
+) -> dict:
+    """Joga n partidas time1 x time2 em fatias distribuídas entre processos.
+
+    Args:
+        workers: Número de processos (None: o padrão do ProcessPoolExecutor,
+            1: tudo no processo atual).
+        semente: Semente do lote. None sorteia uma nova.
+        histogramas: Se os agregadores guardam histogramas por partida.
+
+    Returns:
+        {"kills": {jogador: total}, "deaths": {jogador: total},
+        "times_jogador": {jogador: time}, "vitorias": {time: total},
+        "agregador": AgregadorLote com tudo isso e as variâncias}.
+    """
+    if workers is not None and workers < 1:
+        raise ValueError("workers deve ser pelo menos 1")
+
+    tamanhos = tamanhos_das_fatias(n, por_fatia)
+    tarefas = [
+        (time1, time2, quantidade, semente_fatia, modo, histogramas)
+        for quantidade, semente_fatia in zip(
+            tamanhos, sementes_das_fatias(semente, len(tamanhos))
+        )
+    ]
+
+    # Junção na ordem das fatias: o arredondamento das médias e variâncias
+    # também não depende do número de processos.
+    agregador = AgregadorLote(histogramas=histogramas)
+    for parcial, indice in _executar(_jogar_fatia_partidas, tarefas, workers):
+        agregador.juntar(parcial)
+        obter_indice().juntar(indice)
+    vitorias = {time1: 0, time2: 0}
+    vitorias.update(agregador.vitorias)
+    return {
+        "kills": dict(agregador.kills),
+        "deaths": dict(agregador.deaths),
+        "times_jogador": dict(agregador.times_jogador),
+        "vitorias": vitorias,
+        "agregador": agregador,
+    }
+
+
+def _jogar_fatia_torneios(tarefa: TarefaTorneios) -> tuple:
+    """Joga uma fatia de torneios, com ids de partida da faixa da fatia."""
+    indice, times, simular_partida, quantidade, semente, primeiro_id = tarefa
+    inicio_ids = primeiro_id + indice * IDS_POR_FATIA
+    ContadorPartidas._id = inicio_ids
+
+    estatisticas = _estatisticas_torneio_vazias(times)
+    partidas = []
+    ranking: List[str] = []
+    with _random_semeado(semente), indice_isolado() as indice_mapas:
+        for _ in range(quantidade):
+            ranking, vitorias, derrotas, jogadas = simular_torneio_mata_mata(
+                times[:], simular_partida
+            )
+            partidas.extend(jogadas)
+            _somar_torneio(estatisticas, ranking, vitorias, derrotas)
+
+    if ContadorPartidas._id > inicio_ids + IDS_POR_FATIA:
+        raise RuntimeError(
+            f"A fatia {indice} passou de {IDS_POR_FATIA} partidas; "
+            "diminua TORNEIOS_POR_FATIA"
+        )
+    return estatisticas, partidas, ranking, indice_mapas
+
+
+def simular_torneios_paralelo(
+    times: Sequence[str],
+    simular_partida: Callable,
+    n: int,
+    workers: Optional[int] = None,
+    semente: Optional[int] = None,
+    por_fatia: int = TORNEIOS_POR_FATIA,
+) -> Tuple[Dict[str, Dict[str, Any]], list, List[str]]:
+    """Joga n torneios de mata-mata em fatias distribuídas entre processos.
+
+    Returns:
+        (estatisticas, partidas, ranking): as estatísticas somadas (ainda
+        sem as médias, calculadas por `simular_torneios_em_lote`), as
+        partidas de todas as fatias em ordem e o ranking do último torneio.
+    """
+    if workers is not None and workers < 1:
+        raise ValueError("workers deve ser pelo menos 1")
+
+    times = list(times)
+    tamanhos = tamanhos_das_fatias(n, por_fatia)
+    primeiro_id = ContadorPartidas._id
+    tarefas = [
+        (indice, times, simular_partida, quantidade, semente_fatia, primeiro_id)
+        for indice, (quantidade, semente_fatia) in enumerate(
+            zip(tamanhos, sementes_das_fatias(semente, len(tamanhos)))
+        )
+    ]
+
+    estatisticas = _estatisticas_torneio_vazias(times)
+    partidas = []
+    ranking: List[str] = []
+    for parcial, jogadas, ranking, indice in _executar(
+        _jogar_fatia_torneios, tarefas, workers
+    ):
+        partidas.extend(jogadas)
+        obter_indice().juntar(indice)
+        for time, valores in parcial.items():
+            for chave, valor in valores.items():
+                estatisticas[time][chave] += valor
+
+    ContadorPartidas._id = primeiro_id + len(tarefas) * IDS_POR_FATIA
+    return estatisticas, partidas, ranking
@@ -0,0 +1,102 @@
+"""Sorteio ponderado com tabela de alias (método de Walker/Vose).
+
+`simular_kills_do_round` sorteia quem morre e quem mata várias vezes por
+round. Antes, cada sorteio refazia o trabalho todo: `random.choices`
+remontava os pesos acumulados a cada kill, e `sorteio_sem_repeticao_com_pesos`
+copiava as listas, somava os pesos e percorria a lista inteira a cada
+escolha.
+
+Com a tabela de alias, o custo é pago uma vez na montagem (O(n)) e cada
+sorteio com reposição custa um número aleatório e duas consultas, O(1),
+qualquer que seja a distribuição dos pesos. Os pesos de kill e death só
+dependem do elenco, então a mesma tabela serve para o mapa inteiro.
+
+Sem reposição, cada escolha é um sorteio da tabela cheia, descartando quem
+já saiu: condicionado a não repetir, o resultado é exatamente proporcional
+aos pesos de quem sobrou, como no sorteio sequencial de antes. Se quem
+sobrou tiver pouca massa (muitas rejeições em vista), o restante é sorteado
+por varredura linear, que tem a mesma distribuição.
+"""
+
+import random
+from typing import List, Sequence
+
+# Abaixo desta fração da massa total restante, a rejeição deixa de compensar.
+_MASSA_MINIMA_REJEICAO = 0.25
+
+
+class TabelaAlias:
+    """Distribuição discreta sobre os índices 0..n-1, com pesos não negativos."""
+
+    def __init__(self, pesos: Sequence[float]):
+        self.pesos = [float(p) for p in pesos]
+        if any(p < 0 for p in self.pesos):
+            raise ValueError("Os pesos não podem ser negativos")
+        self.total = sum(self.pesos)
+
+        n = len(self.pesos)
+        self.prob = [1.0] * n
+        self.alias = list(range(n))
+        if self.total <= 0:
+            return
+
+        # Vose: cada coluna i guarda prob[i] de ficar em i e o resto vai
+        # para alias[i]; as colunas "grandes" completam as "pequenas".
+        escalados = [p * n / self.total for p in self.pesos]
+        pequenos = [i for i, p in enumerate(escalados) if p < 1.0]
+        grandes = [i for i, p in enumerate(escalados) if p >= 1.0]
+        while pequenos and grandes:
+            pequeno = pequenos.pop()
+            grande = grandes.pop()
+            self.prob[pequeno] = escalados[pequeno]
+            self.alias[pequeno] = grande
+            escalados[grande] += escalados[pequeno] - 1.0
+            (pequenos if escalados[grande] < 1.0 else grandes).append(grande)
+        # O que sobrar em qualquer lista é 1 (a menos de arredondamento).
+
+    def __len__(self) -> int:
+        return len(self.pesos)
+
+    def sortear(self, rng=random) -> int:
+        """Um índice, com reposição, em O(1)."""
+        u = rng.random() * len(self.pesos)
+        coluna = int(u)
+        return coluna if u - coluna < self.prob[coluna] else self.alias[coluna]
+
+    def sortear_sem_reposicao(self, k: int, rng=random) -> List[int]:
+        """k índices distintos, na ordem do sorteio sequencial ponderado."""
+        k = min(k, len(self.pesos))
+        escolhidos: List[int] = []
+        if k <= 0:
+            return escolhidos
+        if self.total <= 0:
+            # Sem massa nenhuma, como a varredura antiga: na ordem da lista
+            return list(range(k))
+
+        ja_saiu = set()
+        restante = self.total
+        while len(escolhidos) < k:
+            if restante < _MASSA_MINIMA_REJEICAO * self.total:
+                return escolhidos + self._varrer(k - len(escolhidos), ja_saiu, rng)
+            indice = self.sortear(rng)
+            if indice in ja_saiu:
+                continue
+            ja_saiu.add(indice)
+            escolhidos.append(indice)
+            restante -= self.pesos[indice]
+        return escolhidos
+
+    def _varrer(self, k: int, ja_saiu: set, rng) -> List[int]:
+        """Sorteio sequencial por varredura, só entre quem ainda não saiu."""
+        disponiveis = [i for i in range(len(self.pesos)) if i not in ja_saiu]
+        escolhidos = []
+        for _ in range(k):
+            total = sum(self.pesos[i] for i in disponiveis)
+            r = rng.uniform(0, total)
+            acumulado = 0.0
+            for posicao, i in enumerate(disponiveis):
+                acumulado += self.pesos[i]
+                if acumulado >= r:
+                    break
+            escolhidos.append(disponiveis.pop(posicao))
+        return escolhidos
@@ -0,0 +1,105 @@
+# test_agregacao_lote.py
+import io
+import random
+import statistics
+import unittest
+from contextlib import redirect_stdout
+from agregacao_lote import AgregadorLote, Welford
+from contexto_simulacao import ContextoSimulacao
+from funcoes_simulacao_deepseek import simular_partidas_em_lote_auto
+
+
+class TestWelford(unittest.TestCase):
+    def test_media_e_variancia(self):
+        rng = random.Random(1)
+        valores = [rng.randint(0, 30) for _ in range(1000)]
+        acumulador = Welford()
+        for valor in valores:
+            acumulador.adicionar(valor)
+        self.assertAlmostEqual(acumulador.media, statistics.mean(valores))
+        self.assertAlmostEqual(acumulador.variancia, statistics.variance(valores))
+        self.assertAlmostEqual(
+            acumulador.erro_padrao, statistics.stdev(valores) / 1000**0.5
+        )
+
+    def test_juntar_equivale_a_sequencia_inteira(self):
+        valores = [3, 7, 7, 1, 0, 12, 5, 5, 9]
+        inteiro, a, b = (
+            Welford(histograma={}),
+            Welford(histograma={}),
+            Welford(histograma={}),
+        )
+        for i, valor in enumerate(valores):
+            inteiro.adicionar(valor)
+            (a if i < 4 else b).adicionar(valor)
+        a.juntar(b)
+        self.assertEqual(a.n, inteiro.n)
+        self.assertAlmostEqual(a.media, inteiro.media)
+        self.assertAlmostEqual(a.m2, inteiro.m2)
+        self.assertEqual(a.histograma, inteiro.histograma)
+        self.assertEqual(a.histograma[7], 2)
+
+    def test_sem_observacoes(self):
+        self.assertEqual(Welford().variancia, 0.0)
+        self.assertEqual(Welford().erro_padrao, 0.0)
+
+
+class TestAgregadorLote(unittest.TestCase):
+    def test_somas_por_jogador_e_por_time(self):
+        agregador = AgregadorLote(histogramas=True)
+        times = {"a1": "a", "a2": "a", "b1": "b"}
+        agregador.registrar_partida(
+            {"a1": 3, "a2": 1, "b1": 2}, {"b1": 4, "a1": 2}, times, "a"
+        )
+        agregador.registrar_partida({"a1": 5, "b1": 6}, {"a2": 6, "b1": 5}, times, "b")
+
+        self.assertEqual(agregador.partidas, 2)
+        self.assertEqual(agregador.vitorias, {"a": 1, "b": 1})
+        self.assertEqual(agregador.kills, {"a1": 8, "a2": 1, "b1": 8})
+        self.assertEqual(agregador.por_time["a"]["kills"].media, 4.5)
+        self.assertEqual(agregador.por_jogador["a2"]["deaths"].histograma, {0: 1, 6: 1})
+        self.assertAlmostEqual(agregador.erros_padrao()["a1"][0], 1.0)
+
+
+class TestLoteEmStreaming(unittest.TestCase):
+    def _lote(self, **kwargs):
+        with redirect_stdout(io.StringIO()):
+            return simular_partidas_em_lote_auto(
+                "furia", "mibr", 6, contexto=ContextoSimulacao(8), **kwargs
+            )
+
+    def test_partidas_so_quando_pedidas(self):
+        partidas, vitorias, kd_df = self._lote()
+        self.assertEqual(partidas, [])
+        self.assertEqual(sum(vitorias.values()), 6)
+        self.assertIn("EP Kills", kd_df.columns)
+        self.assertEqual(len(self._lote(guardar_partidas=True)[0]), 6)
+
+    def test_agregador_do_chamador(self):
+        agregador = AgregadorLote(histogramas=True)
+        _, _, kd_df = self._lote(agregador=agregador)
+        self.assertEqual(agregador.partidas, 6)
+        self.assertEqual(set(agregador.por_time), {"furia", "mibr"})
+        jogador = kd_df.index[0]
+        self.assertEqual(
+            kd_df.loc[jogador, "Kills"], round(agregador.kills[jogador] / 6, 2)
+        )
+        self.assertEqual(
+            sum(agregador.por_jogador[jogador]["kills"].histograma.values()), 6
+        )
+
+    def test_paralelo_devolve_o_mesmo_agregador(self):
+        agregadores = []
+        for workers in (1, 2):
+            agregador = AgregadorLote()
+            with redirect_stdout(io.StringIO()):
+                simular_partidas_em_lote_auto(
+                    "furia", "mibr", 8, workers=workers, semente=3, agregador=agregador
+                )
+            agregadores.append(agregador)
+        self.assertEqual(agregadores[0], agregadores[1])
+        self.assertEqual(agregadores[0].partidas, 8)
+
+
+if __name__ == "__main__":
+    unittest.main()
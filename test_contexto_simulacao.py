@@ -0,0 +1,128 @@
+# test_contexto_simulacao.py
+import random
+import unittest
+from contexto_simulacao import ContextoSimulacao, CONTEXTO_GLOBAL
+from funcoes_simulacao_deepseek import (
+    ContadorPartidas,
+    simular_partida_auto,
+    simular_partidas_em_lote_auto,
+    simular_torneio_mata_mata,
+    simular_torneios_em_lote,
+)
+from funcoes_torneio_deepseek import sortear_grupos
+from indice_mapas import IndiceMapas
+
+
+def _resumo(partida):
+    vencedor, perdedor, resultado = partida
+    return (
+        vencedor,
+        resultado.partida_id,
+        [(m.mapa, m.placar_time1, m.placar_time2) for m in resultado.mapas],
+        [(j.nome, j.kills) for j in resultado.estatisticas_jogadores],
+    )
+
+
+class TestContextoSimulacao(unittest.TestCase):
+    def test_mesma_semente_mesma_partida(self):
+        a = simular_partida_auto(
+            "furia", "mibr", "Final", contexto=ContextoSimulacao(7, primeiro_id=1)
+        )
+        b = simular_partida_auto(
+            "furia", "mibr", "Final", contexto=ContextoSimulacao(7, primeiro_id=1)
+        )
+        self.assertEqual(_resumo(a), _resumo(b))
+
+    def test_nao_mexe_no_estado_global(self):
+        random.seed(3)
+        esperado = random.random()
+        proximo_id = ContadorPartidas._id
+        random.seed(3)
+        contexto = ContextoSimulacao(semente=1, primeiro_id=500)
+        _, _, resultado = simular_partida_auto("furia", "mibr", "", contexto=contexto)
+        self.assertEqual(resultado.partida_id, 500)
+        self.assertEqual(contexto.proxima_partida(), 501)
+        self.assertEqual(random.random(), esperado)
+        self.assertEqual(ContadorPartidas._id, proximo_id)
+
+    def test_simulacoes_intercaladas_nao_se_atrapalham(self):
+        sozinho = _resumo(
+            simular_partida_auto(
+                "furia", "mibr", "", contexto=ContextoSimulacao(2, primeiro_id=1)
+            )
+        )
+        a, b = ContextoSimulacao(2, primeiro_id=1), ContextoSimulacao(9, primeiro_id=1)
+        # Uma partida com outro contexto no meio não muda a sequência de `a`
+        simular_partida_auto("furia", "mibr", "", contexto=b)
+        intercalado = _resumo(simular_partida_auto("furia", "mibr", "", contexto=a))
+        self.assertEqual(sozinho, intercalado)
+
+    def test_com_semente_troca_so_o_rng(self):
+        original = ContextoSimulacao(primeiro_id=10, registro=object())
+        copia = original.com_semente(4)
+        self.assertIs(copia.registro, original.registro)
+        self.assertEqual(copia.rng.random(), random.Random(4).random())
+        self.assertIs(original.rng, random)
+        # O contador é o mesmo: os ids continuam a sequência
+        self.assertEqual(copia.proxima_partida(), 10)
+        self.assertEqual(original.proxima_partida(), 11)
+
+    def test_sorteios_de_torneio(self):
+        times = ["a", "b", "c", "d", "e", "f", "g", "h"]
+        self.assertEqual(
+            sortear_grupos(times, 2, rng=random.Random(5)),
+            sortear_grupos(times, 2, rng=random.Random(5)),
+        )
+
+        def partida(time1, time2, fase):
+            return time1, time2, None
+
+        rankings = [
+            simular_torneio_mata_mata(
+                times[:], partida, contexto=ContextoSimulacao(semente=4)
+            )[0]
+            for _ in range(2)
+        ]
+        self.assertEqual(rankings[0], rankings[1])
+
+    def test_lotes_sequenciais_usam_a_semente(self):
+        def lote():
+            contexto = ContextoSimulacao(primeiro_id=1, indice=IndiceMapas())
+            partidas, _, _ = simular_partidas_em_lote_auto(
+                "furia",
+                "mibr",
+                n=3,
+                semente=6,
+                contexto=contexto,
+                guardar_partidas=True,
+            )
+            return partidas, contexto
+
+        (a, contexto), (b, _) = lote(), lote()
+        self.assertEqual(
+            [(m.mapa, m.placar_time1, m.placar_time2) for p in a for m in p.mapas],
+            [(m.mapa, m.placar_time1, m.placar_time2) for p in b for m in p.mapas],
+        )
+        # A semente não troca o contador nem o índice de quem chamou
+        self.assertEqual([p.partida_id for p in a], [1, 2, 3])
+        self.assertEqual(
+            contexto.indice.consultar("furia").jogos, sum(len(p.mapas) for p in a)
+        )
+
+        def partida(time1, time2, fase):
+            return time1, time2, None
+
+        times = ["a", "b", "c", "d", "e", "f", "g", "h"]
+        rankings = [
+            simular_torneios_em_lote(times, partida, n=5, semente=2)["ranking"]
+            for _ in range(2)
+        ]
+        self.assertEqual(rankings[0], rankings[1])
+
+    def test_contexto_global_usa_o_random_do_modulo(self):
+        self.assertIs(CONTEXTO_GLOBAL.rng, random)
+        self.assertIsNone(CONTEXTO_GLOBAL.contador)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,71 @@
+# test_distribuicao_exata.py
+import unittest
+from unittest.mock import patch
+import numpy as np
+from distribuicao_exata import (
+    distribuicao_placares,
+    distribuicao_exata_mapa,
+    distribuicao_exata_md3,
+)
+from motor_vetorizado import simular_mapas_vetorizado
+
+
+class TestDistribuicaoMapa(unittest.TestCase):
+    def test_soma_um_e_placares_validos(self):
+        placares = distribuicao_placares(0.58, 0.47)
+        self.assertAlmostEqual(sum(placares.values()), 1.0, places=12)
+        for p1, p2 in placares:
+            vencedor, perdedor = max(p1, p2), min(p1, p2)
+            if vencedor == 13:
+                self.assertLessEqual(perdedor, 11)
+            else:
+                self.assertEqual(vencedor, 15)
+                self.assertIn(perdedor, (12, 13, 14))
+
+    def test_rounds_garantidos(self):
+        self.assertEqual(distribuicao_placares(1.0, 0.0), {(13, 0): 1.0})
+
+    def test_rounds_equilibrados_dao_meio_a_meio(self):
+        with patch("distribuicao_exata.probabilidade_round_ct", return_value=0.5):
+            d = distribuicao_exata_mapa("a", "b", "Mirage", 80.0, 80.0)
+        self.assertAlmostEqual(d.prob_vitoria_time1, 0.5, places=12)
+
+    def test_bate_com_o_motor_vetorizado(self):
+        n = 100000
+        p1, p2 = simular_mapas_vetorizado(
+            np.full(n, 88.0), np.full(n, 80.0), ["Mirage"] * n, rng=11
+        )
+        d = distribuicao_exata_mapa("a", "b", "Mirage", 88.0, 80.0)
+        self.assertAlmostEqual(d.prob_vitoria_time1, (p1 > p2).mean(), delta=0.01)
+        self.assertAlmostEqual(d.rounds_esperados, (p1 + p2).mean(), delta=0.1)
+
+    def test_mapa_inexistente(self):
+        with self.assertRaises(ValueError):
+            distribuicao_exata_mapa("a", "b", "Cache", 80.0, 80.0)
+
+
+class TestDistribuicaoMd3(unittest.TestCase):
+    @patch("distribuicao_exata.calcular_over_medio")
+    def test_serie_com_mapas_fixos(self, mock_over):
+        mock_over.side_effect = lambda time: {"a": 86.0, "b": 80.0}[time]
+        mapas = ["Mirage", "Nuke", "Dust2"]
+        serie = distribuicao_exata_md3("a", "b", mapas)
+
+        a, b, c = (
+            distribuicao_exata_mapa("a", "b", m, 86.0, 80.0).prob_vitoria_time1
+            for m in mapas
+        )
+        esperado = a * b + a * (1 - b) * c + (1 - a) * b * c
+        self.assertAlmostEqual(serie.prob_vitoria_time1, esperado)
+        self.assertAlmostEqual(sum(serie.placares.values()), 1.0)
+
+    @patch("distribuicao_exata.calcular_over_medio", return_value=80.0)
+    def test_serie_sorteada_usa_o_pool(self, mock_over):
+        serie = distribuicao_exata_md3("a", "b", pool_mapas=["Mirage", "Nuke", "Dust2"])
+        self.assertAlmostEqual(sum(serie.placares.values()), 1.0)
+        with self.assertRaises(ValueError):
+            distribuicao_exata_md3("a", "b", pool_mapas=["Mirage", "Nuke"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,180 @@
+# test_estatisticas_jogadores.py
+import pickle
+import random
+import unittest
+from contexto_simulacao import ContextoSimulacao
+from estatisticas_jogadores import (
+    EstatisticaJogador,
+    EstatisticasElenco,
+    VisaoEstatisticas,
+    fotografar_mapa,
+)
+from funcoes_simulacao_deepseek import (
+    ResultadoMapa,
+    resetar_estatisticas_para_mapa,
+    simular_partida_auto,
+)
+from gerador_kills_deaths import Escalacao, registrar_kill, simular_kills_do_round
+from registro_times import montar_jogador
+
+
+class TestEstatisticasElenco(unittest.TestCase):
+    def setUp(self):
+        self.elenco = EstatisticasElenco(3)
+        self.visoes = [self.elenco.visao(i) for i in range(3)]
+
+    def test_visao_se_comporta_como_o_dict_antigo(self):
+        estatisticas = self.visoes[1]
+        estatisticas["mapas"]["Nuke"] = {"kills": 0, "deaths": 0, "rounds": 0}
+        estatisticas["mapas"]["Nuke"]["kills"] += 2
+        estatisticas["total"]["kills"] += 2
+
+        self.assertIn("Nuke", estatisticas["mapas"])
+        self.assertNotIn("Nuke", self.visoes[0]["mapas"])
+        self.assertEqual(estatisticas["mapas"].get("Inferno", {"kills": 0})["kills"], 0)
+        self.assertEqual(
+            estatisticas.para_dict(),
+            {
+                "mapas": {"Nuke": {"kills": 2, "deaths": 0, "rounds": 0}},
+                "total": {"kills": 2, "deaths": 0, "rounds": 0},
+            },
+        )
+        self.assertEqual(self.elenco.kills[self.elenco.celula(1, "Nuke")], 2)
+
+    def test_mapas_na_ordem_em_que_foram_jogados(self):
+        for mapa in ("Mirage", "Anubis", "Dust2"):
+            self.visoes[0]["mapas"][mapa] = {}
+        self.visoes[2]["mapas"]["Dust2"] = {}
+        self.assertEqual(
+            list(self.visoes[0]["mapas"].keys()), ["Mirage", "Anubis", "Dust2"]
+        )
+        self.assertEqual(list(self.visoes[2]["mapas"]), ["Dust2"])
+        # Um bloco por mapa, com uma célula por jogador
+        self.assertEqual(len(self.elenco.kills), 3 * 3)
+
+    def test_reset_zera_so_o_mapa(self):
+        jogadores = [{"nome": "a", "estatisticas": v} for v in self.visoes]
+        resetar_estatisticas_para_mapa(jogadores, "Nuke")
+        registrar_kill(jogadores[0], "Nuke")
+        resetar_estatisticas_para_mapa(jogadores, "Nuke")
+        self.assertEqual(self.visoes[0]["mapas"]["Nuke"]["kills"], 0)
+        self.assertEqual(self.visoes[0]["total"]["kills"], 1)
+
+    def test_pickle(self):
+        self.visoes[0]["mapas"]["Nuke"] = {"kills": 3}
+        copia = pickle.loads(pickle.dumps(self.visoes))
+        self.assertEqual(copia[0], self.visoes[0])
+        self.assertIs(copia[0].elenco, copia[1].elenco)
+
+    def test_contadores_fixos(self):
+        with self.assertRaises(KeyError):
+            self.visoes[0]["total"]["assists"] = 1
+        with self.assertRaises(TypeError):
+            del self.visoes[0]["total"]["kills"]
+
+
+class TestRegistroNoElenco(unittest.TestCase):
+    def test_escalacao_registra_nos_arrays(self):
+        elenco_ct, elenco_tr = EstatisticasElenco(5), EstatisticasElenco(5)
+        ct = [
+            montar_jogador(f"ct{i}", "a", 80, "Rifler", elenco_ct.visao(i))
+            for i in range(5)
+        ]
+        tr = [
+            montar_jogador(f"tr{i}", "b", 80, "Rifler", elenco_tr.visao(i))
+            for i in range(5)
+        ]
+        escalacao_ct, escalacao_tr = Escalacao(ct), Escalacao(tr)
+        rng = random.Random(4)
+        for _ in range(100):
+            simular_kills_do_round("ct", escalacao_ct, escalacao_tr, "Ancient", rng)
+        escalacao_ct.registrar_rounds("Ancient", 100)
+
+        self.assertEqual(
+            sum(elenco_ct.kills) + sum(elenco_tr.kills),
+            sum(elenco_ct.deaths) + sum(elenco_tr.deaths),
+        )
+        self.assertEqual(list(elenco_ct.kills), list(elenco_ct.kills_total))
+        self.assertEqual(ct[3]["estatisticas"]["mapas"]["Ancient"]["rounds"], 100)
+        self.assertEqual(tr[3]["estatisticas"]["total"]["rounds"], 0)
+
+    def test_jogador_com_dict_comum(self):
+        jogadores = [
+            {
+                "over": 1.0,
+                "role": "Rifler",
+                "estatisticas": {"mapas": {}, "total": {"kills": 0, "deaths": 0}},
+            }
+            for _ in range(2)
+        ]
+        escalacao = Escalacao(jogadores)
+        escalacao.registrar_kill(1, "Nuke")
+        escalacao.registrar_death(1, "Nuke")
+        self.assertEqual(
+            jogadores[1]["estatisticas"]["mapas"]["Nuke"], {"kills": 1, "deaths": 1}
+        )
+
+    def test_montar_jogador_tem_elenco_proprio(self):
+        jogador = montar_jogador("x", "a", 80, "AWP")
+        self.assertIsInstance(jogador["estatisticas"], VisaoEstatisticas)
+        self.assertEqual(jogador["estatisticas"]["total"]["kills"], 0)
+
+
+class TestFotos(unittest.TestCase):
+    def _jogadores(self, time):
+        elenco = EstatisticasElenco(2)
+        jogadores = [
+            montar_jogador(f"{time}{i}", time, 80, "Rifler", elenco.visao(i))
+            for i in range(2)
+        ]
+        for j in jogadores:
+            j["estatisticas"]["mapas"]["Nuke"] = {"kills": 7, "deaths": 3, "rounds": 20}
+        return jogadores
+
+    def test_foto_nao_acompanha_o_elenco(self):
+        jogadores = self._jogadores("a")
+        foto = fotografar_mapa(jogadores, "Nuke")
+        jogadores[0]["estatisticas"]["mapas"]["Nuke"]["kills"] += 5
+        self.assertEqual(
+            list(foto),
+            [
+                EstatisticaJogador("a0", "a", "Nuke", 7, 3, 20),
+                EstatisticaJogador("a1", "a", "Nuke", 7, 3, 20),
+            ],
+        )
+        with self.assertRaises(AttributeError):
+            next(iter(foto)).kills = 0
+
+    def test_nomes_compartilhados_entre_fotos(self):
+        a = fotografar_mapa(self._jogadores("".join(["b", "c"])), "Nuke")
+        b = fotografar_mapa(self._jogadores("".join(["b", "c"])), "Nuke")
+        self.assertIs(a.jogadores, b.jogadores)
+        self.assertEqual(a, pickle.loads(pickle.dumps(a)))
+
+    def test_resultados_compactos(self):
+        resultado = ResultadoMapa("".join(["Nu", "ke"]), "a", "b", 13, 5, 18)
+        self.assertFalse(hasattr(resultado, "__dict__"))
+        self.assertIs(resultado.mapa, "Nuke")
+        with self.assertRaises(AttributeError):
+            resultado.mvp = "fallen"
+
+    def test_partida_soma_os_mapas(self):
+        _, _, resultado = simular_partida_auto(
+            "furia", "mibr", "Final", contexto=ContextoSimulacao(3, primeiro_id=1)
+        )
+        totais = {j.nome: j for j in resultado.estatisticas_jogadores}
+        self.assertEqual(len(totais), 10)
+        for jogador in resultado.mapas[0].estatisticas_jogadores:
+            self.assertEqual(
+                totais[jogador.nome].kills,
+                sum(
+                    f.kills
+                    for m in resultado.mapas
+                    for f in m.estatisticas_jogadores
+                    if f.nome == jogador.nome
+                ),
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,166 @@
+# test_eventos_jogo.py
+import unittest
+from collections import Counter
+from contexto_simulacao import ContextoSimulacao
+from eventos_jogo import (
+    FimMapa,
+    FimOvertime,
+    FimPartida,
+    FimRound,
+    InicioHalf,
+    InicioMapa,
+    InicioOvertime,
+)
+from funcoes_simulacao_deepseek import (
+    eventos_mapa,
+    eventos_partida,
+    jogar_mapa,
+    simular_partida_auto,
+)
+from indice_mapas import IndiceMapas
+from registro_times import obter_registro
+from saida_simulacao import SAIDA_NULA, Saida
+
+
+class SaidaLista(Saida):
+    def __init__(self):
+        self.linhas = []
+
+    def escrever(self, texto: str = "") -> None:
+        self.linhas.append(texto)
+
+
+def _contexto(semente):
+    return ContextoSimulacao(semente, primeiro_id=1, indice=IndiceMapas())
+
+
+def _mapa(semente, saida=SAIDA_NULA):
+    registro = obter_registro()
+    return eventos_mapa(
+        "furia",
+        "mibr",
+        "Nuke",
+        "auto",
+        registro.jogadores("furia"),
+        registro.jogadores("mibr"),
+        saida,
+        contexto=_contexto(semente),
+    )
+
+
+class TestEventosMapa(unittest.TestCase):
+    def test_ordem_e_placar(self):
+        eventos = list(_mapa(1))
+        self.assertIsInstance(eventos[0], InicioMapa)
+        self.assertIsInstance(eventos[1], InicioHalf)
+        self.assertIsInstance(eventos[-1], FimMapa)
+        resultado = eventos[-1].resultado
+        rounds = [e for e in eventos if isinstance(e, FimRound)]
+        self.assertEqual(len(rounds), resultado.rounds)
+        self.assertEqual([r.numero for r in rounds], list(range(1, len(rounds) + 1)))
+        ultimo = rounds[-1]
+        self.assertEqual(
+            ultimo.placar_ct + ultimo.placar_tr,
+            resultado.placar_time1 + resultado.placar_time2,
+        )
+        self.assertIn(ultimo.vencedor, ("furia", "mibr"))
+
+    def test_abates_batem_com_as_estatisticas(self):
+        eventos = list(_mapa(2))
+        kills = Counter(
+            matador
+            for e in eventos
+            if isinstance(e, FimRound)
+            for matador, _ in e.abates
+        )
+        deaths = Counter(
+            morto for e in eventos if isinstance(e, FimRound) for _, morto in e.abates
+        )
+        for jogador in eventos[-1].resultado.estatisticas_jogadores:
+            self.assertEqual(jogador.kills, kills[jogador.nome])
+            self.assertEqual(jogador.deaths, deaths[jogador.nome])
+
+    def test_pausa_entre_rounds(self):
+        eventos = _mapa(3)
+        rounds = 0
+        for evento in eventos:
+            if isinstance(evento, FimRound):
+                rounds += 1
+                if rounds == 5:
+                    break
+        # O gerador fica parado no quinto round e continua de onde parou
+        resto = list(eventos)
+        self.assertIsInstance(resto[-1], FimMapa)
+        self.assertEqual(
+            rounds + sum(isinstance(e, FimRound) for e in resto),
+            resto[-1].resultado.rounds,
+        )
+
+    def test_overtime(self):
+        # Procura uma semente com overtime para checar os eventos dele
+        for semente in range(200):
+            eventos = list(_mapa(semente))
+            inicios = [e for e in eventos if isinstance(e, InicioOvertime)]
+            if inicios:
+                break
+        else:
+            self.skipTest("nenhum overtime nas sementes testadas")
+        fim = [e for e in eventos if isinstance(e, FimOvertime)]
+        self.assertEqual(len(fim), 1)
+        self.assertEqual(fim[0].numero, inicios[-1].numero)
+        resultado = eventos[-1].resultado
+        self.assertEqual(
+            (fim[0].placar_time1, fim[0].placar_time2),
+            (resultado.placar_time1, resultado.placar_time2),
+        )
+
+    def test_jogar_mapa_consome_o_gerador(self):
+        registro = obter_registro()
+        saida_gerador = SaidaLista()
+        eventos = list(_mapa(4, saida_gerador))
+        saida = SaidaLista()
+        resultado = jogar_mapa(
+            "furia",
+            "mibr",
+            "Nuke",
+            "auto",
+            registro.jogadores("furia"),
+            registro.jogadores("mibr"),
+            saida,
+            _contexto(4),
+        )
+        esperado = eventos[-1].resultado
+        self.assertEqual(
+            (resultado.placar_time1, resultado.placar_time2),
+            (esperado.placar_time1, esperado.placar_time2),
+        )
+        # Só jogar_mapa narra; o gerador não escreve nada em modo auto
+        self.assertEqual(saida_gerador.linhas, [])
+        self.assertEqual(
+            sum("venceu!" in linha for linha in saida.linhas), resultado.rounds
+        )
+        self.assertTrue(any("FIM DE MAPA" in linha for linha in saida.linhas))
+
+
+class TestEventosPartida(unittest.TestCase):
+    def test_partida(self):
+        eventos = list(eventos_partida("furia", "mibr", contexto=_contexto(5)))
+        self.assertIsInstance(eventos[-1], FimPartida)
+        fim = eventos[-1]
+        mapas = [e.resultado for e in eventos if isinstance(e, FimMapa)]
+        self.assertEqual(mapas, fim.resultado.mapas)
+        self.assertIn(len(mapas), (2, 3))
+        self.assertEqual({fim.vencedor, fim.perdedor}, {"furia", "mibr"})
+
+        vencedor, perdedor, resultado = simular_partida_auto(
+            "furia", "mibr", None, contexto=_contexto(5)
+        )
+        self.assertEqual((vencedor, perdedor), (fim.vencedor, fim.perdedor))
+        self.assertEqual(
+            [(m.placar_time1, m.placar_time2) for m in resultado.mapas],
+            [(m.placar_time1, m.placar_time2) for m in mapas],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,126 @@
+# test_indice_mapas.py
+import io
+import os
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from contexto_simulacao import ContextoSimulacao
+from funcoes_simulacao_deepseek import jogar_mapa
+import indice_mapas
+from indice_mapas import IndiceMapas, indice_isolado, obter_indice, persistir_indice
+from registro_times import obter_registro
+from saida_simulacao import SAIDA_NULA
+from simulacao_paralela import simular_partidas_paralelo
+
+
+class TestIndiceMapas(unittest.TestCase):
+    def setUp(self):
+        self.indice = IndiceMapas()
+        self.indice.registrar("furia", "mibr", "Nuke", 13, 8)
+        self.indice.registrar("mibr", "furia", "Nuke", 13, 11)
+        self.indice.registrar("furia", "pain", "Mirage", 16, 14)
+
+    def test_consultas(self):
+        nuke = self.indice.consultar("Furia", "Nuke")
+        self.assertEqual((nuke.vitorias, nuke.derrotas), (1, 1))
+        self.assertEqual(nuke.saldo_rounds, 3)
+        self.assertEqual(nuke.taxa_vitoria, 0.5)
+        self.assertEqual(self.indice.consultar("furia", "Nuke", "tr").derrotas, 1)
+        self.assertEqual(self.indice.consultar("furia", adversario="pain").jogos, 1)
+        self.assertEqual(self.indice.consultar("furia").jogos, 3)
+        self.assertEqual(self.indice.consultar("mibr", "Nuke", "ct").vitorias, 1)
+        self.assertEqual(self.indice.consultar("vitality", "Nuke").jogos, 0)
+        with self.assertRaises(ValueError):
+            self.indice.consultar("furia", lado="meio")
+
+    def test_tabela(self):
+        tabela = self.indice.tabela("furia")
+        self.assertEqual(list(tabela["Mapa"]), ["Mirage", "Nuke"])
+        self.assertEqual(list(tabela["Taxa CT"]), [1.0, 1.0])
+
+    def test_persistencia_e_juntar(self):
+        with tempfile.TemporaryDirectory() as pasta:
+            arquivo = os.path.join(pasta, "indice.json")
+            salvo = IndiceMapas(arquivo)
+            salvo.juntar(self.indice)
+            salvo.salvar()
+            carregado = IndiceMapas.carregar(arquivo)
+        self.assertEqual(carregado.contagens, self.indice.contagens)
+        carregado.juntar(self.indice)
+        self.assertEqual(carregado.consultar("furia", "Nuke").jogos, 4)
+
+
+class TestIndiceNaSimulacao(unittest.TestCase):
+    def test_jogar_mapa_atualiza_o_indice_do_contexto(self):
+        indice = IndiceMapas()
+        registro = obter_registro()
+        resultado = jogar_mapa(
+            "furia",
+            "mibr",
+            "Nuke",
+            "auto",
+            registro.jogadores("furia"),
+            registro.jogadores("mibr"),
+            SAIDA_NULA,
+            ContextoSimulacao(3, indice=indice),
+        )
+        furia = indice.consultar("furia", "Nuke", "ct", "mibr")
+        self.assertEqual(furia.jogos, 1)
+        self.assertEqual(furia.rounds_pro, resultado.placar_time1)
+        self.assertEqual(indice.consultar("mibr", "Nuke", "tr").jogos, 1)
+
+    def test_fatias_paralelas_somam_no_indice_da_sessao(self):
+        with indice_isolado() as indice:
+            with redirect_stdout(io.StringIO()):
+                simular_partidas_paralelo(
+                    "furia", "mibr", 6, workers=1, semente=2, por_fatia=4
+                )
+            self.assertIs(obter_indice(), indice)
+        jogos = indice.consultar("furia").jogos
+        self.assertGreaterEqual(jogos, 12)
+        self.assertEqual(jogos, indice.consultar("mibr").jogos)
+
+
+class TestPersistencia(unittest.TestCase):
+    def test_indice_da_sessao_fica_em_memoria(self):
+        registro = obter_registro()
+        with tempfile.TemporaryDirectory() as pasta:
+            diretorio = os.getcwd()
+            os.chdir(pasta)
+            try:
+                with indice_isolado():
+                    jogar_mapa(
+                        "furia",
+                        "mibr",
+                        "Nuke",
+                        "auto",
+                        registro.jogadores("furia"),
+                        registro.jogadores("mibr"),
+                        SAIDA_NULA,
+                        # Sem `indice`: o mapa vai para o índice da sessão
+                        ContextoSimulacao(3, registro=registro),
+                    )
+                    self.assertIsNone(obter_indice().arquivo)
+                    self.assertEqual(obter_indice().consultar("furia").jogos, 1)
+                indice_mapas._salvar_sessao()
+                self.assertEqual(os.listdir(pasta), [])
+            finally:
+                os.chdir(diretorio)
+
+    def test_persistir_indice(self):
+        with tempfile.TemporaryDirectory() as pasta:
+            arquivo = os.path.join(pasta, "indice.json")
+            salvo = IndiceMapas(arquivo)
+            salvo.registrar("furia", "mibr", "Nuke", 13, 8)
+            salvo.salvar()
+            with indice_isolado():
+                obter_indice().registrar("furia", "pain", "Mirage", 13, 5)
+                indice = persistir_indice(arquivo)
+                self.assertIs(obter_indice(), indice)
+                self.assertEqual(indice.consultar("furia").jogos, 2)
+                indice_mapas._salvar_sessao()
+            self.assertEqual(IndiceMapas.carregar(arquivo).consultar("furia").jogos, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,167 @@
+# test_log_rounds.py
+import io
+import os
+import tempfile
+import unittest
+from unittest import mock
+from contexto_simulacao import ContextoSimulacao
+from funcoes_simulacao_deepseek import (
+    eventos_mapa,
+    jogar_partida,
+    simular_partida_auto,
+    simular_partidas_em_lote_auto,
+    simular_torneios_em_lote,
+)
+from indice_mapas import IndiceMapas
+from log_rounds import ROUND, GravadorRounds, reproduzir, tabela_kd, tabela_rounds
+from registro_times import obter_registro
+from saida_simulacao import SAIDA_NULA
+
+
+def _placares(resultado):
+    return [
+        (m.mapa, m.placar_time1, m.placar_time2, m.rounds, m.rounds_extra, m.fase)
+        for m in resultado.mapas
+    ] + [resultado.fase, resultado.modo_jogo]
+
+
+class TestLogRounds(unittest.TestCase):
+    def setUp(self):
+        self.log = io.BytesIO()
+        self.gravador = GravadorRounds(self.log)
+        contexto = ContextoSimulacao(
+            6, primeiro_id=10, indice=IndiceMapas(), gravador=self.gravador
+        )
+        self.originais = [
+            simular_partida_auto("furia", "mibr", "semifinal", contexto=contexto)
+            for _ in range(3)
+        ]
+        self.log.seek(0)
+
+    def test_reproduz_as_partidas(self):
+        reproduzidas = list(reproduzir(self.log))
+        self.assertEqual(len(reproduzidas), 3)
+        for (vencedor, perdedor, original), copia in zip(self.originais, reproduzidas):
+            self.assertEqual(copia.partida_id, original.partida_id)
+            self.assertEqual(_placares(copia), _placares(original))
+            self.assertEqual((copia.vencedor, copia.perdedor), (vencedor, perdedor))
+            self.assertEqual(
+                copia.estatisticas_jogadores, original.estatisticas_jogadores
+            )
+
+    def test_tamanho_e_tabelas(self):
+        rounds = sum(m.rounds for _, _, r in self.originais for m in r.mapas)
+        self.assertEqual(self.gravador.rounds, rounds)
+        self.assertEqual(self.gravador.partidas, 3)
+        # Os rounds são a maior parte do log
+        self.assertLess(len(self.log.getvalue()), rounds * ROUND.size + 3 * 400)
+
+        tabela = tabela_rounds(io.BytesIO(self.log.getvalue()))
+        self.assertEqual(len(tabela), rounds)
+        self.assertEqual(set(tabela["Lado"]), {"ct", "tr"})
+
+        kd = tabela_kd(reproduzir(self.log))
+        self.assertEqual(len(kd), 10)
+        self.assertEqual(set(kd["Time"]), {"furia", "mibr"})
+
+    def test_log_truncado(self):
+        dados = self.log.getvalue()
+        with self.assertRaises(ValueError):
+            list(reproduzir(io.BytesIO(dados[:-5])))
+
+
+class TestOutrosCaminhos(unittest.TestCase):
+    def setUp(self):
+        self.log = io.BytesIO()
+        self.gravador = GravadorRounds(self.log)
+        self.contexto = ContextoSimulacao(
+            7, primeiro_id=20, indice=IndiceMapas(), gravador=self.gravador
+        )
+
+    def test_lote_grava_as_partidas(self):
+        guardadas, _, _ = simular_partidas_em_lote_auto(
+            "furia", "mibr", n=3, contexto=self.contexto, guardar_partidas=True
+        )
+        self.assertEqual(self.gravador.partidas, 3)
+        self.log.seek(0)
+        reproduzidas = list(reproduzir(self.log))
+        self.assertEqual(
+            [p.partida_id for p in reproduzidas], [p.partida_id for p in guardadas]
+        )
+        for original, copia in zip(guardadas, reproduzidas):
+            self.assertEqual(
+                [(m.mapa, m.placar_time1, m.placar_time2) for m in copia.mapas],
+                [(m.mapa, m.placar_time1, m.placar_time2) for m in original.mapas],
+            )
+
+    def test_jogar_partida_grava(self):
+        with mock.patch("funcoes_simulacao_deepseek.times", ["furia", "mibr"]):
+            resultado = jogar_partida(
+                "auto", "furia", "mibr", "final", SAIDA_NULA, self.contexto
+            )
+        self.log.seek(0)
+        (copia,) = list(reproduzir(self.log))
+        self.assertEqual(copia.partida_id, resultado.partida_id)
+        self.assertEqual(_placares(copia), _placares(resultado))
+        self.assertEqual(
+            (copia.vencedor, copia.perdedor), (resultado.vencedor, resultado.perdedor)
+        )
+
+    def test_caminhos_sem_rounds_recusam_o_gravador(self):
+        with self.assertRaises(ValueError):
+            simular_partidas_em_lote_auto(
+                "furia", "mibr", n=2, workers=1, contexto=self.contexto
+            )
+        with self.assertRaises(ValueError):
+            simular_partida_auto(
+                "furia", "mibr", None, contexto=self.contexto, detalhar_rounds=False
+            )
+        with self.assertRaises(ValueError):
+            simular_torneios_em_lote(
+                ["furia", "mibr"],
+                simular_partida_auto,
+                workers=1,
+                contexto=self.contexto,
+            )
+        self.assertEqual(self.gravador.partidas, 0)
+
+
+class TestGravadorMapaSolto(unittest.TestCase):
+    def test_mapa_sem_partida_e_arquivo(self):
+        registro = obter_registro()
+        with tempfile.TemporaryDirectory() as pasta:
+            arquivo = os.path.join(pasta, "rounds.bin")
+            with GravadorRounds(arquivo) as gravador:
+                eventos = gravador.gravar(
+                    eventos_mapa(
+                        "furia",
+                        "mibr",
+                        "Inferno",
+                        "auto",
+                        registro.jogadores("furia"),
+                        registro.jogadores("mibr"),
+                        SAIDA_NULA,
+                        ContextoSimulacao(8, indice=IndiceMapas()),
+                    )
+                )
+                # O valor de retorno do gerador passa pelo gravador
+                while True:
+                    try:
+                        next(eventos)
+                    except StopIteration as fim:
+                        original = fim.value
+                        break
+            (partida,) = list(reproduzir(arquivo))
+        self.assertEqual(partida.partida_id, 0)
+        (mapa,) = partida.mapas
+        self.assertEqual(
+            (mapa.placar_time1, mapa.placar_time2),
+            (original.placar_time1, original.placar_time2),
+        )
+        self.assertEqual(
+            list(mapa.estatisticas_jogadores), list(original.estatisticas_jogadores)
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
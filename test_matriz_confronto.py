@@ -0,0 +1,94 @@
+# test_matriz_confronto.py
+import json
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+import matriz_confronto
+from matriz_confronto import construir_matriz_confronto
+
+
+def _escrever(caminho, conteudo):
+    with open(caminho, "w", newline="", encoding="utf-8") as f:
+        f.write(conteudo)
+
+
+class TestMatrizConfronto(unittest.TestCase):
+    def setUp(self):
+        self._tmpdir = tempfile.TemporaryDirectory()
+        pasta = self._tmpdir.name
+        self.arq_times = os.path.join(pasta, "times.csv")
+        self.arq_jogadores = os.path.join(pasta, "jogadores.csv")
+        self.arq_cache = os.path.join(pasta, "matriz.json")
+        _escrever(self.arq_times, "Furia,🐍,BLACK\nPain,💀,RED\nMibr,🔥,BLUE\n")
+        self._escrever_jogadores(pain=78)
+
+    def tearDown(self):
+        self._tmpdir.cleanup()
+
+    def _escrever_jogadores(self, pain):
+        _escrever(
+            self.arq_jogadores,
+            "nick,nacionalidade,funcao,over,time\n"
+            "a,BR,AWP,90,Furia\n"
+            f"b,BR,AWP,{pain},Pain\n"
+            "c,BR,AWP,75,Mibr\n",
+        )
+
+    def _construir(self):
+        with patch.object(
+            matriz_confronto,
+            "_calcular_par",
+            wraps=matriz_confronto._calcular_par,
+        ) as mock_par:
+            matriz = construir_matriz_confronto(
+                ["furia", "pain", "mibr"],
+                arquivo=self.arq_cache,
+                processos=1,
+                arquivo_times=self.arq_times,
+                arquivo_jogadores=self.arq_jogadores,
+            )
+        return matriz, {
+            (t1, t2) for t1, t2, *_ in (c.args[0] for c in mock_par.call_args_list)
+        }
+
+    def test_matriz_completa_e_coerente(self):
+        matriz, calculados = self._construir()
+        self.assertEqual(len(calculados), 6)
+        self.assertGreater(matriz.prob_vitoria("Furia", "Mibr"), 0.5)
+        self.assertAlmostEqual(
+            matriz.prob_vitoria("furia", "pain") + matriz.prob_vitoria("pain", "furia"),
+            1.0,
+            delta=0.02,
+        )
+        self.assertEqual(matriz.como_array().shape, (3, 3))
+
+    def test_cache_reaproveitado(self):
+        primeira, _ = self._construir()
+        segunda, calculados = self._construir()
+        self.assertEqual(calculados, set())
+        self.assertEqual(primeira.probabilidades, segunda.probabilidades)
+
+    def test_so_o_time_alterado_e_recalculado(self):
+        self._construir()
+        self._escrever_jogadores(pain=88)
+        matriz, calculados = self._construir()
+        self.assertEqual(
+            calculados,
+            {("furia", "pain"), ("pain", "furia"), ("pain", "mibr"), ("mibr", "pain")},
+        )
+        self.assertGreater(matriz.prob_vitoria("pain", "mibr"), 0.9)
+
+    def test_modelo_alterado_invalida_tudo(self):
+        self._construir()
+        with open(self.arq_cache, encoding="utf-8") as f:
+            cache = json.load(f)
+        cache["modelo"] = "outro"
+        with open(self.arq_cache, "w", encoding="utf-8") as f:
+            json.dump(cache, f)
+        _, calculados = self._construir()
+        self.assertEqual(len(calculados), 6)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,111 @@
+# test_memo_mapas.py
+import random
+import unittest
+from contexto_simulacao import ContextoSimulacao
+from distribuicao_exata import distribuicao_exata_mapa
+from funcoes_simulacao_deepseek import simular_partida_auto
+from indice_mapas import IndiceMapas
+from memo_mapas import MemoMapas
+
+
+class TestMemoMapas(unittest.TestCase):
+    def test_acertos_falhas_e_quantizacao(self):
+        memo = MemoMapas()
+        memo.distribuicao(82.0, 80.0, "Nuke")
+        memo.distribuicao(82.01, 80.0, "Nuke")  # mesma chave quantizada
+        memo.distribuicao(82.2, 80.0, "Nuke")
+        self.assertEqual((memo.acertos, memo.falhas), (1, 2))
+        self.assertEqual(len(memo), 2)
+        self.assertAlmostEqual(memo.taxa_acerto, 1 / 3)
+
+    def test_despejo_lru(self):
+        memo = MemoMapas(capacidade=2)
+        memo.distribuicao(80.0, 80.0, "Nuke")
+        memo.distribuicao(81.0, 80.0, "Nuke")
+        memo.distribuicao(80.0, 80.0, "Nuke")  # volta a ser o mais recente
+        memo.distribuicao(82.0, 80.0, "Nuke")  # despeja o 81
+        self.assertEqual(memo.despejos, 1)
+        memo.distribuicao(80.0, 80.0, "Nuke")
+        self.assertEqual(memo.acertos, 2)
+        memo.distribuicao(81.0, 80.0, "Nuke")
+        self.assertEqual(memo.falhas, 4)
+
+    def test_sorteio_segue_a_distribuicao_exata(self):
+        memo = MemoMapas()
+        rng = random.Random(5)
+        n = 20_000
+        vitorias = sum(
+            a > b
+            for a, b in (
+                memo.sortear_placar(84.0, 80.0, "Mirage", rng) for _ in range(n)
+            )
+        )
+        exata = distribuicao_exata_mapa("a", "b", "Mirage", 84.0, 80.0)
+        self.assertAlmostEqual(vitorias / n, exata.prob_vitoria_time1, delta=0.015)
+
+    def test_monte_carlo(self):
+        memo = MemoMapas(monte_carlo=2000, semente=1)
+        distribuicao = memo.distribuicao(84.0, 80.0, "Mirage")
+        self.assertAlmostEqual(sum(distribuicao.tabela.pesos), 2000)
+        self.assertTrue(all(max(p) >= 13 for p in distribuicao.placares))
+
+    def test_parametros_invalidos(self):
+        with self.assertRaises(ValueError):
+            MemoMapas(capacidade=0)
+        with self.assertRaises(ValueError):
+            MemoMapas().distribuicao(80.0, 80.0, "Cobblestone")
+
+
+class TestPartidaSemRounds(unittest.TestCase):
+    def test_partida_sorteada(self):
+        memo = MemoMapas()
+        indice = IndiceMapas()
+        contexto = ContextoSimulacao(4, indice=indice)
+        for _ in range(20):
+            vencedor, perdedor, resultado = simular_partida_auto(
+                "furia",
+                "mibr",
+                "final",
+                contexto=contexto,
+                detalhar_rounds=False,
+                memo=memo,
+            )
+            self.assertEqual({vencedor, perdedor}, {"furia", "mibr"})
+            self.assertIn(len(resultado.mapas), (2, 3))
+            self.assertEqual(resultado.estatisticas_jogadores, ())
+        self.assertLessEqual(memo.falhas, 3)
+        self.assertGreater(memo.acertos, 0)
+        self.assertEqual(
+            indice.consultar("furia").jogos,
+            memo.acertos + memo.falhas,
+        )
+
+    def test_mesmo_formato_do_caminho_detalhado(self):
+        memo = MemoMapas()
+        for detalhar in (True, False):
+            contexto = ContextoSimulacao(9, indice=IndiceMapas())
+            overtimes = 0
+            for _ in range(60):
+                vencedor, perdedor, resultado = simular_partida_auto(
+                    "furia",
+                    "mibr",
+                    "final",
+                    contexto=contexto,
+                    detalhar_rounds=detalhar,
+                    memo=memo,
+                )
+                self.assertEqual(
+                    (resultado.vencedor, resultado.perdedor), (vencedor, perdedor)
+                )
+                self.assertEqual(
+                    (resultado.fase, resultado.modo_jogo), ("final", "auto")
+                )
+                for mapa in resultado.mapas:
+                    self.assertEqual(mapa.fase, "final")
+                    self.assertEqual(mapa.rounds_extra, max(0, mapa.rounds - 24))
+                    overtimes += mapa.rounds_extra > 0
+            self.assertGreater(overtimes, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
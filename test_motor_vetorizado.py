@@ -0,0 +1,60 @@
+# test_motor_vetorizado.py
+import unittest
+import numpy as np
+from motor_vetorizado import (
+    MAPAS,
+    ids_mapas,
+    simular_mapas_vetorizado,
+    simular_md3_vetorizado,
+)
+
+
+class TestMotorVetorizado(unittest.TestCase):
+    def test_placares_validos(self):
+        n = 20000
+        p1, p2 = simular_mapas_vetorizado(
+            np.full(n, 84.0), np.full(n, 82.0), ["Dust2"] * n, rng=7
+        )
+        vencedor = np.maximum(p1, p2)
+        perdedor = np.minimum(p1, p2)
+        self.assertTrue(np.all(p1 != p2))
+        # Tempo normal: 13 x (0..11). Overtime MR3 a partir de 12-12: 15 x (12..14)
+        normal = vencedor == 13
+        self.assertTrue(np.all(perdedor[normal] <= 11))
+        self.assertTrue(np.all(vencedor[~normal] == 15))
+        self.assertTrue(np.all((perdedor[~normal] >= 12) & (perdedor[~normal] <= 14)))
+        self.assertTrue((~normal).any(), "nenhum overtime em 20 mil mapas")
+
+    def test_time_mais_forte_vence_mais(self):
+        n = 20000
+        p1, p2 = simular_mapas_vetorizado(
+            np.full(n, 90.0), np.full(n, 75.0), ["Nuke"] * n, rng=1
+        )
+        self.assertGreater((p1 > p2).mean(), 0.7)
+
+    def test_mesma_semente_mesmo_resultado(self):
+        args = ([85.0] * 100, [83.0] * 100, list(MAPAS) * 14 + ["Train"] * 2)
+        a = simular_mapas_vetorizado(*args, rng=123)
+        b = simular_mapas_vetorizado(*args, rng=123)
+        np.testing.assert_array_equal(a[0], b[0])
+        np.testing.assert_array_equal(a[1], b[1])
+
+    def test_mapa_invalido(self):
+        with self.assertRaises(ValueError):
+            ids_mapas(["Overpass"])
+
+    def test_tamanhos_diferentes(self):
+        with self.assertRaises(ValueError):
+            simular_mapas_vetorizado([80.0, 81.0], [80.0], ["Mirage", "Nuke"])
+
+    def test_md3(self):
+        n = 5000
+        m1, m2 = simular_md3_vetorizado(
+            [85.0] * n, [80.0] * n, [["Mirage", "Nuke", "Train"]] * n, rng=3
+        )
+        self.assertTrue(np.all(np.maximum(m1, m2) == 2))
+        self.assertTrue(np.all(np.minimum(m1, m2) <= 1))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,110 @@
+# test_odds_exatas.py
+import contextlib
+import io
+import random
+import unittest
+from unittest.mock import patch
+import funcoes_torneio_deepseek as torneio
+from funcoes_simulacao_deepseek import ResultadoPartida
+from odds_exatas import (
+    distribuicao_grupo,
+    odds_double_elimination,
+    odds_fase_grupos,
+    odds_mata_mata,
+)
+
+TIMES = ["a", "b", "c", "d", "e", "f", "g", "h"]
+
+
+def _matriz():
+    # Força decrescente com a posição, mais um bônus para o time 1
+    forca = {t: 2.0 - 0.2 * i for i, t in enumerate(TIMES)}
+    return {
+        (t1, t2): min(0.97, forca[t1] / (forca[t1] + forca[t2]) + 0.04)
+        for t1 in TIMES
+        for t2 in TIMES
+        if t1 != t2
+    }
+
+
+class TestOddsExatas(unittest.TestCase):
+    """Compara as chances exatas com as funções de torneio de verdade, com
+    partidas sorteadas pela mesma matriz e sem os random.shuffle."""
+
+    N = 4000
+
+    def setUp(self):
+        self.matriz = _matriz()
+        self._patches = [
+            patch.object(torneio, "simular_partida_auto", self._partida),
+            patch.object(torneio.random, "shuffle", lambda lista: None),
+        ]
+        for p in self._patches:
+            p.start()
+        random.seed(4)
+
+    def tearDown(self):
+        for p in self._patches:
+            p.stop()
+
+    def _partida(self, time1, time2, fase, contexto=None):
+        if random.random() < self.matriz[(time1, time2)]:
+            vencedor, perdedor = time1, time2
+        else:
+            vencedor, perdedor = time2, time1
+        return vencedor, perdedor, ResultadoPartida(partida_id=0, mapas=[])
+
+    def _frequencias(self, rodar):
+        contagem = {t: 0 for t in TIMES}
+        with contextlib.redirect_stdout(io.StringIO()):
+            for _ in range(self.N):
+                contagem[rodar()] += 1
+        return {t: c / self.N for t, c in contagem.items()}
+
+    def test_mata_mata(self):
+        odds = odds_mata_mata(TIMES, self.matriz)
+        self.assertAlmostEqual(sum(v[-1] for v in odds.values()), 1.0)
+        self.assertAlmostEqual(sum(v[0] for v in odds.values()), 4.0)
+        freq = self._frequencias(lambda: torneio.fase_mata_mata(TIMES, [])[0][0])
+        for time in TIMES:
+            self.assertAlmostEqual(odds[time][-1], freq[time], delta=0.025)
+
+    def test_grupos(self):
+        grupos = [TIMES[0::2], TIMES[1::2]]
+        odds = odds_fase_grupos(grupos, self.matriz, 2, ida_e_volta=True)
+        self.assertAlmostEqual(sum(v["classifica"] for v in odds.values()), 4.0)
+        self.assertAlmostEqual(sum(v["campeao"] for v in odds.values()), 1.0)
+
+        def rodar():
+            with patch.object(torneio, "sortear_grupos", return_value=grupos):
+                classificados, _ = torneio.fase_grupos(TIMES, 2, 2, True)
+            return torneio.fase_mata_mata(classificados, [])[0][0]
+
+        freq = self._frequencias(rodar)
+        for time in TIMES:
+            self.assertAlmostEqual(odds[time]["campeao"], freq[time], delta=0.025)
+
+    def test_classificacao_do_grupo_desempata_pela_ordem(self):
+        # Dois times, um jogo de ida e volta com chance 1/2: 1-1 em 50% das
+        # vezes, e aí o primeiro do grupo fica na frente
+        matriz = {("x", "y"): 0.5, ("y", "x"): 0.5}
+        dist = distribuicao_grupo(["x", "y"], matriz, ida_e_volta=True)
+        self.assertAlmostEqual(dist[("x", "y")], 0.75)
+        self.assertAlmostEqual(dist[("y", "x")], 0.25)
+
+    def test_double_elimination(self):
+        for chave in (TIMES, TIMES[:6], TIMES[:5]):
+            odds = odds_double_elimination(chave, self.matriz)
+            self.assertAlmostEqual(sum(v["campeao"] for v in odds.values()), 1.0)
+            self.assertAlmostEqual(sum(v["final"] for v in odds.values()), 2.0)
+
+        odds = odds_double_elimination(TIMES[:6], self.matriz)
+        freq = self._frequencias(
+            lambda: torneio.fase_double_elimination(TIMES[:6], [])[0]
+        )
+        for time in TIMES[:6]:
+            self.assertAlmostEqual(odds[time]["campeao"], freq[time], delta=0.025)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,128 @@
+# test_parada_adaptativa.py
+import io
+import unittest
+from contextlib import redirect_stdout
+import numpy as np
+from contexto_simulacao import ContextoSimulacao
+from funcoes_simulacao_deepseek import ResultadoPartida
+from indice_mapas import IndiceMapas
+from parada_adaptativa import (
+    intervalo_wilson,
+    simular_partidas_ate_precisao,
+    simular_torneios_ate_precisao,
+)
+
+TIMES = ["a", "b", "c", "d"]
+
+
+def _partida_favorito(time1, time2, fase):
+    # O time que vem antes em TIMES sempre vence
+    resultado = ResultadoPartida(partida_id=0, mapas=[], fase=fase)
+    if TIMES.index(time1) < TIMES.index(time2):
+        return time1, time2, resultado
+    return time2, time1, resultado
+
+
+class TestIntervaloWilson(unittest.TestCase):
+    def test_contem_a_proporcao_e_encolhe_com_n(self):
+        p, baixo, alto = intervalo_wilson(300, 1000)
+        self.assertEqual(p, 0.3)
+        self.assertLess(baixo, 0.3)
+        self.assertGreater(alto, 0.3)
+        _, baixo_maior, alto_maior = intervalo_wilson(3000, 10000)
+        self.assertLess(alto_maior - baixo_maior, alto - baixo)
+
+    def test_extremos_nao_degeneram(self):
+        p, baixo, alto = intervalo_wilson(0, 50)
+        self.assertEqual((p, baixo), (0.0, 0.0))
+        self.assertGreater(alto, 0.0)
+        self.assertEqual(intervalo_wilson(50, 50)[2], 1.0)
+
+
+class TestParadaAdaptativa(unittest.TestCase):
+    def test_partidas_param_quando_atinge_a_meta(self):
+        with redirect_stdout(io.StringIO()):
+            resultado = simular_partidas_ate_precisao(
+                "furia", "mibr", precisao=0.1, bloco=20, n_max=400, semente=2
+            )
+        self.assertTrue(resultado["atingiu"])
+        self.assertEqual(resultado["n"] % 20, 0)
+        self.assertLess(resultado["n"], 400)
+        self.assertEqual(sum(resultado["vitorias"].values()), resultado["n"])
+        for _, baixo, alto in resultado["intervalos"].values():
+            self.assertLessEqual((alto - baixo) / 2, 0.1)
+
+    def test_partidas_respeitam_n_max(self):
+        with redirect_stdout(io.StringIO()):
+            resultado = simular_partidas_ate_precisao(
+                "furia", "mibr", precisao=0.001, bloco=7, n_max=10, semente=1
+            )
+        self.assertFalse(resultado["atingiu"])
+        self.assertEqual(resultado["n"], 10)
+
+    def test_semente_mantem_o_contexto(self):
+        indice = IndiceMapas()
+        contexto = ContextoSimulacao(primeiro_id=500, indice=indice)
+        with redirect_stdout(io.StringIO()):
+            resultado = simular_partidas_ate_precisao(
+                "furia",
+                "mibr",
+                precisao=0.3,
+                bloco=4,
+                n_max=4,
+                semente=3,
+                contexto=contexto,
+                guardar_partidas=True,
+            )
+        # Ids e mapas jogados ficam no contador e no índice de quem chamou
+        self.assertEqual(
+            [p.partida_id for p in resultado["partidas"]], [500, 501, 502, 503]
+        )
+        self.assertEqual(contexto.proxima_partida(), 504)
+        self.assertEqual(
+            sum(len(p.mapas) for p in resultado["partidas"]),
+            indice.consultar("furia").jogos,
+        )
+
+    def test_torneio_desequilibrado_converge_rapido(self):
+        # "a" é campeão sempre: 0 ou 1 convergem muito antes de n_max
+        resultado = simular_torneios_ate_precisao(
+            TIMES, _partida_favorito, precisao=0.01, bloco=100, n_max=10_000
+        )
+        self.assertTrue(resultado["atingiu"])
+        self.assertLess(resultado["n"], 1000)
+        self.assertEqual(resultado["estatisticas"]["a"]["campeao"], resultado["n"])
+        self.assertEqual(
+            len(resultado["estatisticas"]["b"]["posicoes"]), resultado["n"]
+        )
+        self.assertEqual(resultado["partidas"], [])
+
+    def test_torneios_vetorizados_repetem_com_a_semente(self):
+        matriz = np.array(
+            [
+                [0.5, 0.9, 0.9, 0.9],
+                [0.1, 0.5, 0.6, 0.6],
+                [0.1, 0.4, 0.5, 0.5],
+                [0.1, 0.4, 0.5, 0.5],
+            ]
+        )
+        a, b = (
+            simular_torneios_ate_precisao(
+                TIMES, None, precisao=0.02, bloco=500, matriz=matriz, semente=9
+            )
+            for _ in range(2)
+        )
+        self.assertEqual(a["n"], b["n"])
+        self.assertEqual(a["intervalos"], b["intervalos"])
+        self.assertAlmostEqual(
+            a["estatisticas"]["a"]["vitorias_media"],
+            a["estatisticas"]["a"]["vitorias_total"] / a["n"],
+        )
+
+    def test_parametros_invalidos(self):
+        with self.assertRaises(ValueError):
+            simular_torneios_ate_precisao(TIMES, _partida_favorito, precisao=0)
+
+
+if __name__ == "__main__":
+    unittest.main()
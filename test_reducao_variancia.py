@@ -0,0 +1,81 @@
+# test_reducao_variancia.py
+import unittest
+import numpy as np
+from motor_vetorizado import FluxoComum, simular_mapas_vetorizado
+from reducao_variancia import (
+    comparar_escalacoes,
+    comparar_overs,
+    diferenca_pareada,
+    estimar_vitoria,
+    media_antitetica,
+    over_com_substituicao,
+)
+
+
+class TestFluxoComum(unittest.TestCase):
+    def test_round_nao_depende_dos_outros_mapas(self):
+        fluxo = FluxoComum(5)
+        # O mapa 0 joga igual sozinho ou ao lado de um confronto desigual
+        sozinho = simular_mapas_vetorizado([84.0], [82.0], ["Nuke"], fluxo=fluxo)
+        junto = simular_mapas_vetorizado(
+            [84.0, 95.0], [82.0, 70.0], ["Nuke", "Mirage"], fluxo=FluxoComum(5)
+        )
+        self.assertEqual(sozinho[0][0], junto[0][0])
+        self.assertEqual(sozinho[1][0], junto[1][0])
+
+    def test_antitetico(self):
+        u = FluxoComum(3, antitetico=True).uniformes(0, 6)
+        np.testing.assert_allclose(u[:, :3] + u[:, 3:], 1.0)
+
+
+class TestComparacao(unittest.TestCase):
+    def test_cenarios_iguais_tem_diferenca_zero(self):
+        r = comparar_overs(83.0, 83.0, 81.0, n=500, semente=1)
+        self.assertEqual(r["diferenca"], (0.0, 0.0, 0.0))
+        self.assertEqual(r["vitoria_a"], r["vitoria_b"])
+
+    def test_crn_estreita_o_intervalo(self):
+        n = 4000
+        r = comparar_overs(82.0, 82.5, 81.0, n=n, semente=2)
+        _, baixo, alto = r["diferenca"]
+        # Meia-largura de dois lotes independentes com as mesmas proporções
+        independente = 1.96 * np.sqrt(
+            (
+                r["vitoria_a"] * (1 - r["vitoria_a"])
+                + r["vitoria_b"] * (1 - r["vitoria_b"])
+            )
+            / n
+        )
+        self.assertLess((alto - baixo) / 2, independente / 2)
+        self.assertGreater(r["correlacao"], 0.8)
+        self.assertLess(alto, 0.0)  # over maior ganha mais
+
+    def test_antitetico_estreita_o_intervalo(self):
+        p, baixo, alto = estimar_vitoria(82.0, 81.0, n=4000, semente=4)
+        _, baixo_simples, alto_simples = estimar_vitoria(
+            82.0, 81.0, n=4000, semente=4, antitetico=False
+        )
+        self.assertLess(baixo, p)
+        self.assertLess(alto - baixo, alto_simples - baixo_simples)
+
+    def test_intervalos(self):
+        media, baixo, alto = diferenca_pareada([1, 1, 0, 1], [0, 1, 0, 0])
+        self.assertEqual(media, 0.5)
+        self.assertLess(baixo, 0.5)
+        self.assertEqual(media_antitetica([1, 0, 0, 1])[0], 0.5)
+        with self.assertRaises(ValueError):
+            media_antitetica([1, 0, 1])
+        with self.assertRaises(ValueError):
+            diferenca_pareada([1, 0], [1])
+
+    def test_escalacoes(self):
+        base = over_com_substituicao("furia", "yuurih", 0.0)
+        self.assertLess(base, over_com_substituicao("furia", "yuurih", 99.0))
+        with self.assertRaises(ValueError):
+            over_com_substituicao("furia", "coldzera", 90.0)
+        r = comparar_escalacoes("furia", "mibr", "yuurih", 99.0, n=200, semente=1)
+        self.assertLessEqual(r["diferenca"][0], 0.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
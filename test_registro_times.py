@@ -0,0 +1,74 @@
+# test_registro_times.py
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+from registro_times import RegistroTimes, obter_registro
+
+
+def _escrever(caminho, conteudo):
+    with open(caminho, "w", newline="", encoding="utf-8") as f:
+        f.write(conteudo)
+
+
+class TestRegistroTimes(unittest.TestCase):
+    def setUp(self):
+        self._tmpdir = tempfile.TemporaryDirectory()
+        self.arq_times = os.path.join(self._tmpdir.name, "times.csv")
+        self.arq_jogadores = os.path.join(self._tmpdir.name, "jogadores.csv")
+        _escrever(self.arq_times, "Furia,🐍,BLACK\nPain,💀,RED\n")
+        _escrever(
+            self.arq_jogadores,
+            "nick,nacionalidade,funcao,over,time\n"
+            "a,BR,AWP,90,Furia\n"
+            "b,BR,Entry,80,Furia\n"
+            "c,BR,Rifler,70,Pain\n",
+        )
+        self.registro = RegistroTimes(self.arq_times, self.arq_jogadores)
+
+    def tearDown(self):
+        self._tmpdir.cleanup()
+
+    def test_over_medio_normaliza_nome(self):
+        self.assertEqual(self.registro.over_medio("FURIA "), 85.0)
+        self.assertEqual(self.registro.over_medio("pain"), 70.0)
+
+    def test_time_sem_jogadores(self):
+        with self.assertRaises(ValueError):
+            self.registro.over_medio("Liquid")
+
+    def test_csv_lido_uma_vez_so(self):
+        self.registro.over_medio("furia")
+        with patch("builtins.open") as mock_open:
+            self.registro.over_medio("pain")
+            self.registro.jogadores("furia")
+        mock_open.assert_not_called()
+
+    def test_recarrega_quando_arquivo_muda(self):
+        self.assertEqual(self.registro.over_medio("pain"), 70.0)
+        _escrever(
+            self.arq_jogadores,
+            "nick,nacionalidade,funcao,over,time\nc,BR,Rifler,76,Pain\n",
+        )
+        self.assertEqual(self.registro.over_medio("pain"), 76.0)
+
+    def test_jogadores_sao_copias_novas(self):
+        primeira = self.registro.jogadores("furia")
+        primeira[0]["estatisticas"]["total"]["kills"] = 10
+        segunda = self.registro.jogadores("furia")
+        self.assertEqual(segunda[0]["estatisticas"]["total"]["kills"], 0)
+        self.assertEqual(segunda[0]["time"], "furia")
+        self.assertAlmostEqual(segunda[0]["over"], 90 / 80)
+
+    def test_times_config(self):
+        config = self.registro.times_config()
+        self.assertEqual(config["furia"]["emoji"], "🐍")
+
+    def test_obter_registro_compartilhado(self):
+        r1 = obter_registro(self.arq_times, self.arq_jogadores)
+        r2 = obter_registro(self.arq_times, self.arq_jogadores)
+        self.assertIs(r1, r2)
+
+
+if __name__ == "__main__":
+    unittest.main()
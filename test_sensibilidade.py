@@ -0,0 +1,143 @@
+# test_sensibilidade.py
+import os
+import shutil
+import tempfile
+import unittest
+import gerador_kills_deaths
+from gerador_kills_deaths import CONFIG_COMBATE, _pesos_combate
+from matriz_confronto import construir_matriz_confronto
+from odds_exatas import odds_mata_mata
+from registro_times import RegistroTimes, obter_registro
+from sensibilidade import analisar_sensibilidade, kills_por_round
+
+TIMES = ["furia", "mibr", "pain", "legacy"]
+
+
+class TestSensibilidade(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.matriz = construir_matriz_confronto(TIMES, arquivo=None, processos=1)
+
+    def test_sem_perturbacao_nao_muda_nada(self):
+        r = analisar_sensibilidade(TIMES, matriz=self.matriz)
+        self.assertEqual(r["recalculados"], [])
+        self.assertEqual(r["base"], r["cenario"])
+        self.assertTrue(all(d["campeao"] == 0.0 for d in r["deltas"].values()))
+
+    def test_over_so_recalcula_os_confrontos_do_time(self):
+        r = analisar_sensibilidade(TIMES, overs={"molodoy": 95.0}, matriz=self.matriz)
+        self.assertEqual(len(r["recalculados"]), 2 * (len(TIMES) - 1))
+        self.assertTrue(all("furia" in par for par in r["recalculados"]))
+        self.assertGreater(r["deltas"]["furia"]["campeao"], 0.0)
+        self.assertAlmostEqual(sum(d["campeao"] for d in r["deltas"].values()), 0.0)
+        self.assertGreater(r["deltas_jogadores"]["Molodoy"]["kills"], 0.0)
+        # A matriz base não é alterada
+        self.assertEqual(
+            odds_mata_mata(TIMES, self.matriz),
+            {t: d["avancos"] for t, d in r["base"].items()},
+        )
+
+    def test_pesos_nao_mudam_as_chances_nem_os_globais(self):
+        antes = dict(gerador_kills_deaths.CONFIG_COMBATE)
+        r = analisar_sensibilidade(
+            TIMES,
+            role_weights={"kill": {"AWP": 1.5}},
+            config_combate={"CHANCE_4_A_5_KILLS": 0.5},
+            formato="double_elimination",
+            matriz=self.matriz,
+        )
+        self.assertEqual(gerador_kills_deaths.CONFIG_COMBATE, antes)
+        self.assertEqual(gerador_kills_deaths.ROLE_WEIGHTS["kill"]["AWP"], 1.0)
+        self.assertEqual(r["base"], r["cenario"])
+        self.assertGreater(r["deltas_jogadores"]["Molodoy"]["kills"], 0.0)
+        self.assertEqual(r["deltas_jogadores"]["Molodoy"]["deaths"], 0.0)
+        self.assertLess(
+            r["kills_por_round"]["cenario"]["vencedor"],
+            r["kills_por_round"]["base"]["vencedor"],
+        )
+
+    def test_participacao_igual_a_da_simulacao(self):
+        for alteracao in ({"BASE_PESO": 2.0}, {"MULTIPLICADOR_OVER": 0.5}):
+            r = analisar_sensibilidade(
+                TIMES, config_combate=alteracao, matriz=self.matriz
+            )
+            config = {**CONFIG_COMBATE, **alteracao}
+            jogadores = obter_registro().jogadores("furia")
+            for tipo, campo in (("kill", "kills"), ("death", "deaths")):
+                pesos = _pesos_combate(jogadores, tipo)
+                novos = _pesos_combate(jogadores, tipo, config)
+                for jogador, peso, novo in zip(jogadores, pesos, novos):
+                    nick = jogador["nome"]
+                    self.assertAlmostEqual(
+                        r["jogadores"][nick][campo], novo / sum(novos)
+                    )
+                    self.assertAlmostEqual(
+                        r["deltas_jogadores"][nick][campo],
+                        novo / sum(novos) - peso / sum(pesos),
+                    )
+
+    def test_matriz_base_usa_os_csvs_do_registro(self):
+        with tempfile.TemporaryDirectory() as pasta:
+            # Nomes diferentes dos padrão, para nada cair no TIMES_CSV/JOGADORES_CSV
+            arquivo_times = shutil.copy("times.csv", os.path.join(pasta, "t.csv"))
+            arquivo_jogadores = os.path.join(pasta, "j.csv")
+            with open("jogadores.csv", encoding="utf-8") as f:
+                linhas = f.read().replace("Molodoy,KZ,AWP,88", "Molodoy,KZ,AWP,99")
+            with open(arquivo_jogadores, "w", encoding="utf-8") as f:
+                f.write(linhas)
+            diretorio = os.getcwd()
+            os.chdir(pasta)  # o cache em disco da matriz fica na pasta temporária
+            try:
+                r = analisar_sensibilidade(
+                    TIMES,
+                    registro=RegistroTimes(arquivo_times, arquivo_jogadores),
+                    processos=1,
+                )
+                esperada = construir_matriz_confronto(
+                    TIMES,
+                    arquivo=None,
+                    processos=1,
+                    arquivo_times=arquivo_times,
+                    arquivo_jogadores=arquivo_jogadores,
+                )
+            finally:
+                os.chdir(diretorio)
+        self.assertEqual(r["recalculados"], [])
+        self.assertEqual(
+            {t: d["avancos"] for t, d in r["base"].items()},
+            odds_mata_mata(TIMES, esperada),
+        )
+        self.assertNotEqual(
+            odds_mata_mata(TIMES, esperada), odds_mata_mata(TIMES, self.matriz)
+        )
+
+    def test_grupos(self):
+        r = analisar_sensibilidade(
+            overs={"molodoy": 70.0},
+            formato="grupos",
+            grupos=[TIMES[:2], TIMES[2:]],
+            num_classificados=1,
+            matriz=self.matriz,
+        )
+        self.assertLess(r["deltas"]["furia"]["classifica"], 0.0)
+
+    def test_kills_por_round(self):
+        # Perdedor sempre mata menos que o vencedor: média (k - 1) / 2
+        esperado = kills_por_round(
+            {"CHANCE_4_A_5_KILLS": 1.0, "CHANCE_PERDEDOR_MATA": 1.0}
+        )
+        self.assertEqual(esperado, {"vencedor": 4.5, "perdedor": 1.75})
+
+    def test_entradas_invalidas(self):
+        for kwargs in (
+            {"overs": {"coldzera": 90.0}},
+            {"config_combate": {"NAO_EXISTE": 1.0}},
+            {"role_weights": {"assist": {"AWP": 1.0}}},
+            {"formato": "suico"},
+        ):
+            with self.assertRaises(ValueError):
+                analisar_sensibilidade(TIMES, matriz=self.matriz, **kwargs)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -12,8 +12,18 @@ from funcoes_simulacao_deepseek import (
     times,
     calcular_over_medio,
     decidir_vencedor_round,
+    calcular_probabilidade_vitoria,
 )
-from estrategias_deepseek import estrategia_resultado
+from estrategias_deepseek import (
+    estrategia_resultado,
+    resultado_estrategias,
+    _compilar_regras,
+    RESULTADO_CT,
+    RESULTADO_ALEATORIO,
+)
+from contexto_simulacao import ContextoSimulacao
+from modelo_round import probabilidade_ct, probabilidade_ct_exata
+from saida_simulacao import Saida, SaidaNula, SaidaTerminal, SaidaLog
 
 # ==================== TESTES UNITÁRIOS ====================
 times.extend(["Furia", "G2"])
@@ -63,6 +73,27 @@ class TestEstrategiaResultado(unittest.TestCase):
         with self.assertRaises(ValueError):
             estrategia_resultado("1", "1", "MapaInexistente")
 
+    def test_indice_inteiro_usa_as_regras(self):
+        # escolher_estrategia devolve índices base 0: 0 equivale ao rótulo "1"
+        with patch("estrategias_deepseek.random.choice") as mock_choice:
+            self.assertEqual(estrategia_resultado(0, 0, "Mirage"), "ct")
+            self.assertEqual(estrategia_resultado(0, 1, "Mirage"), "tr")
+        mock_choice.assert_not_called()
+
+    def test_regra_duplicada_prioriza_ct(self):
+        # ("3", "4") aparece em ct_vence e tr_vence de Nuke
+        self.assertEqual(resultado_estrategias("3", "4", "Nuke"), RESULTADO_CT)
+
+    def test_indice_fora_da_matriz_e_aleatorio(self):
+        self.assertEqual(resultado_estrategias(-1, 0, "Mirage"), RESULTADO_ALEATORIO)
+        self.assertEqual(resultado_estrategias(0, 99, "Mirage"), RESULTADO_ALEATORIO)
+
+    def test_regra_invalida_e_rejeitada(self):
+        regras = {"Mirage": {"ct_vence": [("8", "1")], "tr_vence": []}}
+        estrategias = {"Mirage": {"ct": ["a"] * 7, "tr": ["b"] * 7}}
+        with self.assertRaises(ValueError):
+            _compilar_regras(regras, estrategias)
+
 
 class TestDecidirVencedorRound(unittest.TestCase):
     @patch("funcoes_simulacao_deepseek.calcular_probabilidade_vitoria")
@@ -88,6 +119,47 @@ class TestDecidirVencedorRound(unittest.TestCase):
         self.assertGreater(tr_wins, 55)
 
 
+class TestProbabilidadeExata(unittest.TestCase):
+    def _integral_numerica(self, diferenca, lado, estrategia, passos=20000):
+        # Regra do ponto médio sobre U ~ Uniforme(-1, 1), com o score antigo
+        import math
+
+        total = 0.0
+        for i in range(passos):
+            u = -1 + (i + 0.5) * 2 / passos
+            score = 0.3 * diferenca + 0.3 * lado + 0.6 * estrategia + 1.2 * u
+            total += 1 / (1 + math.exp(-0.1 * score))
+        return total / passos
+
+    def test_formula_fechada_bate_com_integral(self):
+        for diferenca, lado, estrategia in [(8, 1, 1), (-5, 1, -1), (30, -1, 1)]:
+            self.assertAlmostEqual(
+                probabilidade_ct_exata(diferenca, lado, estrategia),
+                self._integral_numerica(diferenca, lado, estrategia),
+                places=7,
+            )
+
+    def test_sem_regra_e_media_dos_dois_lados(self):
+        media = (probabilidade_ct_exata(4, 1, 1) + probabilidade_ct_exata(4, 1, -1)) / 2
+        self.assertAlmostEqual(probabilidade_ct_exata(4, 1, 0), media)
+
+    def test_tabela_igual_a_exata(self):
+        self.assertAlmostEqual(
+            probabilidade_ct(5.4, 1, 1), probabilidade_ct_exata(5.4, 1, 1)
+        )
+
+    def test_calcular_probabilidade_nao_sorteia(self):
+        with patch("random.uniform") as mock_uniform, patch(
+            "random.choice"
+        ) as mock_choice:
+            p1 = calcular_probabilidade_vitoria(85, 80, "ct", 0, 0, "Mirage")
+            p2 = calcular_probabilidade_vitoria(85, 80, "ct", 0, 0, "Mirage")
+        mock_uniform.assert_not_called()
+        mock_choice.assert_not_called()
+        self.assertEqual(p1, p2)
+        self.assertAlmostEqual(p1, probabilidade_ct_exata(5, 1, 1))
+
+
 class TestJogarHalf(unittest.TestCase):
     @patch("funcoes_simulacao_deepseek.escolher_estrategia")
     @patch("funcoes_simulacao_deepseek.calcular_over_medio")
@@ -125,32 +197,72 @@ class TestJogarHalf(unittest.TestCase):
         self.assertEqual(tr, 6)
 
 
+class TestSaidaSimulacao(unittest.TestCase):
+    @patch("funcoes_simulacao_deepseek.calcular_over_medio", return_value=80.0)
+    def test_half_com_saida_nula_nao_imprime(self, mock_over):
+        with patch("builtins.print") as mock_print:
+            jogar_half("Furia", "G2", [], [], "Dust2", "auto", saida=SaidaNula())
+        mock_print.assert_not_called()
+
+    def test_terminal_com_buffer_so_escreve_ao_descarregar(self):
+        saida = SaidaTerminal(buffer_linhas=10)
+        with patch("sys.stdout") as mock_stdout:
+            saida.escrever("linha 1")
+            saida.escrever("linha 2")
+            mock_stdout.write.assert_not_called()
+            saida.descarregar()
+        mock_stdout.write.assert_called_once_with("linha 1\nlinha 2\n")
+
+    def test_log_remove_cores(self):
+        logger = MagicMock()
+        SaidaLog(logger=logger).escrever("\x1b[31mFuria\x1b[0m venceu")
+        logger.log.assert_called_once()
+        self.assertEqual(logger.log.call_args.args[1], "Furia venceu")
+
+    def test_saida_exige_escrever(self):
+        class SemEscrever(Saida):
+            pass
+
+        with self.assertRaises(TypeError):
+            SemEscrever()
+
+
+def _half(pontos_ct, pontos_tr):
+    """Gerador de half sem rounds, que só devolve o placar (como o mock
+    antigo de jogar_half)."""
+    return pontos_ct, pontos_tr
+    yield
+
+
 class TestJogarMapa(unittest.TestCase):
-    @patch("funcoes_simulacao_deepseek.jogar_half")
+    @patch("funcoes_simulacao_deepseek.eventos_half")
     def test_mapa_completo(self, mock_half):
-        mock_half.side_effect = [(10, 2), (5, 3)]  # Primeiro half: 10-2, segundo: 5-3
+        mock_half.side_effect = [
+            _half(10, 2),
+            _half(5, 3),
+        ]  # Primeiro half: 10-2, segundo: 5-3
 
         resultado = jogar_mapa("Furia", "G2", "Dust2", "auto", [], [])
         self.assertEqual(resultado.placar_time1, 13)  # 10 + 3 = 13
         self.assertEqual(resultado.placar_time2, 7)  # 2 + 5 = 7
 
-    @patch("funcoes_simulacao_deepseek.jogar_half")
+    @patch("funcoes_simulacao_deepseek.eventos_half")
     def test_vitoria_rapida(self, mock_half):
-        mock_half.return_value = (13, 0)  # Vitória no primeiro half
+        mock_half.side_effect = [_half(13, 0)]  # Vitória no primeiro half
         resultado = jogar_mapa("Furia", "G2", "Dust2", "auto", [], [])
         self.assertEqual(resultado.placar_time1, 13)
         self.assertEqual(resultado.placar_time2, 0)
 
-    @patch("funcoes_simulacao_deepseek.jogar_half")
+    @patch("funcoes_simulacao_deepseek.eventos_half")
     def test_overtime(self, mock_half):
         # Primeiro half: empate 10-10
         # Segundo half: empate 3-3 (total 13-13)
         # Overtime: Furia vence 4-2
         mock_half.side_effect = [
-            (10, 10),  # Primeiro half
-            (3, 3),  # Segundo half (continuação)
-            (2, 1),  # Primeira parte do overtime (CT)
-            (1, 1),  # Segunda parte do overtime (TR)
+            _half(10, 10),  # Primeiro half
+            _half(3, 3),  # Segundo half (continuação)
+            _half(2, 1),  # Primeira parte do overtime (CT)
+            _half(1, 1),  # Segunda parte do overtime (TR)
         ]
 
         resultado = jogar_mapa("Furia", "G2", "Dust2", "auto", [], [])
@@ -162,8 +274,6 @@ class TestJogarPartida(unittest.TestCase):
     @patch("funcoes_simulacao_deepseek.mostrar_estatisticas_finais")
     @patch("funcoes_simulacao_deepseek.mostrar_estatisticas_por_mapa")
     @patch("funcoes_simulacao_deepseek.carregar_times_config")
-    @patch("funcoes_simulacao_deepseek.obter_jogadores")
-    @patch("funcoes_simulacao_deepseek.carregar_jogadores_de_arquivo")
     @patch("funcoes_simulacao_deepseek.vetar_e_escolher_mapas")
     @patch("funcoes_simulacao_deepseek.jogar_mapa")
     @patch("funcoes_simulacao_deepseek.calcular_over_medio")
@@ -172,8 +282,6 @@ class TestJogarPartida(unittest.TestCase):
         mock_over,
         mock_mapa,
         mock_vetar,
-        mock_carregar_csv,
-        mock_obter_jogadores,
         mock_config,
         mock_stats_mapa,
         mock_stats_finais,
@@ -186,9 +294,10 @@ class TestJogarPartida(unittest.TestCase):
         #    que aqui está mockado)
         mock_vetar.return_value = ["Dust2", "Inferno", "Mirage"]
         mock_over.return_value = 80.0  # Valor fixo para over
-        mock_carregar_csv.return_value = None
-        mock_obter_jogadores.return_value = []
         mock_config.return_value = {}
+        # Elencos vazios vindos de um registro injetado, sem ler os CSVs
+        registro = MagicMock()
+        registro.jogadores.return_value = []
 
         # 3. Criar objetos ResultadoMapa completos
         mock_mapa.side_effect = [
@@ -219,7 +328,12 @@ class TestJogarPartida(unittest.TestCase):
         ]
 
         # 4. Executar teste
-        resultado = jogar_partida(modo="auto", time1="Furia", time2="G2")
+        resultado = jogar_partida(
+            modo="auto",
+            time1="Furia",
+            time2="G2",
+            contexto=ContextoSimulacao(registro=registro),
+        )
 
         # 5. Verificações
         self.assertIsInstance(resultado, ResultadoPartida)
@@ -248,8 +362,6 @@ class TestIntegracao(unittest.TestCase):
     @patch("funcoes_simulacao_deepseek.mostrar_estatisticas_finais")
     @patch("funcoes_simulacao_deepseek.mostrar_estatisticas_por_mapa")
     @patch("funcoes_simulacao_deepseek.carregar_times_config")
-    @patch("funcoes_simulacao_deepseek.obter_jogadores")
-    @patch("funcoes_simulacao_deepseek.carregar_jogadores_de_arquivo")
     @patch("funcoes_simulacao_deepseek.vetar_e_escolher_mapas")
     @patch("funcoes_simulacao_deepseek.jogar_mapa")
     @patch("funcoes_simulacao_deepseek.calcular_over_medio")
@@ -258,8 +370,6 @@ class TestIntegracao(unittest.TestCase):
         mock_over,
         mock_mapa,
         mock_vetar,
-        mock_carregar_csv,
-        mock_obter_jogadores,
         mock_config,
         mock_stats_mapa,
         mock_stats_finais,
@@ -270,9 +380,10 @@ class TestIntegracao(unittest.TestCase):
         # 2. Configurar mocks
         mock_vetar.return_value = ["Dust2", "Inferno", "Mirage"]
         mock_over.return_value = 80.0  # Valor fixo para over
-        mock_carregar_csv.return_value = None
-        mock_obter_jogadores.return_value = []
         mock_config.return_value = {}
+        # Elencos vazios vindos de um registro injetado, sem ler os CSVs
+        registro = MagicMock()
+        registro.jogadores.return_value = []
 
         # 3. Criar objetos ResultadoMapa completos
         mock_mapa.side_effect = [
@@ -303,7 +414,12 @@ class TestIntegracao(unittest.TestCase):
         ]
 
         # 4. Executar teste
-        resultado = jogar_partida(modo="auto", time1="Furia", time2="G2")
+        resultado = jogar_partida(
+            modo="auto",
+            time1="Furia",
+            time2="G2",
+            contexto=ContextoSimulacao(registro=registro),
+        )
 
         # 5. Verificações
         self.assertIsNotNone(resultado)
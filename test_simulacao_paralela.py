@@ -0,0 +1,102 @@
+# test_simulacao_paralela.py
+import random
+import unittest
+from funcoes_simulacao_deepseek import (
+    ContadorPartidas,
+    ResultadoPartida,
+    simular_torneios_em_lote,
+)
+from simulacao_paralela import (
+    IDS_POR_FATIA,
+    sementes_das_fatias,
+    simular_partidas_paralelo,
+    tamanhos_das_fatias,
+)
+
+TIMES = ["a", "b", "c", "d", "e", "f", "g", "h"]
+
+
+def _partida_rapida(time1, time2, fase):
+    # Função de módulo: precisa ir por pickle para os processos
+    resultado = ResultadoPartida(
+        partida_id=ContadorPartidas.proxima_partida(), mapas=[], fase=fase
+    )
+    if random.random() < 0.5 + 0.05 * (TIMES.index(time2) - TIMES.index(time1)):
+        return time1, time2, resultado
+    return time2, time1, resultado
+
+
+class TestSimulacaoParalela(unittest.TestCase):
+    def test_fatias(self):
+        self.assertEqual(tamanhos_das_fatias(25, 10), [10, 10, 5])
+        self.assertEqual(sementes_das_fatias(3, 4), sementes_das_fatias(3, 4))
+        self.assertEqual(len(set(sementes_das_fatias(3, 4))), 4)
+        with self.assertRaises(ValueError):
+            tamanhos_das_fatias(0, 10)
+
+    def test_resultado_nao_depende_do_numero_de_processos(self):
+        sequencial = simular_partidas_paralelo(
+            "furia", "mibr", 12, workers=1, semente=11, por_fatia=4
+        )
+        paralelo = simular_partidas_paralelo(
+            "furia", "mibr", 12, workers=2, semente=11, por_fatia=4
+        )
+        self.assertEqual(sequencial, paralelo)
+        self.assertEqual(sum(sequencial["vitorias"].values()), 12)
+        self.assertEqual(set(sequencial["times_jogador"].values()), {"furia", "mibr"})
+        # Toda kill é a death de alguém do outro time
+        self.assertEqual(
+            sum(sequencial["kills"].values()), sum(sequencial["deaths"].values())
+        )
+
+    def test_nao_mexe_no_random_global(self):
+        random.seed(5)
+        esperado = random.random()
+        random.seed(5)
+        simular_partidas_paralelo("furia", "mibr", 2, workers=1, semente=1)
+        self.assertEqual(random.random(), esperado)
+
+
+class TestTorneiosParalelos(unittest.TestCase):
+    def _lote(self, workers):
+        return simular_torneios_em_lote(
+            TIMES, _partida_rapida, 30, workers=workers, semente=4
+        )
+
+    def _ids_relativos(self, workers):
+        primeiro = ContadorPartidas._id
+        resultado = self._lote(workers)
+        return resultado, [p.partida_id - primeiro for p in resultado["partidas"]]
+
+    def test_resultado_nao_depende_do_numero_de_processos(self):
+        um, ids_um = self._ids_relativos(1)
+        dois, ids_dois = self._ids_relativos(2)
+        self.assertEqual(um["estatisticas"], dois["estatisticas"])
+        self.assertEqual(um["ranking"], dois["ranking"])
+        self.assertEqual(ids_um, ids_dois)
+
+    def test_estrutura_e_ids(self):
+        from simulacao_paralela import TORNEIOS_POR_FATIA
+
+        resultado, ids = self._ids_relativos(2)
+        est = resultado["estatisticas"]
+        self.assertEqual(set(est), set(TIMES))
+        self.assertEqual(sum(e["campeao"] for e in est.values()), 30)
+        self.assertTrue(all(len(e["posicoes"]) == 30 for e in est.values()))
+        self.assertIn("posicao_media", est["a"])
+
+        # 7 partidas por torneio, ids únicos e com a fatia como prefixo
+        self.assertEqual(len(ids), 7 * 30)
+        self.assertEqual(len(set(ids)), len(ids))
+        fatias = [i // IDS_POR_FATIA for i in ids]
+        self.assertEqual(fatias, sorted(fatias))
+        self.assertEqual(fatias.count(0), 7 * min(30, TORNEIOS_POR_FATIA))
+        # O contador do processo pai segue depois das faixas usadas
+        self.assertGreater(
+            ContadorPartidas.proxima_partida(),
+            max(p.partida_id for p in resultado["partidas"]),
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,118 @@
+# test_sorteio_ponderado.py
+import random
+import unittest
+from unittest.mock import patch
+from gerador_kills_deaths import (
+    CONFIG_COMBATE,
+    Escalacao,
+    simular_kills_do_round,
+    sorteio_sem_repeticao_com_pesos,
+)
+from registro_times import montar_jogador
+from sorteio_ponderado import TabelaAlias
+
+
+class TestTabelaAlias(unittest.TestCase):
+    def test_com_reposicao_segue_os_pesos(self):
+        pesos = [1.0, 2.0, 3.0, 4.0]
+        tabela = TabelaAlias(pesos)
+        rng = random.Random(1)
+        n = 200000
+        contagem = [0] * 4
+        for _ in range(n):
+            contagem[tabela.sortear(rng)] += 1
+        for c, p in zip(contagem, pesos):
+            self.assertAlmostEqual(c / n, p / 10, delta=0.005)
+
+    def test_sem_reposicao_distintos_e_proporcionais(self):
+        pesos = [5.0, 1.0, 1.0, 3.0]
+        tabela = TabelaAlias(pesos)
+        rng = random.Random(2)
+        n = 100000
+        segundo = [0] * 4
+        for _ in range(n):
+            primeiro, seg = tabela.sortear_sem_reposicao(2, rng)
+            self.assertNotEqual(primeiro, seg)
+            if primeiro == 0:
+                segundo[seg] += 1
+        # Dado que o índice 0 saiu primeiro, o segundo é proporcional a [1, 1, 3]
+        total = sum(segundo)
+        self.assertAlmostEqual(segundo[3] / total, 0.6, delta=0.01)
+
+    def test_varredura_quando_sobra_pouca_massa(self):
+        # Depois do peso 100, sobra ~3% da massa: o resto vem da varredura
+        tabela = TabelaAlias([100.0, 1.0, 1.0, 1.0])
+        for semente in range(50):
+            escolhidos = tabela.sortear_sem_reposicao(4, random.Random(semente))
+            self.assertEqual(sorted(escolhidos), [0, 1, 2, 3])
+
+    def test_casos_de_borda(self):
+        self.assertEqual(TabelaAlias([0.0, 0.0]).sortear_sem_reposicao(1), [0])
+        self.assertEqual(TabelaAlias([]).sortear_sem_reposicao(3), [])
+        self.assertEqual(TabelaAlias([2.0]).sortear(), 0)
+        with self.assertRaises(ValueError):
+            TabelaAlias([1.0, -1.0])
+
+
+class TestKillsComAlias(unittest.TestCase):
+    def test_sorteio_sem_repeticao_mantem_interface(self):
+        populacao = ["a", "b", "c"]
+        escolhidos = sorteio_sem_repeticao_com_pesos(populacao, [1, 2, 3], 5)
+        self.assertEqual(sorted(escolhidos), populacao)
+
+    def test_round_registra_kills_e_deaths(self):
+        ct = [montar_jogador(f"ct{i}", "a", 80 + i, "Rifler") for i in range(5)]
+        tr = [montar_jogador(f"tr{i}", "b", 80, "Entry") for i in range(5)]
+        for _ in range(200):
+            simular_kills_do_round("ct", ct, tr, "Mirage", rng=random.Random(3))
+        kills = sum(j["estatisticas"]["total"]["kills"] for j in ct + tr)
+        deaths = sum(j["estatisticas"]["total"]["deaths"] for j in ct + tr)
+        self.assertEqual(kills, deaths)
+        self.assertGreater(kills, 0)
+
+    def test_round_sem_jogadores(self):
+        simular_kills_do_round("tr", [], [], "Mirage")
+
+
+class TestEscalacao(unittest.TestCase):
+    def setUp(self):
+        self.jogadores = [
+            montar_jogador(f"j{i}", "a", 76 + 2 * i, "Entry" if i else "AWP")
+            for i in range(5)
+        ]
+
+    def test_pesos_calculados_uma_vez(self):
+        escalacao = Escalacao(self.jogadores)
+        self.assertEqual(len(escalacao.pesos_kill), 5)
+        self.assertAlmostEqual(escalacao.soma_kill, sum(escalacao.pesos_kill))
+        # j1 tem over maior e é Entry (ROLE_WEIGHTS 1.1): morre mais que j0
+        self.assertGreater(escalacao.pesos_death[1], escalacao.pesos_death[0])
+
+        pesos = escalacao.pesos_kill
+        escalacao.tabelas()
+        self.assertIs(escalacao.pesos_kill, pesos)
+
+    def test_mudanca_de_config_invalida(self):
+        escalacao = Escalacao(self.jogadores)
+        antes = escalacao.soma_death
+        with patch.dict(CONFIG_COMBATE, {"BASE_PESO": 1.1}):
+            escalacao.tabelas()
+            self.assertAlmostEqual(escalacao.soma_death, antes + 5 * 1.0)
+        escalacao.tabelas()
+        self.assertAlmostEqual(escalacao.soma_death, antes)
+
+    def test_round_usa_a_lista_original(self):
+        outros = [montar_jogador(f"t{i}", "b", 80, "Rifler") for i in range(5)]
+        simular_kills_do_round(
+            "ct", Escalacao(self.jogadores), Escalacao(outros), "Nuke", rng=random
+        )
+        kills = sum(j["estatisticas"]["total"]["kills"] for j in self.jogadores)
+        self.assertGreater(kills, 0)
+
+    def test_lista_invalida(self):
+        with self.assertRaises(TypeError):
+            Escalacao("furia")
+
+
+if __name__ == "__main__":
+    unittest.main()
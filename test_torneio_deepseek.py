@@ -40,7 +40,7 @@ class TestTorneio(unittest.TestCase):
         """Sem time_usuario, nenhuma partida deve pedir interação: tudo é auto-simulado."""
         times4 = ["A", "B", "C", "D"]
 
-        def fake_simular(time1, time2, fase):
+        def fake_simular(time1, time2, fase, contexto=None):
             resultado = ResultadoPartida(partida_id=1, mapas=[])
             return time1, time2, resultado
 
@@ -69,13 +69,13 @@ class TestTorneio(unittest.TestCase):
         # Modo escolhido pelo usuário nas suas próprias partidas: "Partida Rápida"
         mock_opcao.return_value = 1
 
-        def fake_jogar_partida(modo, time1, time2, fase_torneio):
+        def fake_jogar_partida(modo, time1, time2, fase_torneio, contexto=None):
             resultado = ResultadoPartida(partida_id=1, mapas=[])
             resultado.vencedor = time1
             resultado.perdedor = time2
             return resultado
 
-        def fake_simular_auto(time1, time2, fase):
+        def fake_simular_auto(time1, time2, fase, contexto=None):
             resultado = ResultadoPartida(partida_id=2, mapas=[])
             return time1, time2, resultado
 
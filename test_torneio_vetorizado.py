@@ -0,0 +1,76 @@
+# test_torneio_vetorizado.py
+import random
+import unittest
+import numpy as np
+from funcoes_simulacao_deepseek import (
+    simular_torneio_mata_mata,
+    simular_torneios_em_lote,
+)
+from torneio_vetorizado import simular_chaves_vetorizado
+
+TIMES = ["a", "b", "c", "d", "e", "f", "g", "h"]
+
+
+def _matriz_forca():
+    # Time de índice menor é mais forte; a matriz não é simétrica de propósito
+    forca = np.linspace(2.0, 0.5, len(TIMES))
+    matriz = forca[:, None] / (forca[:, None] + forca[None, :])
+    matriz = np.clip(matriz + 0.03, 0, 1)
+    np.fill_diagonal(matriz, 0.5)
+    return matriz
+
+
+class TestTorneioVetorizado(unittest.TestCase):
+    def test_totais_consistentes(self):
+        n = 20000
+        est = simular_chaves_vetorizado(TIMES, _matriz_forca(), n, rng=5)
+        self.assertEqual(sum(e["campeao"] for e in est.values()), n)
+        self.assertEqual(sum(e["vice"] for e in est.values()), n)
+        self.assertEqual(sum(e["top4"] for e in est.values()), 2 * n)
+        # 7 partidas por torneio de 8 times
+        self.assertEqual(sum(e["vitorias_total"] for e in est.values()), 7 * n)
+        self.assertAlmostEqual(sum(e["posicao_media"] for e in est.values()), 36.0)
+
+    def test_bate_com_o_mata_mata_original(self):
+        matriz = _matriz_forca()
+        indice = {t: i for i, t in enumerate(TIMES)}
+
+        def partida(time1, time2, fase):
+            if random.random() < matriz[indice[time1], indice[time2]]:
+                return time1, time2, None
+            return time2, time1, None
+
+        random.seed(1)
+        n = 6000
+        posicoes = {t: 0 for t in TIMES}
+        titulos = {t: 0 for t in TIMES}
+        for _ in range(n):
+            ranking, _, _, _ = simular_torneio_mata_mata(TIMES[:], partida)
+            titulos[ranking[0]] += 1
+            for pos, time in enumerate(ranking, start=1):
+                posicoes[time] += pos
+
+        est = simular_chaves_vetorizado(TIMES, matriz, 200000, rng=2)
+        for time in TIMES:
+            self.assertAlmostEqual(
+                est[time]["posicao_media"], posicoes[time] / n, delta=0.12
+            )
+            self.assertAlmostEqual(
+                est[time]["campeao"] / 200000, titulos[time] / n, delta=0.02
+            )
+
+    def test_quantidade_de_times_invalida(self):
+        with self.assertRaises(ValueError):
+            simular_chaves_vetorizado(TIMES[:6], np.full((6, 6), 0.5), 10)
+
+    def test_lote_so_vencedores(self):
+        resultado = simular_torneios_em_lote(
+            TIMES, None, n=1000, matriz=_matriz_forca(), rng=3
+        )
+        self.assertEqual(resultado["partidas"], [])
+        self.assertEqual(resultado["ranking"][0], "a")
+        self.assertIn("vitorias_media", resultado["estatisticas"]["h"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,68 @@
+# test_veto_automatico.py
+import io
+import unittest
+from contextlib import redirect_stdout
+from unittest.mock import Mock, patch
+from contexto_simulacao import ContextoSimulacao
+from estrategias_deepseek import estrategias_por_mapa
+from funcoes_prejogo_deepseek import vetar_e_escolher_mapas
+from funcoes_simulacao_deepseek import simular_partida_auto
+from veto_automatico import chances_por_mapa, roteiro_veto, vetar_automatico
+
+POOL = tuple(estrategias_por_mapa)
+
+
+class TestVetoAutomatico(unittest.TestCase):
+    def test_sequencia_do_veto(self):
+        passos = roteiro_veto("a", "b", 84.0, 80.0)
+        self.assertEqual(
+            [(time, acao) for time, acao, _ in passos],
+            [
+                ("a", "ban"),
+                ("b", "ban"),
+                ("a", "pick"),
+                ("b", "pick"),
+                ("a", "ban"),
+                ("b", "ban"),
+                ("", "decisivo"),
+            ],
+        )
+        self.assertEqual(sorted(mapa for _, _, mapa in passos), sorted(POOL))
+
+    def test_cada_time_escolhe_pelo_proprio_interesse(self):
+        chance = dict(zip(POOL, chances_por_mapa(84.0, 80.0, POOL)))
+        passos = roteiro_veto("a", "b", 84.0, 80.0)
+        self.assertEqual(passos[0][2], min(chance, key=chance.get))
+        self.assertEqual(passos[1][2], max(chance, key=chance.get))
+        self.assertEqual(
+            vetar_automatico("a", "b", 84.0, 80.0),
+            [passos[2][2], passos[3][2], passos[6][2]],
+        )
+
+    def test_pool_pequeno(self):
+        with self.assertRaises(ValueError):
+            vetar_automatico("a", "b", 80.0, 80.0, mapas=POOL[:4])
+
+    def test_veto_interativo_sem_input_no_modo_automatico(self):
+        with patch("builtins.input", side_effect=AssertionError("input")):
+            mapas = vetar_e_escolher_mapas("furia", "mibr", automatico=True)
+        self.assertEqual(mapas, vetar_automatico("furia", "mibr"))
+
+    def test_veto_automatico_usa_o_registro_passado(self):
+        registro = Mock(over_medio={"x": 84.0, "y": 80.0}.get)
+        mapas = vetar_e_escolher_mapas("x", "y", automatico=True, registro=registro)
+        self.assertEqual(mapas, vetar_automatico("x", "y", 84.0, 80.0))
+
+    def test_partida_auto_usa_o_veto(self):
+        with redirect_stdout(io.StringIO()):
+            _, _, resultado = simular_partida_auto(
+                "furia", "mibr", "final", contexto=ContextoSimulacao(1)
+            )
+        esperados = vetar_automatico("furia", "mibr")
+        self.assertEqual(
+            [m.mapa for m in resultado.mapas], esperados[: len(resultado.mapas)]
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,151 @@
+"""Monte Carlo de chaves de mata-mata em lote (NumPy), só com vencedores.
+
+`simular_torneios_em_lote` chama `simular_torneio_mata_mata` n vezes, e
+cada torneio joga todas as partidas round a round e guarda cada
+`ResultadoPartida`. Para perguntas como "qual a chance de cada time ser
+campeão?", nada disso é necessário: basta a chance de cada confronto
+(matriz_confronto.py) e um sorteio por partida.
+
+Aqui cada linha de um array é um torneio, e cada fase da chave é jogada em
+todos os torneios de uma vez:
+
+- a chave é sorteada como no `random.shuffle` de `simular_torneio_mata_mata`
+  e os confrontos são (0x1, 2x3, ...), com o primeiro de cada par como
+  time 1;
+- o vencedor sai de um sorteio contra matriz[time1, time2];
+- o ranking final segue a mesma regra: mais vitórias primeiro, menos
+  derrotas depois e, no empate, a ordem original de `times`.
+"""
+
+from typing import Dict, List, Sequence, Union
+import numpy as np
+
+GeradorOuSemente = Union[np.random.Generator, int, None]
+
+# Torneios por bloco: limita a memória (alguns MB por bloco) sem perder o
+# ganho da vetorização.
+TORNEIOS_POR_BLOCO = 1 << 18
+
+
+def _matriz_como_array(times: Sequence[str], matriz) -> np.ndarray:
+    """Aceita uma MatrizConfronto ou um array (N, N) já na ordem de `times`."""
+    if hasattr(matriz, "prob_vitoria"):
+        return np.array(
+            [
+                [0.5 if a == b else matriz.prob_vitoria(a, b) for b in times]
+                for a in times
+            ]
+        )
+    array = np.asarray(matriz, dtype=np.float64)
+    if array.shape != (len(times), len(times)):
+        raise ValueError("A matriz de confrontos deve ter formato (N, N)")
+    return array
+
+
+def _jogar_bloco(
+    probabilidades: np.ndarray, n: int, rng: np.random.Generator
+) -> Dict[str, np.ndarray]:
+    """Joga n chaves e devolve os totais por time (arrays de tamanho N)."""
+    total_times = len(probabilidades)
+    totais = {
+        chave: np.zeros(total_times, dtype=np.int64)
+        for chave in ("vitorias", "posicoes", "campeao", "vice", "top4")
+    }
+
+    def contar(times: np.ndarray) -> np.ndarray:
+        return np.bincount(times.ravel(), minlength=total_times)
+
+    # Um embaralhamento só, no começo (argsort de chaves uniformes dá uma
+    # permutação uniforme por linha). simular_torneio_mata_mata reembaralha
+    # os vivos a cada fase, mas a distribuição é a mesma: trocar a ordem
+    # dos confrontos de uma fase não muda quem vence cada um, então, dado
+    # quem passou, a ordem dos classificados já é uniforme.
+    vivos = np.argsort(rng.random((n, total_times)), axis=1)
+    tabela = probabilidades.ravel()
+
+    while vivos.shape[1] > 1:
+        time1, time2 = vivos[:, 0::2], vivos[:, 1::2]
+        chance_time1 = tabela[time1 * total_times + time2]
+        venceu_time1 = rng.random(time1.shape) < chance_time1
+        vivos = np.where(venceu_time1, time1, time2)
+        eliminados = np.where(venceu_time1, time2, time1)
+        totais["vitorias"] += contar(vivos)
+
+        # Ranking de simular_torneio_mata_mata: mais vitórias primeiro,
+        # menos derrotas depois e, no empate, a ordem original de `times`.
+        # Quem cai nesta fase fica logo abaixo de todos os `vivos` (que têm
+        # mais vitórias), na ordem dos índices originais.
+        eliminados = np.sort(eliminados, axis=1)
+        for j in range(eliminados.shape[1]):
+            posicao = vivos.shape[1] + j + 1
+            quantos = contar(eliminados[:, j])
+            totais["posicoes"] += quantos * posicao
+            if posicao == 2:
+                totais["vice"] += quantos
+            elif posicao in (3, 4):
+                totais["top4"] += quantos
+
+    totais["campeao"] += contar(vivos)
+    totais["posicoes"] += totais["campeao"]
+    return totais
+
+
+def simular_chaves_vetorizado(
+    times: Sequence[str],
+    matriz,
+    n: int,
+    rng: GeradorOuSemente = None,
+) -> Dict[str, Dict[str, float]]:
+    """Simula n chaves de mata-mata e devolve as estatísticas por time.
+
+    Args:
+        times: Times da chave (potência de 2, como no menu: 4, 8 ou 16).
+        matriz: MatrizConfronto ou array (N, N) com P(linha vence coluna).
+        n: Número de torneios.
+        rng: Gerador NumPy (ou semente).
+
+    Returns:
+        O mesmo dicionário `estatisticas` de `simular_torneios_em_lote`
+        (campeao, vice, top4, posicao_media, vitorias_media, vitorias,
+        derrotas...), exceto a lista `posicoes` de cada torneio, que não é
+        guardada.
+    """
+    total_times = len(times)
+    if total_times < 2 or total_times & (total_times - 1):
+        raise ValueError("O mata-mata precisa de uma quantidade de times potência de 2")
+    if n < 1:
+        raise ValueError("n deve ser pelo menos 1")
+
+    probabilidades = _matriz_como_array(times, matriz)
+    rng = np.random.default_rng(rng)
+
+    totais = {}
+    restantes = n
+    while restantes:
+        tamanho = min(restantes, TORNEIOS_POR_BLOCO)
+        for chave, valores in _jogar_bloco(probabilidades, tamanho, rng).items():
+            totais[chave] = totais.get(chave, 0) + valores
+        restantes -= tamanho
+
+    estatisticas = {}
+    for i, time in enumerate(times):
+        # Todo time perde exatamente uma vez, menos o campeão.
+        derrotas = n - int(totais["campeao"][i])
+        vitorias = int(totais["vitorias"][i])
+        estatisticas[time] = {
+            "campeao": int(totais["campeao"][i]),
+            "vice": int(totais["vice"][i]),
+            "top4": int(totais["top4"][i]),
+            "vitorias_total": vitorias,
+            "derrotas_total": derrotas,
+            "posicao_media": float(totais["posicoes"][i]) / n,
+            "vitorias_media": vitorias / n,
+            "vitorias": vitorias,
+            "derrotas": derrotas,
+        }
+    return estatisticas
+
+
+def ranking_por_posicao_media(estatisticas: Dict[str, Dict[str, float]]) -> List[str]:
+    """Times do melhor para o pior posicionamento médio."""
+    return sorted(estatisticas, key=lambda t: estatisticas[t]["posicao_media"])
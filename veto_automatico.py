@@ -0,0 +1,109 @@
+"""Veto de mapas automático, sem `input()`.
+
+`vetar_e_escolher_mapas` pergunta cada ban e pick no terminal, então uma
+partida "auto" parava esperando o usuário, e os lotes
+(`simular_partida_auto`, `simular_partidas_em_lote_auto`) pulavam o veto
+sorteando três mapas quaisquer.
+
+Aqui o veto segue a mesma sequência do interativo — time 1 bane, time 2
+bane, time 1 escolhe, time 2 escolhe, e os dois continuam banindo até sobrar
+o decisivo — com cada time decidindo pela chance de vitória em cada mapa:
+bane o mapa em que tem menos chance e escolhe o que tem mais. As chances são
+as exatas de distribuicao_exata.py, com o time 1 começando de CT (como em
+`jogar_mapa`).
+
+A chance num mapa só depende dos overs médios dos dois times, então a
+tabela (uma chance por mapa) é calculada uma vez por par de overs e fica em
+cache. Depois disso, um veto é só percorrer sete números.
+"""
+
+from functools import lru_cache
+from typing import List, Optional, Sequence, Tuple
+from distribuicao_exata import distribuicao_exata_mapa
+from estrategias_deepseek import estrategias_por_mapa
+from registro_times import RegistroTimes, obter_registro
+
+# (time, "ban" | "pick" | "decisivo", mapa)
+PassoVeto = Tuple[str, str, str]
+
+
+@lru_cache(maxsize=4096)
+def chances_por_mapa(
+    over_time1: float, over_time2: float, mapas: Tuple[str, ...]
+) -> Tuple[float, ...]:
+    """Chance do time 1 vencer cada mapa de `mapas`, começando de CT."""
+    return tuple(
+        distribuicao_exata_mapa(
+            "time1", "time2", mapa, over_time1, over_time2
+        ).prob_vitoria_time1
+        for mapa in mapas
+    )
+
+
+def roteiro_veto(
+    time1: str,
+    time2: str,
+    over_time1: Optional[float] = None,
+    over_time2: Optional[float] = None,
+    mapas: Optional[Sequence[str]] = None,
+    registro: Optional[RegistroTimes] = None,
+) -> List[PassoVeto]:
+    """Todos os passos do veto, na ordem em que acontecem.
+
+    Args:
+        over_time1, over_time2: Overs médios, se já conhecidos (padrão: os
+            do registro de times).
+        mapas: Pool do veto (padrão: todos de estrategias_por_mapa). Precisa
+            de pelo menos 5 mapas (dois bans antes dos picks e um decisivo).
+    """
+    pool = tuple(mapas) if mapas is not None else tuple(estrategias_por_mapa)
+    if len(pool) < 5:
+        raise ValueError("Mínimo de 5 mapas necessário para veto")
+    if over_time1 is None or over_time2 is None:
+        registro = registro if registro is not None else obter_registro()
+        if over_time1 is None:
+            over_time1 = registro.over_medio(time1)
+        if over_time2 is None:
+            over_time2 = registro.over_medio(time2)
+
+    chance = dict(zip(pool, chances_por_mapa(over_time1, over_time2, pool)))
+    disponiveis = list(pool)
+    passos: List[PassoVeto] = []
+
+    def escolher(time: str, acao: str) -> None:
+        # O time 1 quer a maior chance dele; o time 2, a menor. Ban é o oposto.
+        melhor_para_time1 = (time == time1) == (acao == "pick")
+        criterio = max if melhor_para_time1 else min
+        mapa = criterio(disponiveis, key=chance.__getitem__)
+        disponiveis.remove(mapa)
+        passos.append((time, acao, mapa))
+
+    escolher(time1, "ban")
+    escolher(time2, "ban")
+    escolher(time1, "pick")
+    escolher(time2, "pick")
+    vez = 0
+    while len(disponiveis) > 1:
+        escolher(time1 if vez % 2 == 0 else time2, "ban")
+        vez += 1
+    passos.append(("", "decisivo", disponiveis[0]))
+    return passos
+
+
+def vetar_automatico(
+    time1: str,
+    time2: str,
+    over_time1: Optional[float] = None,
+    over_time2: Optional[float] = None,
+    mapas: Optional[Sequence[str]] = None,
+    registro: Optional[RegistroTimes] = None,
+) -> List[str]:
+    """Os três mapas da série [pick1, pick2, decisivo], como em
+    `vetar_e_escolher_mapas`."""
+    return [
+        mapa
+        for _, acao, mapa in roteiro_veto(
+            time1, time2, over_time1, over_time2, mapas, registro
+        )
+        if acao != "ban"
+    ]